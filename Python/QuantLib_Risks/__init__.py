@@ -35,7 +35,7 @@ from .QuantLib_Risks import *
 
 if XAD_ENABLED:
     from xad.adj_1st import Real, Tape
-    from typing import Union, Tuple, List
+    from typing import Callable, Optional, Union, Tuple, List
 
     # as part of the input at the top, we'll have _QuantLib_Risks in scope
     DoubleVector = _QuantLib_Risks.DoubleVector
@@ -52,8 +52,82 @@ if XAD_ENABLED:
     ) -> Tuple[List[Real], List[Real]]:
         return ([Real(x) for x in x1], [Real(x) for x in x2])
 
+    def registerInputArray(tape: Tape, values) -> DoubleVector:
+        """Creates a DoubleVector from a 1D float array and registers all its
+        elements as inputs on the given tape."""
+        return _QuantLib_Risks._register_inputs(tape, values)
+
+    def derivatives(inputs) -> "numpy.ndarray":
+        """Returns the derivatives of a DoubleVector or an iterable of Reals
+        as a float64 numpy array."""
+        return _QuantLib_Risks._derivatives(inputs)
+
+    def computeGradient(tape: Tape, output: Real, inputs) -> "numpy.ndarray":
+        """Seeds output with 1, rolls back the tape and returns the derivatives
+        of all inputs (a DoubleVector or an iterable of Reals) as a numpy array."""
+        return _QuantLib_Risks._gradient(tape, output, inputs)
+
+    def blockwiseGradient(
+        tape: Tape, inputs, priceBlock: Callable[[int], Real], blocks: int
+    ) -> Tuple[float, "numpy.ndarray"]:
+        """Averages the estimates priceBlock(0), ..., priceBlock(blocks - 1) and
+        returns the average and its derivatives to the inputs.
+
+        Each block is recorded, rolled back into the adjoints of the variables
+        recorded before the call and discarded, so that the tape only ever holds
+        one block. This keeps the memory of adjoint Monte Carlo constant in the
+        number of paths: priceBlock(b) typically prices with an MC engine using
+        a block of samples and a seed depending on b. Lazy objects used by the
+        blocks (bootstrapped curves, ...) must be calculated before the call, as
+        values cached by a block are invalidated by its roll-back."""
+        tape.clearDerivatives()
+        start = _QuantLib_Risks._tape_position(tape)
+        total = 0.0
+        for b in range(blocks):
+            estimate = priceBlock(b)
+            total += estimate.value
+            _QuantLib_Risks._accumulate_adjoints(tape, estimate, 1.0 / blocks, start)
+        return total / blocks, derivatives(inputs)
+
+    def jacobian(tape: Tape, outputs, inputs, sparse: bool = False):
+        """Returns the derivatives of all outputs with respect to all inputs as a
+        (len(outputs), len(inputs)) numpy array, running one adjoint sweep per
+        output in C++. With sparse=True, a scipy.sparse.csr_matrix is returned."""
+        jac = _QuantLib_Risks._jacobian(tape, outputs, inputs)
+        if sparse:
+            try:
+                from scipy.sparse import csr_matrix
+            except ImportError:
+                raise ImportError("jacobian(..., sparse=True) requires scipy")
+            return csr_matrix(jac)
+        return jac
+
+    def tapeStats(tape: Tape) -> dict:
+        """Returns the statistics of a tape: the number of recorded statements,
+        the memory used and the peak memory (in bytes), and the memory limit
+        set with setTapeMemoryLimit (or None).
+
+        The peak is only tracked while a limit is set, by sampling the memory
+        around each call into QuantLib; memory released within a single call
+        (e.g. by a checkpointed rollback) is not seen. Without a limit, it is
+        the memory currently used."""
+        return _QuantLib_Risks._tape_stats(tape)
+
+    def setTapeMemoryLimit(tape: Tape, limit: Optional[int]) -> None:
+        """Sets a memory limit in bytes on the tape, or removes it if limit is
+        None. While the tape is active and over the limit, calls into QuantLib
+        raise MemoryError instead of growing the tape further.
+
+        This is a soft limit: XAD gives no hook into the recording, so the
+        limit is only checked before each call into QuantLib. A single call,
+        such as the NPV of a large Monte Carlo engine, can record past it, and
+        the next call raises. The limit is dropped when the tape is
+        destroyed."""
+        _QuantLib_Risks._set_tape_memory_limit(tape, limit)
+
     # monkey-patch the tape activation function to register this tape with QuantLib's internal
-    # global tape pointer (we have 2 due to double static linking)
+    # active tape pointer (we have 2 due to double static linking). Both are thread-local, so
+    # each thread can activate, record and roll back its own tape.
     def _wrap_tape_activation():
         original_enter = Tape.__enter__
 
@@ -66,7 +140,7 @@ if XAD_ENABLED:
 
         def _tape_exit(t: Tape, *args, **kwargs):
             original_exit(t, *args, **kwargs)
-            _QuantLib_Risks._deactivate_tape()
+            _QuantLib_Risks._deactivate_tape(t)
 
         original_activate = Tape.activate
 
@@ -78,7 +152,7 @@ if XAD_ENABLED:
 
         def _tape_deactivate(t: Tape):
             original_deactivate(t)
-            _QuantLib_Risks._deactivate_tape()
+            _QuantLib_Risks._deactivate_tape(t)
 
         Tape.__enter__ = _tape_enter
         Tape.__exit__ = _tape_exit
@@ -87,6 +161,19 @@ if XAD_ENABLED:
 
     _wrap_tape_activation()
 
+    #: True if the module was built with QLR_RELEASE_GIL, releasing the GIL
+    #: around the heavy QuantLib entry points (Instrument.NPV, model
+    #: calibration, ...) and in Tape.computeAdjoints
+    RELEASES_GIL = _QuantLib_Risks._releases_gil
+
+    if RELEASES_GIL:
+        # adjoint sweeps without the GIL, so that threads can roll back their
+        # own tapes concurrently
+        def _tape_compute_adjoints(t: Tape):
+            _QuantLib_Risks._compute_adjoints(t)
+
+        Tape.computeAdjoints = _tape_compute_adjoints
+
 if hasattr(_QuantLib_Risks, "__version__"):
     __version__ = _QuantLib_Risks.__version__
 elif hasattr(_QuantLib_Risks.cvar, "__version__"):
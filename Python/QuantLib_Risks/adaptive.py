@@ -0,0 +1,142 @@
+"""
+ Finite difference pricing to a target accuracy, refining the time and space
+ grids of an engine with Richardson error estimates.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Callable, NamedTuple
+
+from xad.adj_1st import Real
+
+from . import (
+    FdBlackScholesBarrierEngine,
+    FdBlackScholesVanillaEngine,
+    GeneralizedBlackScholesProcess,
+    Instrument,
+    PricingEngine,
+)
+
+
+class AdaptiveFdResult(NamedTuple):
+    """The NPV priced on the selected grid, the estimate of its error and the
+    grid sizes."""
+
+    NPV: Real
+    error: float
+    tGrid: int
+    xGrid: int
+
+
+def fdBlackScholesVanillaEngine(
+    process: GeneralizedBlackScholesProcess, dampingSteps: int = 2, **kwargs
+) -> Callable[[int, int], PricingEngine]:
+    """Returns a factory of FdBlackScholesVanillaEngines for given grid sizes.
+    Other arguments of the engine can be given as keywords."""
+
+    def make(tGrid: int, xGrid: int) -> PricingEngine:
+        return FdBlackScholesVanillaEngine.make(
+            process, tGrid=tGrid, xGrid=xGrid, dampingSteps=dampingSteps, **kwargs
+        )
+
+    return make
+
+
+def fdBlackScholesBarrierEngine(
+    process: GeneralizedBlackScholesProcess, dampingSteps: int = 2
+) -> Callable[[int, int], PricingEngine]:
+    """Returns a factory of FdBlackScholesBarrierEngines for given grid sizes."""
+
+    def make(tGrid: int, xGrid: int) -> PricingEngine:
+        return FdBlackScholesBarrierEngine(process, tGrid, xGrid, dampingSteps)
+
+    return make
+
+
+def adaptiveNPV(
+    instrument: Instrument,
+    makeEngine: Callable[[int, int], PricingEngine],
+    tolerance: float,
+    tGrid: int = 25,
+    xGrid: int = 50,
+    maxPoints: int = 4000000,
+    order: int = 2,
+) -> AdaptiveFdResult:
+    """Prices the instrument with engines from makeEngine(tGrid, xGrid) on the
+    smallest grid found whose estimated error is below tolerance, in price
+    units.
+
+    Starting from the given grid sizes, each iteration also prices with the
+    number of time steps doubled and with the number of grid points doubled.
+    Assuming the scheme converges with the given order in both, the error of
+    each direction is estimated as in Richardson extrapolation,
+    |P(2n) - P(n)| / (2^order - 1). While their sum is above the tolerance, the
+    direction with the larger error is refined. No engine is built with more
+    than maxPoints (tGrid times xGrid): once the refinements of the current
+    grid would exceed it, the search stops and the error returned is the one
+    predicted from the previous estimates (the refined direction's error
+    divided by 2^order), which is above the tolerance.
+
+    The NPV returned is the price on the selected grid, i.e. the same as a
+    single pricing with the grid sizes returned. The finer prices computed for
+    the error estimates, and their Richardson extrapolation, are more accurate
+    but are discarded, since their error is not estimated.
+
+    The engines place time steps on the exercise dates and the barrier on the
+    mesh, and the factories above use damping steps to smooth the payoff, so
+    the estimates only need to resolve the remaining discretisation error.
+    All trial prices are recorded if a tape is active; the grid sizes
+    returned can be used to price once on the tape instead.
+    """
+    if tolerance <= 0.0:
+        raise ValueError("tolerance must be positive")
+    if 2 * tGrid * xGrid > maxPoints:
+        raise ValueError("maxPoints too small to refine the initial grid")
+    factor = 2.0**order - 1.0
+    prices = {}
+
+    def price(t: int, x: int) -> Real:
+        if (t, x) not in prices:
+            instrument.setPricingEngine(makeEngine(t, x))
+            prices[(t, x)] = instrument.NPV()
+        return prices[(t, x)]
+
+    t, x = tGrid, xGrid
+    npv = price(t, x)
+    while True:
+        errorT = abs(price(2 * t, x).value - npv.value) / factor
+        errorX = abs(price(t, 2 * x).value - npv.value) / factor
+        error = errorT + errorX
+        if error <= tolerance:
+            break
+        if errorT > errorX:
+            t *= 2
+            errorT /= factor + 1.0
+        else:
+            x *= 2
+            errorX /= factor + 1.0
+        # priced above as a refinement
+        npv = price(t, x)
+        if 2 * t * x > maxPoints:
+            error = errorT + errorX
+            break
+    # leave the engine of the selected grid on the instrument
+    instrument.setPricingEngine(makeEngine(t, x))
+    return AdaptiveFdResult(npv, error, t, x)
@@ -26,6 +26,10 @@
 #include "converters.hpp"
 #include <XAD/XAD.hpp>
 #include <iostream>
+#include <map>
+#include <mutex>
+#include <optional>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <pybind11/stl_bind.h>
@@ -33,8 +37,6 @@
 
 namespace py = pybind11;
 
-typedef xad::AReal<double> Real;
-
 inline void check(int s) {
   if (s != 0) {
     throw std::runtime_error("failure");
@@ -47,12 +49,25 @@ inline void check(PyObject *s) {
   }
 }
 
+// PyFloat_AsDouble and PyLong_AsDouble return -1.0 with a Python error set
+// when the conversion fails, e.g. for an int out of the range of a double
+inline double checked_double(double v) {
+  if (v == -1.0 && PyErr_Occurred()) {
+    if (PyErr_ExceptionMatches(PyExc_OverflowError)) {
+      PyErr_Clear();
+      throw std::overflow_error("int too large to convert to float");
+    }
+    throw py::error_already_set();
+  }
+  return v;
+}
+
 // may throw a cast exception
 Real make_Real(PyObject *obj) {
   if (PyFloat_Check(obj))
-    return Real(PyFloat_AsDouble(obj));
+    return Real(checked_double(PyFloat_AsDouble(obj)));
   if (PyLong_Check(obj))
-    return Real(PyLong_AsDouble(obj));
+    return Real(checked_double(PyLong_AsDouble(obj)));
 
   // otherwise try to convert to Real
   auto p = py::reinterpret_borrow<py::object>(obj);
@@ -95,6 +110,41 @@ bool check_Real_pair(PyObject *obj) {
   return false;
 }
 
+void get_derivatives(const Real &x, double *out) {
+#if defined(QLR_AD_MODE_FWD_ADJ)
+  if (!x.shouldRecord()) {
+    out[0] = out[1] = 0.0;
+    return;
+  }
+  auto d = x.getDerivative();
+  out[0] = d.getValue();
+  out[1] = d.getDerivative();
+#elif defined(QLR_HAS_TAPE)
+  // variables that are not on the tape have no adjoint
+  *out = x.shouldRecord() ? x.getDerivative() : 0.0;
+#elif defined(QLR_AD_MODE_FWD_VECTOR)
+  auto d = x.getDerivative();
+  for (std::size_t i = 0; i < QLR_DERIVATIVE_SIZE; ++i)
+    out[i] = d[i];
+#else
+  *out = x.getDerivative();
+#endif
+}
+
+void set_derivatives(Real &x, const double *in) {
+#if defined(QLR_AD_MODE_FWD_VECTOR)
+  auto &d = x.derivative();
+  for (std::size_t i = 0; i < QLR_DERIVATIVE_SIZE; ++i)
+    d[i] = in[i];
+#elif defined(QLR_AD_MODE_FWD_ADJ)
+  xad::FReal<double> d(in[0]);
+  d.derivative() = in[1];
+  x.setDerivative(d);
+#else
+  x.setDerivative(*in);
+#endif
+}
+
 PyObject *make_PyObject(const Real &x) {
   py::detail::type_caster<Real> caster;
   py::handle out = caster.cast(x, py::return_value_policy::copy, py::handle());
@@ -111,38 +161,143 @@ std::vector<Real> &make_Real_vector_ref(PyObject *obj) {
 }
 
 inline Real cast_obj(const py::handle &obj) {
-  if (py::isinstance<py::float_>(obj)) {
-    return obj.cast<double>();
-  } else if (py::isinstance<py::int_>(obj)) {
-    return obj.cast<long>();
+  // check the exact builtin types with the C API first - this is the common
+  // case and much cheaper than going through pybind11's type lookup
+  PyObject *o = obj.ptr();
+  if (PyFloat_CheckExact(o)) {
+    return PyFloat_AS_DOUBLE(o);
+  } else if (PyLong_CheckExact(o)) {
+    return checked_double(PyLong_AsDouble(o));
+  } else if (PyFloat_Check(o)) {
+    return checked_double(PyFloat_AsDouble(o));
+  } else if (PyLong_Check(o)) {
+    return checked_double(PyLong_AsDouble(o));
   }
   return obj.cast<Real>();
 }
 
 std::vector<Real> make_Real_vector_from_list(PyObject *obj) {
-  auto p = py::reinterpret_borrow<py::object>(obj);
-  auto l = py::cast<py::list>(p);
-
+  Py_ssize_t n = PyList_GET_SIZE(obj);
   std::vector<Real> ret;
-  ret.reserve(py::len(l));
-  for (const auto &element : l) {
-    ret.push_back(cast_obj(element));
+  ret.reserve(n);
+  for (Py_ssize_t i = 0; i < n; ++i) {
+    ret.push_back(cast_obj(PyList_GET_ITEM(obj, i)));
   }
   return ret;
 }
 
 std::vector<Real> make_Real_vector_from_tuple(PyObject *obj) {
-  auto p = py::reinterpret_borrow<py::object>(obj);
-  auto t = py::cast<py::tuple>(p);
-
+  Py_ssize_t n = PyTuple_GET_SIZE(obj);
   std::vector<Real> ret;
-  ret.reserve(py::len(t));
-  for (const auto &element : t) {
-    ret.push_back(cast_obj(element));
+  ret.reserve(n);
+  for (Py_ssize_t i = 0; i < n; ++i) {
+    ret.push_back(cast_obj(PyTuple_GET_ITEM(obj, i)));
   }
   return ret;
 }
 
+///////////// float64 buffers
+
+namespace {
+
+bool is_float64_format(const Py_buffer &view) {
+  if (view.itemsize != sizeof(double))
+    return false;
+  // a null format means unsigned bytes
+  if (view.format == nullptr)
+    return false;
+  const char *f = view.format;
+  switch (*f) {
+  case '@':
+  case '=':
+    ++f;
+    break;
+#if PY_LITTLE_ENDIAN
+  case '<':
+#else
+  case '>':
+  case '!':
+#endif
+    ++f;
+    break;
+  default:
+    break;
+  }
+  return f[0] == 'd' && f[1] == '\0';
+}
+
+} // namespace
+
+Float64Buffer::Float64Buffer(PyObject *obj, bool writable) {
+  int flags = PyBUF_FORMAT | PyBUF_C_CONTIGUOUS;
+  if (writable)
+    flags |= PyBUF_WRITABLE;
+  if (PyObject_GetBuffer(obj, &view_, flags) != 0) {
+    PyErr_Clear();
+    throw std::invalid_argument(writable
+                                    ? "writable contiguous buffer expected"
+                                    : "contiguous buffer expected");
+  }
+  if (!is_float64_format(view_)) {
+    PyBuffer_Release(&view_);
+    throw std::invalid_argument("buffer of float64 values expected");
+  }
+}
+
+Float64Buffer::~Float64Buffer() { PyBuffer_Release(&view_); }
+
+size_t Float64Buffer::shape(int i) const {
+  // a zero-dimensional buffer holds one scalar
+  return view_.ndim == 0 ? 1 : static_cast<size_t>(view_.shape[i]);
+}
+
+bool Float64Buffer::check(PyObject *obj) {
+  if (!PyObject_CheckBuffer(obj) || PyBytes_Check(obj) ||
+      PyByteArray_Check(obj) || PyUnicode_Check(obj))
+    return false;
+  Py_buffer view;
+  if (PyObject_GetBuffer(obj, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) != 0) {
+    PyErr_Clear();
+    return false;
+  }
+  bool ok = is_float64_format(view) && view.ndim <= 1;
+  PyBuffer_Release(&view);
+  return ok;
+}
+
+std::vector<Real> make_Real_vector_from_buffer(PyObject *obj) {
+  Float64Buffer buf(obj);
+  const double *data = buf.data();
+  return std::vector<Real>(data, data + buf.size());
+}
+
+bool check_Real_buffer(PyObject *obj) { return Float64Buffer::check(obj); }
+
+PyObject *make_float64_array(const std::vector<size_t> &shape) {
+  return py::array_t<double>(shape).release().ptr();
+}
+
+PyObject *make_csr_arrays(const std::vector<double> &data,
+                          const std::vector<std::int32_t> &indices,
+                          const std::vector<std::int32_t> &indptr) {
+  return py::make_tuple(
+             py::array_t<double>(data.size(), data.data()),
+             py::array_t<std::int32_t>(indices.size(), indices.data()),
+             py::array_t<std::int32_t>(indptr.size(), indptr.data()))
+      .release()
+      .ptr();
+}
+
+std::vector<Real> make_Real_vector(PyObject *obj) {
+  if (PyList_Check(obj))
+    return make_Real_vector_from_list(obj);
+  if (PyTuple_Check(obj))
+    return make_Real_vector_from_tuple(obj);
+  if (check_Real_buffer(obj))
+    return make_Real_vector_from_buffer(obj);
+  return make_Real_vector_ref(obj);
+}
+
 PyObject *make_PyObject_Real_vector(std::vector<Real> &v) {
   py::detail::type_caster<std::vector<Real> &> caster;
   py::handle out = caster.cast(v, py::return_value_policy::copy, py::handle());
@@ -168,6 +323,8 @@ bool check_Real_vector(PyObject *obj) {
   auto p = py::reinterpret_borrow<py::object>(obj);
   if (py::isinstance<std::vector<Real>>(p))
     return true;
+  if (check_Real_buffer(obj))
+    return true;
   if (py::isinstance<py::list>(p)) {
     auto l = p.cast<py::list>();
     if (py::len(l) == 0)
@@ -303,10 +460,7 @@ DoubleVectorVector make_DoubleVectorVector_from_list(PyObject *obj) {
   DoubleVectorVector ret;
   ret.reserve(py::len(l));
   for (const auto &element : l) {
-    if (py::isinstance<py::list>(element))
-      ret.emplace_back(make_Real_vector_from_list(element.ptr()));
-    else if (py::isinstance<py::tuple>(element))
-      ret.emplace_back(make_Real_vector_from_tuple(element.ptr()));
+    ret.emplace_back(make_Real_vector(element.ptr()));
   }
   return ret;
 }
@@ -318,10 +472,7 @@ DoubleVectorVector make_DoubleVectorVector_from_tuple(PyObject *obj) {
   DoubleVectorVector ret;
   ret.reserve(py::len(l));
   for (const auto &element : l) {
-    if (py::isinstance<py::list>(element))
-      ret.emplace_back(make_Real_vector_from_list(element.ptr()));
-    else if (py::isinstance<py::tuple>(element))
-      ret.emplace_back(make_Real_vector_from_tuple(element.ptr()));
+    ret.emplace_back(make_Real_vector(element.ptr()));
   }
   return ret;
 }
@@ -386,8 +537,8 @@ PairDoubleVector make_PairDoubleVector_from_list(PyObject *obj) {
 
   PairDoubleVector ret;
   assert(py::len(l) == 2);
-  ret.first = py::isinstance<py::list>(l[0]) ? make_Real_vector_from_list(l[0].ptr()) : make_Real_vector_from_tuple(l[0].ptr());
-  ret.second = py::isinstance<py::list>(l[1]) ? make_Real_vector_from_list(l[1].ptr()) : make_Real_vector_from_tuple(l[1].ptr());
+  ret.first = make_Real_vector(l[0].ptr());
+  ret.second = make_Real_vector(l[1].ptr());
   return ret;
 }
 
@@ -397,8 +548,8 @@ PairDoubleVector make_PairDoubleVector_from_tuple(PyObject *obj) {
 
   PairDoubleVector ret;
   assert(py::len(l) == 2);
-  ret.first = py::isinstance<py::list>(l[0]) ? make_Real_vector_from_list(l[0].ptr()) : make_Real_vector_from_tuple(l[0].ptr());
-  ret.second = py::isinstance<py::list>(l[1]) ? make_Real_vector_from_list(l[1].ptr()) : make_Real_vector_from_tuple(l[1].ptr());
+  ret.first = make_Real_vector(l[0].ptr());
+  ret.second = make_Real_vector(l[1].ptr());
   return ret;
 }
 
@@ -516,9 +667,460 @@ bool mesher_point_vector_check(PyObject *obj) {
   return true;
 }
 
+namespace {
+
+// references to the Reals held by a DoubleVector or any iterable of Reals,
+// keeping the Python objects that own them alive
+class RealRefs {
+public:
+  explicit RealRefs(py::handle reals) {
+    if (py::isinstance<std::vector<Real>>(reals)) {
+      owner_ = py::reinterpret_borrow<py::object>(reals);
+      auto &v = owner_.cast<std::vector<Real> &>();
+      ptrs_.reserve(v.size());
+      for (auto &x : v)
+        ptrs_.push_back(&x);
+    } else {
+      // materialise generators and views so that all items stay alive
+      py::list items(py::reinterpret_borrow<py::object>(reals));
+      ptrs_.reserve(items.size());
+      for (auto h : items)
+        ptrs_.push_back(&h.cast<Real &>());
+      owner_ = std::move(items);
+    }
+  }
+
+  size_t size() const { return ptrs_.size(); }
+  Real &operator[](size_t i) const { return *ptrs_[i]; }
+
+private:
+  py::object owner_;
+  std::vector<Real *> ptrs_;
+};
+
+// array for the derivatives of n Reals - (n,) for the scalar modes and
+// (n, QLR_DERIVATIVE_SIZE) for vector mode
+py::array_t<double> make_derivatives_array(size_t n) {
+  if (QLR_DERIVATIVE_SIZE == 1)
+    return py::array_t<double>(n);
+  return py::array_t<double>({n, QLR_DERIVATIVE_SIZE});
+}
+
+template <class Vec> py::array_t<double> derivatives_of(const Vec &x) {
+  auto out = make_derivatives_array(x.size());
+  double *o = out.mutable_data();
+  for (size_t i = 0; i < x.size(); ++i)
+    get_derivatives(x[i], o + i * QLR_DERIVATIVE_SIZE);
+  return out;
+}
+
+// gathers the derivatives of a DoubleVector or any iterable of Reals
+py::array_t<double> gather_derivatives(py::handle inputs) {
+  return derivatives_of(RealRefs(inputs));
+}
+
+#ifdef QLR_BINDS_REAL
+// value access and arithmetic of the Real classes bound by this module
+void bind_Real_common(py::class_<Real> &cls) {
+  cls.def(py::init<>())
+      .def(py::init<double>(), py::arg("value"))
+      .def(py::init([](const Real &x) { return Real(x); }), py::arg("other"))
+      .def_property(
+          "value", [](const Real &x) { return passive_value(x); },
+          [](Real &x, double v) { passive_value_ref(x) = v; })
+      .def("getValue", [](const Real &x) { return passive_value(x); })
+      .def("__float__", [](const Real &x) { return passive_value(x); })
+      .def("__repr__",
+           [](const Real &x) {
+             auto v = py::repr(py::float_(passive_value(x)));
+             return "Real(" + v.cast<std::string>() + ")";
+           })
+      .def("__neg__", [](const Real &a) { return Real(-a); })
+      .def("__pos__", [](const Real &a) { return a; })
+      .def("__abs__", [](const Real &a) { return Real(xad::abs(a)); })
+      .def("__add__", [](const Real &a, const Real &b) { return Real(a + b); })
+      .def("__add__", [](const Real &a, double b) { return Real(a + b); })
+      .def("__radd__", [](const Real &a, double b) { return Real(b + a); })
+      .def("__sub__", [](const Real &a, const Real &b) { return Real(a - b); })
+      .def("__sub__", [](const Real &a, double b) { return Real(a - b); })
+      .def("__rsub__", [](const Real &a, double b) { return Real(b - a); })
+      .def("__mul__", [](const Real &a, const Real &b) { return Real(a * b); })
+      .def("__mul__", [](const Real &a, double b) { return Real(a * b); })
+      .def("__rmul__", [](const Real &a, double b) { return Real(b * a); })
+      .def("__truediv__",
+           [](const Real &a, const Real &b) { return Real(a / b); })
+      .def("__truediv__", [](const Real &a, double b) { return Real(a / b); })
+      .def("__rtruediv__", [](const Real &a, double b) { return Real(b / a); })
+      .def("__pow__",
+           [](const Real &a, const Real &b) { return Real(xad::pow(a, b)); })
+      .def("__pow__",
+           [](const Real &a, double b) { return Real(xad::pow(a, b)); })
+      .def("__lt__", [](const Real &a, const Real &b) { return a < b; })
+      .def("__lt__",
+           [](const Real &a, double b) { return passive_value(a) < b; })
+      .def("__le__", [](const Real &a, const Real &b) { return a <= b; })
+      .def("__le__",
+           [](const Real &a, double b) { return passive_value(a) <= b; })
+      .def("__gt__", [](const Real &a, const Real &b) { return a > b; })
+      .def("__gt__",
+           [](const Real &a, double b) { return passive_value(a) > b; })
+      .def("__ge__", [](const Real &a, const Real &b) { return a >= b; })
+      .def("__ge__",
+           [](const Real &a, double b) { return passive_value(a) >= b; })
+      .def("__eq__", [](const Real &a, const Real &b) { return a == b; })
+      .def("__eq__",
+           [](const Real &a, double b) { return passive_value(a) == b; })
+      .def("__ne__", [](const Real &a, const Real &b) { return a != b; })
+      .def("__ne__",
+           [](const Real &a, double b) { return passive_value(a) != b; })
+      .def("__hash__", [](const Real &a) {
+        return py::hash(py::float_(passive_value(a)));
+      });
+}
+#endif
+
+#ifdef QLR_AD_MODE_FWD_VECTOR
+void bind_Real(py::module_ &m) {
+  py::class_<Real> cls(m, "Real");
+  bind_Real_common(cls);
+  cls.def_property(
+         "derivatives",
+         [](const Real &x) {
+           py::array_t<double> out(QLR_DERIVATIVE_SIZE);
+           get_derivatives(x, out.mutable_data());
+           return out;
+         },
+         [](Real &x,
+            py::array_t<double, py::array::c_style | py::array::forcecast> d) {
+           if (static_cast<size_t>(d.size()) != QLR_DERIVATIVE_SIZE)
+             throw std::length_error("size mismatch in derivatives");
+           set_derivatives(x, d.data());
+         },
+         "Derivatives (tangents) in all directions as a float64 numpy "
+         "array.")
+      .def(
+          "getDerivative",
+          [](const Real &x, size_t i) {
+            if (i >= QLR_DERIVATIVE_SIZE)
+              throw py::index_error("derivative direction out of range");
+            return x.getDerivative()[i];
+          },
+          py::arg("direction"))
+      .def(
+          "setDerivative",
+          [](Real &x, size_t i, double v) {
+            if (i >= QLR_DERIVATIVE_SIZE)
+              throw py::index_error("derivative direction out of range");
+            x.derivative()[i] = v;
+          },
+          py::arg("direction"), py::arg("value"));
+  py::implicitly_convertible<py::float_, Real>();
+}
+#endif
+
+#ifdef QLR_AD_MODE_FWD_ADJ
+void bind_Real(py::module_ &m) {
+  py::class_<Real> cls(m, "Real");
+  bind_Real_common(cls);
+  cls.def_property(
+         "tangent", [](const Real &x) { return x.getValue().getDerivative(); },
+         [](Real &x, double t) { x.value().derivative() = t; },
+         "Forward mode tangent of the value.")
+      .def_property(
+          "derivative",
+          [](const Real &x) {
+            double d[QLR_DERIVATIVE_SIZE];
+            get_derivatives(x, d);
+            return d[0];
+          },
+          [](Real &x, double v) {
+            double d[QLR_DERIVATIVE_SIZE];
+            get_derivatives(x, d);
+            d[0] = v;
+            set_derivatives(x, d);
+          },
+          "First order adjoint on the active tape.")
+      .def_property_readonly(
+          "derivativeTangent",
+          [](const Real &x) {
+            double d[QLR_DERIVATIVE_SIZE];
+            get_derivatives(x, d);
+            return d[1];
+          },
+          "Tangent of the adjoint, i.e. the second order derivative along "
+          "the tangent direction of the inputs.")
+      .def("getDerivative",
+           [](const Real &x) {
+             double d[QLR_DERIVATIVE_SIZE];
+             get_derivatives(x, d);
+             return d[0];
+           })
+      .def("setDerivative",
+           [](Real &x, double v) { x.setDerivative(xad::FReal<double>(v)); })
+      .def("shouldRecord", &Real::shouldRecord);
+  py::implicitly_convertible<py::float_, Real>();
+
+  py::class_<ActiveTape>(m, "Tape")
+      .def(py::init<>())
+      .def("__enter__",
+           [](ActiveTape &t) -> ActiveTape & {
+             t.activate();
+             return t;
+           },
+           py::return_value_policy::reference)
+      .def("__exit__",
+           [](ActiveTape &t, py::args) { t.deactivate(); })
+      .def("activate", &ActiveTape::activate)
+      .def("deactivate", &ActiveTape::deactivate)
+      .def("isActive", &ActiveTape::isActive)
+      .def("registerInput", [](ActiveTape &t, Real &x) { t.registerInput(x); })
+      .def("registerOutput",
+           [](ActiveTape &t, Real &x) { t.registerOutput(x); })
+      .def("newRecording", &ActiveTape::newRecording)
+      .def("computeAdjoints", &ActiveTape::computeAdjoints)
+      .def("clearDerivatives", &ActiveTape::clearDerivatives)
+      .def("clearAll", &ActiveTape::clearAll)
+      .def("getPosition", [](const ActiveTape &t) {
+        return static_cast<unsigned long>(t.getPosition());
+      });
+}
+#endif
+
+} // namespace
+
+#ifdef QLR_HAS_TAPE
+namespace {
+
+struct TapeMemoryLimit {
+  std::size_t limit = 0; // 0 for no limit
+  std::size_t peak = 0;
+};
+
+std::mutex tape_memory_mutex;
+std::map<const ActiveTape *, TapeMemoryLimit> tape_memory_limits;
+
+} // namespace
+
+std::atomic<bool> tape_memory_limits_set{false};
+
+void sample_tape_memory_peak() {
+  const ActiveTape *tape = ActiveTape::getActive();
+  if (tape == nullptr)
+    return;
+  std::lock_guard<std::mutex> lock(tape_memory_mutex);
+  auto it = tape_memory_limits.find(tape);
+  if (it != tape_memory_limits.end())
+    it->second.peak = std::max(it->second.peak, tape->getMemory());
+}
+
+void check_tape_memory_limit() {
+  const ActiveTape *tape = ActiveTape::getActive();
+  if (tape == nullptr)
+    return;
+  std::lock_guard<std::mutex> lock(tape_memory_mutex);
+  auto it = tape_memory_limits.find(tape);
+  if (it == tape_memory_limits.end())
+    return;
+  std::size_t used = tape->getMemory();
+  it->second.peak = std::max(it->second.peak, used);
+  if (it->second.limit != 0 && used > it->second.limit)
+    throw TapeMemoryError("tape memory limit of " +
+                          std::to_string(it->second.limit) +
+                          " bytes exceeded (" + std::to_string(used) +
+                          " bytes used)");
+}
+#endif
+
 void add_to_module(PyObject *mdef) {
   auto m = py::reinterpret_borrow<py::module_>(mdef);
 
+#ifdef QLR_BINDS_REAL
+  bind_Real(m);
+#endif
+  m.attr("_derivative_size") = QLR_DERIVATIVE_SIZE;
+#ifdef QLR_RELEASE_GIL
+  m.attr("_releases_gil") = true;
+#else
+  m.attr("_releases_gil") = false;
+#endif
+  m.def("_derivatives", &gather_derivatives, py::arg("inputs"));
+
+#ifdef QLR_HAS_TAPE
+  m.def(
+      "_register_inputs",
+      [](ActiveTape &tape,
+         py::array_t<double, py::array::c_style | py::array::forcecast>
+             values) {
+        auto in = values.unchecked<1>();
+        std::vector<Real> v(in.shape(0));
+        for (size_t i = 0; i < v.size(); ++i) {
+          v[i] = in(i);
+          tape.registerInput(v[i]);
+        }
+        return v;
+      },
+      py::arg("tape"), py::arg("values"));
+
+  m.def(
+      "_gradient",
+      [](ActiveTape &tape, Real &output, py::handle inputs) {
+        tape.registerOutput(output);
+        tape.clearDerivatives();
+        output.setDerivative(1.0);
+        {
+          py::gil_scoped_release release;
+          tape.computeAdjoints();
+        }
+        return gather_derivatives(inputs);
+      },
+      py::arg("tape"), py::arg("output"), py::arg("inputs"));
+
+  m.def(
+      "_jacobian",
+      [](ActiveTape &tape, py::handle outputs, py::handle inputs) {
+        RealRefs y(outputs);
+        RealRefs x(inputs);
+        for (size_t i = 0; i < y.size(); ++i)
+          tape.registerOutput(y[i]);
+        py::array_t<double> jac({y.size(), x.size()});
+        auto J = jac.mutable_unchecked<2>();
+        for (size_t i = 0; i < y.size(); ++i) {
+          tape.clearDerivatives();
+          y[i].setDerivative(1.0);
+          {
+            py::gil_scoped_release release;
+            tape.computeAdjoints();
+          }
+          for (size_t j = 0; j < x.size(); ++j) {
+            double d[QLR_DERIVATIVE_SIZE];
+            get_derivatives(x[j], d);
+            J(i, j) = d[0];
+          }
+        }
+        return jac;
+      },
+      py::arg("tape"), py::arg("outputs"), py::arg("inputs"));
+
+  m.def(
+      "_accumulate_adjoints",
+      [](ActiveTape &tape, Real &output, double weight, unsigned long start) {
+        // propagates weight * d(output) into the adjoints of the variables
+        // recorded before start, then discards the recording after it
+        auto pos = static_cast<decltype(tape.getPosition())>(start);
+        if (output.shouldRecord()) {
+          output.setDerivative(weight);
+          py::gil_scoped_release release;
+          tape.computeAdjointsTo(pos);
+        }
+        tape.clearDerivativesAfter(pos);
+        tape.resetTo(pos);
+      },
+      py::arg("tape"), py::arg("output"), py::arg("weight"), py::arg("start"));
+
+  m.def(
+      "_compute_adjoints",
+      [](ActiveTape &tape) {
+        py::gil_scoped_release release;
+        tape.computeAdjoints();
+      },
+      py::arg("tape"));
+
+  m.def(
+      "_tape_stats",
+      [](const ActiveTape &tape) {
+        std::size_t used = tape.getMemory();
+        std::size_t peak = used, limit = 0;
+        {
+          std::lock_guard<std::mutex> lock(tape_memory_mutex);
+          auto it = tape_memory_limits.find(&tape);
+          if (it != tape_memory_limits.end()) {
+            it->second.peak = std::max(it->second.peak, used);
+            peak = it->second.peak;
+            limit = it->second.limit;
+          }
+        }
+        py::dict stats;
+        stats["statements"] = static_cast<std::size_t>(tape.getPosition());
+        stats["memory"] = used;
+        stats["peakMemory"] = peak;
+        stats["memoryLimit"] = limit == 0 ? py::object(py::none())
+                                          : py::object(py::int_(limit));
+        return stats;
+      },
+      py::arg("tape"));
+
+  m.def(
+      "_set_tape_memory_limit",
+      [](py::object tapeObj, std::optional<std::size_t> limit) {
+        const ActiveTape *tape = &py::cast<const ActiveTape &>(tapeObj);
+        bool added = false;
+        {
+          std::lock_guard<std::mutex> lock(tape_memory_mutex);
+          if (limit) {
+            auto entry = tape_memory_limits.emplace(tape, TapeMemoryLimit());
+            added = entry.second;
+            entry.first->second.limit = *limit;
+            entry.first->second.peak =
+                std::max(entry.first->second.peak, tape->getMemory());
+          } else {
+            tape_memory_limits.erase(tape);
+          }
+          tape_memory_limits_set = !tape_memory_limits.empty();
+        }
+        if (added) {
+          // the limits are keyed by address, so the entry is dropped when the
+          // tape is destroyed rather than inherited by a later tape
+          py::cpp_function erase([tape](py::handle ref) {
+            {
+              std::lock_guard<std::mutex> lock(tape_memory_mutex);
+              tape_memory_limits.erase(tape);
+              tape_memory_limits_set = !tape_memory_limits.empty();
+            }
+            ref.dec_ref();
+          });
+          py::weakref(tapeObj, erase).release();
+        }
+      },
+      py::arg("tape"), py::arg("limit"));
+
+#ifdef QLR_AD_MODE_FWD_ADJ
+  m.def(
+      "_hessian",
+      [](ActiveTape &tape, py::handle inputs, py::function price) {
+        RealRefs x(inputs);
+        const size_t n = x.size();
+        py::array_t<double> grad(n);
+        py::array_t<double> hess({n, n});
+        auto g = grad.mutable_unchecked<1>();
+        auto H = hess.mutable_unchecked<2>();
+        double value = 0.0;
+        // one recording and adjoint sweep per tangent direction, each giving
+        // the gradient and one row of the Hessian
+        for (size_t j = 0; j < n; ++j) {
+          for (size_t i = 0; i < n; ++i)
+            x[i].value().derivative() = i == j ? 1.0 : 0.0;
+          tape.newRecording();
+          Real y = price().cast<Real>();
+          tape.registerOutput(y);
+          tape.clearDerivatives();
+          y.setDerivative(xad::FReal<double>(1.0));
+          tape.computeAdjoints();
+          for (size_t i = 0; i < n; ++i) {
+            double d[QLR_DERIVATIVE_SIZE];
+            get_derivatives(x[i], d);
+            g(i) = d[0];
+            H(j, i) = d[1];
+          }
+          value = passive_value(y);
+        }
+        for (size_t i = 0; i < n; ++i)
+          x[i].value().derivative() = 0.0;
+        return py::make_tuple(value, grad, hess);
+      },
+      py::arg("tape"), py::arg("inputs"), py::arg("price"));
+#endif
+#endif
+
   py::bind_vector<std::vector<Real>>(m, "DoubleVector")
       .def("empty", [](const std::vector<Real> &self) { return self.empty(); })
       .def("size", [](const std::vector<Real> &self) { return self.size(); })
@@ -539,7 +1141,68 @@ void add_to_module(PyObject *mdef) {
       .def("assign",
            [](std::vector<Real> &self, int n, double x) { self.assign(n, x); })
       .def("assign",
-           [](std::vector<Real> &self, int n, long x) { self.assign(n, x); });
+           [](std::vector<Real> &self, int n, long x) { self.assign(n, x); })
+      .def(
+          "values",
+          [](py::object self, bool copy) -> py::array_t<double> {
+            auto &v = self.cast<std::vector<Real> &>();
+            if (copy || v.empty()) {
+              py::array_t<double> out(v.size());
+              auto o = out.mutable_unchecked<1>();
+              for (size_t i = 0; i < v.size(); ++i)
+                o(i) = passive_value(v[i]);
+              return out;
+            }
+            // strided, read-only view onto the values stored inside the
+            // active reals - it keeps the vector alive, but is invalidated
+            // if the vector is resized
+            py::array_t<double> out(
+                {static_cast<py::ssize_t>(v.size())},
+                {static_cast<py::ssize_t>(sizeof(Real))}, &passive_value_ref(v[0]),
+                self);
+            out.attr("setflags")(py::arg("write") = false);
+            return out;
+          },
+          py::arg("copy") = true,
+          "Returns the values as a float64 numpy array. With copy=False, a "
+          "read-only view into the vector's memory is returned instead.")
+      .def(
+          "derivatives",
+          [](const std::vector<Real> &self) { return derivatives_of(self); },
+          "Returns the derivatives of all elements as a float64 numpy array, "
+          "of shape (n, directions) in vector mode. In adjoint mode, elements "
+          "not registered on a tape give 0.0.")
+      .def(
+          "setValues",
+          [](std::vector<Real> &self,
+             py::array_t<double, py::array::c_style | py::array::forcecast>
+                 values) {
+            auto in = values.unchecked<1>();
+            if (static_cast<size_t>(in.shape(0)) != self.size())
+              throw std::length_error("size mismatch in setValues");
+            for (size_t i = 0; i < self.size(); ++i)
+              passive_value_ref(self[i]) = in(i);
+          },
+          py::arg("values"),
+          "Sets the values of all elements from a 1D float array, keeping "
+          "their tape registration.")
+      .def(
+          "setDerivatives",
+          [](std::vector<Real> &self,
+             py::array_t<double, py::array::c_style | py::array::forcecast>
+                 derivatives) {
+            if (derivatives.shape(0) != static_cast<py::ssize_t>(self.size()) ||
+                static_cast<size_t>(derivatives.size()) !=
+                    self.size() * QLR_DERIVATIVE_SIZE)
+              throw std::length_error("size mismatch in setDerivatives");
+            const double *in = derivatives.data();
+            for (size_t i = 0; i < self.size(); ++i)
+              set_derivatives(self[i], in + i * QLR_DERIVATIVE_SIZE);
+          },
+          py::arg("derivatives"),
+          "Seeds the derivatives of all elements from a float array, of "
+          "shape (n, directions) in vector mode. In adjoint mode, the "
+          "elements must be registered on the active tape.");
 
   py::bind_vector<DoubleVectorVector>(m, "DoubleVectorVector")
       .def("empty", [](const DoubleVectorVector &self) { return self.empty(); })
@@ -618,13 +1281,15 @@ void add_to_module(PyObject *mdef) {
            });
 }
 
+#ifdef QLR_HAS_TAPE
 bool check_Tape(PyObject* obj) {
   auto p = py::reinterpret_borrow<py::object>(obj);
-  return py::isinstance<xad::Tape<double>>(p);  
+  return py::isinstance<ActiveTape>(p);  
 }
 
-xad::Tape<double> &make_Tape_ref(PyObject *obj)
+ActiveTape &make_Tape_ref(PyObject *obj)
 {
   auto p = py::reinterpret_borrow<py::object>(obj);
-  return py::cast<xad::Tape<double>&>(p);  
-}
\ No newline at end of file
+  return py::cast<ActiveTape&>(p);  
+}
+#endif
@@ -25,6 +25,9 @@
 
 #pragma once
 #include <XAD/XAD.hpp>
+#include <atomic>
+#include <cstdint>
+#include <stdexcept>
 #include <tuple>
 #include <utility>
 #include <vector>
@@ -32,7 +35,52 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 
+// The active type of the extension module. The default build uses XAD's
+// adjoint type; building with QLR_AD_MODE_FWD gives the forward (tangent)
+// mode module QuantLib_Risks.fwd, and QLR_AD_MODE_FWD_VECTOR the vector
+// forward mode module QuantLib_Risks.fwdvec, carrying QLR_FWD_VECTOR_SIZE
+// tangent directions in each Real. The forward modes have no tape.
+// QLR_AD_MODE_FWD_ADJ gives the second order (adjoint over forward) module
+// QuantLib_Risks.fwdadj, where the derivatives of a Real are its first order
+// adjoint and the adjoint of its tangent.
+// xad-py only binds the scalar first order types, so the vector forward and
+// second order modules bind their own Real (and Tape) classes.
+#if defined(QLR_AD_MODE_FWD_VECTOR)
+typedef xad::FReal<double, QLR_FWD_VECTOR_SIZE> Real;
+constexpr std::size_t QLR_DERIVATIVE_SIZE = QLR_FWD_VECTOR_SIZE;
+#define QLR_BINDS_REAL 1
+#elif defined(QLR_AD_MODE_FWD)
+typedef xad::FReal<double> Real;
+constexpr std::size_t QLR_DERIVATIVE_SIZE = 1;
+#elif defined(QLR_AD_MODE_FWD_ADJ)
+typedef xad::AReal<xad::FReal<double>> Real;
+typedef xad::Tape<xad::FReal<double>> ActiveTape;
+constexpr std::size_t QLR_DERIVATIVE_SIZE = 2;
+#define QLR_HAS_TAPE 1
+#define QLR_BINDS_REAL 1
+#else
 typedef xad::AReal<double> Real;
+typedef xad::Tape<double> ActiveTape;
+constexpr std::size_t QLR_DERIVATIVE_SIZE = 1;
+#define QLR_HAS_TAPE 1
+#endif
+
+// the underlying double value of x
+inline double passive_value(const Real &x) {
+#if defined(QLR_AD_MODE_FWD_ADJ)
+  return x.getValue().getValue();
+#else
+  return x.getValue();
+#endif
+}
+
+inline double &passive_value_ref(Real &x) {
+#if defined(QLR_AD_MODE_FWD_ADJ)
+  return x.value().value();
+#else
+  return x.value();
+#endif
+}
 
 // adds additional definitions to the QuantLib module at init time
 void add_to_module(PyObject *mdef);
@@ -42,6 +90,13 @@ bool check_Real(PyObject *obj);
 bool check_Real_pair(PyObject *obj);
 PyObject *make_PyObject(const Real &x);
 
+// writes the QLR_DERIVATIVE_SIZE derivatives of x to out - for adjoint mode,
+// this is the adjoint on the active tape, or 0 if x is not recorded
+void get_derivatives(const Real &x, double *out);
+
+// sets the QLR_DERIVATIVE_SIZE derivatives of x from in
+void set_derivatives(Real &x, const double *in);
+
 ////////////////////// Vectors Real ////////////////////
 
 // converter ql.DoubleVector -> std::vector
@@ -62,9 +117,51 @@ std::vector<Real> make_Real_vector_from_list(PyObject *obj);
 // converter python tuple -> std::vector
 std::vector<Real> make_Real_vector_from_tuple(PyObject *obj);
 
-// check if the obj is a ql.DoubleVector
+// converter float64 buffer (numpy array, array.array('d')) -> std::vector
+std::vector<Real> make_Real_vector_from_buffer(PyObject *obj);
+
+// converter from any of the supported Python inputs -> std::vector
+std::vector<Real> make_Real_vector(PyObject *obj);
+
+// check if the obj is a ql.DoubleVector, or a list, tuple or float64 buffer
 bool check_Real_vector(PyObject *obj);
 
+// check if obj exposes a contiguous, 1D float64 buffer
+bool check_Real_buffer(PyObject *obj);
+
+////////////////////// float64 buffers ////////////////////
+
+// RAII access to a C-contiguous float64 Python buffer (numpy array,
+// array.array('d'), memoryview, ...). Throws std::invalid_argument if obj
+// does not expose such a buffer.
+class Float64Buffer {
+public:
+  explicit Float64Buffer(PyObject *obj, bool writable = false);
+  ~Float64Buffer();
+  Float64Buffer(const Float64Buffer &) = delete;
+  Float64Buffer &operator=(const Float64Buffer &) = delete;
+
+  double *data() const { return static_cast<double *>(view_.buf); }
+  size_t size() const { return view_.len / sizeof(double); }
+  int ndim() const { return view_.ndim; }
+  size_t shape(int i) const;
+
+  // true if obj exposes a contiguous 1D (or scalar) float64 buffer
+  static bool check(PyObject *obj);
+
+private:
+  Py_buffer view_;
+};
+
+// new uninitialised C-contiguous float64 numpy array of the given shape
+PyObject *make_float64_array(const std::vector<size_t> &shape);
+
+// tuple of numpy arrays (data, indices, indptr) of a matrix in compressed
+// sparse row format, as taken by scipy.sparse.csr_matrix
+PyObject *make_csr_arrays(const std::vector<double> &data,
+                          const std::vector<std::int32_t> &indices,
+                          const std::vector<std::int32_t> &indptr);
+
 //////////////////// DoublePairVector /////////////////
 
 using DoublePairVector = std::vector<std::pair<Real, Real>>;
@@ -139,5 +236,44 @@ make_date_real_pair_vector_from_list(PyObject *obj);
 bool check_date_real_pair_list(PyObject *obj);
 
 /////////// Tape ///////////////
+#ifdef QLR_HAS_TAPE
 bool check_Tape(PyObject* obj);
-xad::Tape<double> &make_Tape_ref(PyObject *obj);
\ No newline at end of file
+ActiveTape &make_Tape_ref(PyObject *obj);
+#endif
+
+// raised (as a Python MemoryError) by wrapped calls while the active tape is
+// over its memory limit
+class TapeMemoryError : public std::runtime_error {
+public:
+  using std::runtime_error::runtime_error;
+};
+
+#ifdef QLR_HAS_TAPE
+// true while any tape has a memory limit set
+extern std::atomic<bool> tape_memory_limits_set;
+
+// throws TapeMemoryError if the active tape is over its limit
+void check_tape_memory_limit();
+
+// updates the peak memory of the active tape if it has a limit
+void sample_tape_memory_peak();
+#endif
+
+// called before each wrapped QuantLib call (see %exception in quantlib.i).
+// XAD has no hook into the recording itself, so this is a soft limit: a
+// single call can record past it, and only the next call raises.
+inline void check_tape_memory() {
+#ifdef QLR_HAS_TAPE
+  if (tape_memory_limits_set.load(std::memory_order_relaxed))
+    check_tape_memory_limit();
+#endif
+}
+
+// called after each wrapped QuantLib call, so that the peak memory includes
+// what the call recorded
+inline void sample_tape_memory() {
+#ifdef QLR_HAS_TAPE
+  if (tape_memory_limits_set.load(std::memory_order_relaxed))
+    sample_tape_memory_peak();
+#endif
+}
\ No newline at end of file
@@ -0,0 +1,109 @@
+# -*- coding: iso-8859-1 -*-
+"""
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+ QuantLib is free software: you can redistribute it and/or modify it
+ under the terms of the QuantLib license.  You should have received a
+ copy of the license along with this program; if not, please email
+ <quantlib-dev@lists.sf.net>. The license is also available online at
+ <http://quantlib.org/license.shtml>.
+
+ This program is distributed in the hope that it will be useful, but WITHOUT
+ ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+ FOR A PARTICULAR PURPOSE.  See the license for more details.
+"""
+
+# Second order (adjoint over forward) build of QuantLib-Risks, with
+# xad::AReal<xad::FReal<double>> as the Real type, recorded on a
+# xad::Tape<xad::FReal<double>>. Each recording with a tangent direction seeded
+# on the inputs gives the gradient and one row of the Hessian from a single
+# adjoint sweep.
+
+from .QuantLib_Risks import *
+
+from typing import Callable, Optional, Union, Tuple, List
+
+# as part of the input at the top, we'll have _QuantLib_Risks in scope
+Real = _QuantLib_Risks.Real
+Tape = _QuantLib_Risks.Tape
+DoubleVector = _QuantLib_Risks.DoubleVector
+DoublePairVector = _QuantLib_Risks.DoublePairVector
+DoubleVectorVector = _QuantLib_Risks.DoubleVectorVector
+
+
+def Concentrating1dMesherPoint(
+    x1: Union[Real, float, int], x2: Union[Real, float, int], v: bool
+) -> Tuple[Real, Real, bool]:
+    return (Real(float(x1)), Real(float(x2)), bool(v))
+
+
+def PairDoubleVector(
+    x1: List[Union[Real, float, int]] = [], x2: List[Union[Real, float, int]] = []
+) -> Tuple[List[Real], List[Real]]:
+    return ([Real(float(x)) for x in x1], [Real(float(x)) for x in x2])
+
+
+def registerInputArray(tape: Tape, values) -> DoubleVector:
+    """Creates a DoubleVector from a 1D float array and registers all its
+    elements as inputs on the given tape."""
+    return _QuantLib_Risks._register_inputs(tape, values)
+
+
+def derivatives(inputs) -> "numpy.ndarray":
+    """Returns the derivatives of a DoubleVector or an iterable of Reals as a
+    float64 numpy array of shape (len(inputs), 2), holding the first order
+    adjoints and the tangents of the adjoints."""
+    return _QuantLib_Risks._derivatives(inputs)
+
+
+def computeGradient(tape: Tape, output: Real, inputs) -> "numpy.ndarray":
+    """Seeds output with 1, rolls back the tape and returns the derivatives
+    of all inputs as a numpy array, as in derivatives()."""
+    return _QuantLib_Risks._gradient(tape, output, inputs)
+
+
+def tapeStats(tape: Tape) -> dict:
+    """Returns the memory statistics of a tape, see QuantLib_Risks.tapeStats."""
+    return _QuantLib_Risks._tape_stats(tape)
+
+
+def setTapeMemoryLimit(tape: Tape, limit: Optional[int]) -> None:
+    """Sets or removes a memory limit on the tape, see
+    QuantLib_Risks.setTapeMemoryLimit."""
+    _QuantLib_Risks._set_tape_memory_limit(tape, limit)
+
+
+def hessian(
+    tape: Tape, inputs, price: Callable[[], Real]
+) -> Tuple[float, "numpy.ndarray", "numpy.ndarray"]:
+    """Returns the value, the gradient and the dense Hessian of the output of
+    price() with respect to the registered inputs (e.g. from
+    registerInputArray).
+
+    price is called once per input, each time on a new recording with the
+    tangent of one input seeded, and must re-evaluate the output from the
+    inputs - e.g. reset and set the quotes linked to them, then price."""
+    return _QuantLib_Risks._hessian(tape, inputs, price)
+
+
+if hasattr(_QuantLib_Risks, "__version__"):
+    __version__ = _QuantLib_Risks.__version__
+elif hasattr(_QuantLib_Risks.cvar, "__version__"):
+    __version__ = _QuantLib_Risks.cvar.__version__
@@ -0,0 +1,195 @@
+"""
+ Longstaff-Schwartz pricing of American options with stored regression
+ coefficients and pathwise sensitivities.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from xad.adj_1st import Real
+
+from . import (
+    Continuous,
+    Date,
+    GeneralizedBlackScholesProcess,
+    InvCumulativeMersenneTwisterGaussianRsg,
+    MersenneTwisterUniformRsg,
+    Option,
+    PlainVanillaPayoff,
+)
+
+
+class LongstaffSchwartz:
+    """Prices an American vanilla option on a Black-Scholes process by least
+    squares Monte Carlo, exercisable on timeSteps equally spaced dates.
+
+    calibrate() simulates calibrationSamples paths and regresses the
+    continuation values on a monomial basis of the moneyness, backwards in
+    time, storing the coefficients of each exercise date. NPV() then prices on
+    independent paths, generated and discarded in blocks of blockSize, with
+    the stored exercise boundary; it recalibrates only if calibrate() was never
+    called, so that re-prices and bumped prices share the same boundary.
+
+    The boundary is held fixed when differentiating, and the derivatives of
+    the exercised payoffs to the spot, volatility, rate and dividend yield are
+    accumulated pathwise along with the value. NPV() returns a Real carrying
+    these derivatives: under a Tape, they flow back to the quotes and curves
+    of the process without recording any path.
+
+    Limitations: the process parameters are taken flat at their maturity
+    values (zero rates and Black volatility at the strike), so term structures
+    of rates and volatility are not followed; there is no dividend schedule,
+    only a continuous dividend yield; and this is a pure NumPy simulation
+    rather than a mode of QuantLib's MCAmericanEngine, so engine options such
+    as antithetic variates or control variates are not available.
+    """
+
+    def __init__(
+        self,
+        process: GeneralizedBlackScholesProcess,
+        payoff: PlainVanillaPayoff,
+        maturity: Date,
+        timeSteps: int = 50,
+        samples: int = 100000,
+        calibrationSamples: int = 4096,
+        blockSize: int = 8192,
+        polynomOrder: int = 2,
+        seed: int = 42,
+    ):
+        self.process = process
+        self.payoff = payoff
+        self.maturity = maturity
+        self.timeSteps = timeSteps
+        self.samples = samples
+        self.calibrationSamples = calibrationSamples
+        self.blockSize = blockSize
+        self.polynomOrder = polynomOrder
+        self.seed = seed
+        #: regression coefficients of exercise dates 1, ..., timeSteps - 1
+        self.coefficients: Optional[List[np.ndarray]] = None
+
+    def _parameters(self) -> Tuple[Real, Real, Real, Real, float]:
+        strike = self.payoff.strike()
+        t = self.process.riskFreeRate().timeFromReference(self.maturity)
+        r = self.process.riskFreeRate().zeroRate(t, Continuous).rate()
+        q = self.process.dividendYield().zeroRate(t, Continuous).rate()
+        sigma = self.process.blackVolatility().blackVol(t, strike)
+        return self.process.x0(), sigma, r, q, t
+
+    def _paths(self, n: int, seed: int, s0: float, sigma: float, r: float, q: float,
+               t: float) -> Tuple[np.ndarray, np.ndarray]:
+        # asset values and Brownian motion at the exercise dates 1, ..., timeSteps
+        rsg = InvCumulativeMersenneTwisterGaussianRsg(
+            MersenneTwisterUniformRsg(self.timeSteps, seed)
+        )
+        dt = t / self.timeSteps
+        w = np.cumsum(rsg.nextBatch(n) * np.sqrt(dt), axis=1)
+        times = dt * np.arange(1, self.timeSteps + 1)
+        s = s0 * np.exp((r - q - 0.5 * sigma * sigma) * times + sigma * w)
+        return s, w
+
+    def _exercise(self, s: np.ndarray) -> np.ndarray:
+        strike = self.payoff.strike().value
+        if self.payoff.optionType() == Option.Call:
+            return np.maximum(s - strike, 0.0)
+        return np.maximum(strike - s, 0.0)
+
+    def _basis(self, s: np.ndarray) -> np.ndarray:
+        return np.vander(s / self.payoff.strike().value, self.polynomOrder + 1)
+
+    def calibrate(self) -> None:
+        """Computes and stores the regression coefficients of the exercise
+        boundary on calibrationSamples paths."""
+        s0, sigma, r, q, t = [getattr(x, "value", x) for x in self._parameters()]
+        s, _ = self._paths(self.calibrationSamples, self.seed, s0, sigma, r, q, t)
+        growth = np.exp(-r * t / self.timeSteps)
+        cash = self._exercise(s[:, -1])
+        coefficients = [None] * (self.timeSteps - 1)
+        for i in range(self.timeSteps - 2, -1, -1):
+            cash *= growth
+            exercise = self._exercise(s[:, i])
+            itm = exercise > 0.0
+            beta = np.zeros(self.polynomOrder + 1)
+            if itm.sum() > self.polynomOrder:
+                beta = np.linalg.lstsq(self._basis(s[itm, i]), cash[itm], rcond=None)[0]
+                stop = itm.copy()
+                stop[itm] = exercise[itm] > self._basis(s[itm, i]) @ beta
+                cash[stop] = exercise[stop]
+            coefficients[i] = beta
+        self.coefficients = coefficients
+
+    def NPV(self) -> Real:
+        """Prices on independent paths with the stored boundary and returns the
+        value as a Real carrying its pathwise derivatives."""
+        if self.coefficients is None:
+            self.calibrate()
+        x0, sigma_, r_, q_, t = self._parameters()
+        s0, sigma, r, q = [getattr(x, "value", x) for x in (x0, sigma_, r_, q_)]
+        call = self.payoff.optionType() == Option.Call
+        times = t / self.timeSteps * np.arange(1, self.timeSteps + 1)
+
+        # sum of the discounted payoffs and of their derivatives to s0, sigma, r, q
+        totals = np.zeros(5)
+        done = 0
+        block = 0
+        while done < self.samples:
+            n = min(self.blockSize, self.samples - done)
+            # calibration uses the seed itself, pricing the following ones
+            s, w = self._paths(n, self.seed + 1 + block, s0, sigma, r, q, t)
+            exercise = self._exercise(s)
+            # first exercise date where exercising beats the continuation value
+            stop = np.full(n, self.timeSteps - 1)
+            pending = np.ones(n, dtype=bool)
+            for i, beta in enumerate(self.coefficients):
+                candidates = pending & (exercise[:, i] > 0.0)
+                if candidates.any():
+                    continuation = self._basis(s[candidates, i]) @ beta
+                    hit = np.flatnonzero(candidates)[exercise[candidates, i] > continuation]
+                    stop[hit] = i
+                    pending[hit] = False
+            rows = np.arange(n)
+            s_tau, w_tau, tau = s[rows, stop], w[rows, stop], times[stop]
+            payoff = exercise[rows, stop]
+            df = np.exp(-r * tau)
+            # pathwise derivative of the payoff to the asset value
+            dh = np.where(payoff > 0.0, 1.0 if call else -1.0, 0.0) * df
+            totals += [
+                np.sum(df * payoff),
+                np.sum(dh * s_tau / s0),
+                np.sum(dh * s_tau * (w_tau - sigma * tau)),
+                np.sum(dh * s_tau * tau - tau * df * payoff),
+                -np.sum(dh * s_tau * tau),
+            ]
+            done += n
+            block += 1
+        value, delta, vega, rho, dividendRho = totals / self.samples
+
+        # first order expansion around the current parameters, recording only
+        # the dependency on them
+        return (
+            value
+            + delta * (x0 - s0)
+            + vega * (sigma_ - sigma)
+            + rho * (r_ - r)
+            + dividendRho * (q_ - q)
+        )
@@ -0,0 +1,353 @@
+"""
+ Portfolio risk over a pool of worker processes, with the market data and the
+ results exchanged through shared memory, and Monte Carlo pricing in blocks
+ over a pool of threads.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from xad.adj_1st import Tape
+
+from . import (
+    Actual365Fixed,
+    Annual,
+    Calendar,
+    Date,
+    DayCounter,
+    DiscountingSwapEngine,
+    Euribor6M,
+    IborIndex,
+    Instrument,
+    Period,
+    PiecewiseFlatForward,
+    QuoteHandle,
+    Settings,
+    SimpleQuote,
+    SwapRateHelper,
+    TARGET,
+    Thirty360,
+    Unadjusted,
+    Years,
+    YieldTermStructureHandle,
+    jacobian,
+    registerInputArray,
+)
+
+
+class SwapMarket:
+    """The objects built on a SwapCurve, passed to the trade builders."""
+
+    def __init__(self, quotes: Sequence[SimpleQuote], curve: YieldTermStructureHandle,
+                 index: IborIndex, engine: DiscountingSwapEngine):
+        self.quotes = list(quotes)
+        self.curve = curve
+        self.index = index
+        self.engine = engine
+
+
+class SwapCurve:
+    """Describes a PiecewiseFlatForward curve bootstrapped from SwapRateHelpers,
+    one per tenor in years. By default the floating leg is on Euribor 6M and
+    the fixed leg is annual, unadjusted and 30/360.
+
+    The description is picklable, so that each worker process can build its
+    own copy of the curve once. The rates themselves are not part of it: they
+    are given to every PortfolioRisk call. QuantLib indexes and day counters
+    cannot be pickled, so index, fixedDayCounter and dayCounter are picklable
+    callables building them, e.g. Euribor3M or
+    functools.partial(Thirty360, Thirty360.ISDA); index is called with the
+    forecasting curve handle, or without arguments for the helpers.
+    """
+
+    def __init__(
+        self,
+        evaluationDate: int,
+        tenors: Sequence[int],
+        index: Callable[..., IborIndex] = Euribor6M,
+        calendar: Optional[Calendar] = None,
+        fixedFrequency: int = Annual,
+        fixedConvention: int = Unadjusted,
+        fixedDayCounter: Callable[[], DayCounter] = functools.partial(
+            Thirty360, Thirty360.BondBasis
+        ),
+        dayCounter: Callable[[], DayCounter] = Actual365Fixed,
+    ):
+        self.evaluationDate = int(evaluationDate)
+        self.tenors = [int(n) for n in tenors]
+        self.index = index
+        self.calendar = calendar if calendar is not None else TARGET()
+        self.fixedFrequency = fixedFrequency
+        self.fixedConvention = fixedConvention
+        self.fixedDayCounter = fixedDayCounter
+        self.dayCounter = dayCounter
+
+    def build(self, inputs) -> SwapMarket:
+        """Builds the curve with one quote per tenor, linked to the given
+        inputs, and returns it with its forecasting index and swap engine."""
+        today = Date(self.evaluationDate)
+        Settings.instance().evaluationDate = today
+        quotes = [SimpleQuote(x) for x in inputs]
+        helpers = [
+            SwapRateHelper(
+                QuoteHandle(q), Period(n, Years), self.calendar,
+                self.fixedFrequency, self.fixedConvention, self.fixedDayCounter(),
+                self.index(),
+            )
+            for q, n in zip(quotes, self.tenors)
+        ]
+        curve = YieldTermStructureHandle(
+            PiecewiseFlatForward(today, helpers, self.dayCounter())
+        )
+        return SwapMarket(quotes, curve, self.index(curve), DiscountingSwapEngine(curve))
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # the buffers are owned and unlinked by the parent process; before Python
+    # 3.13 attaching also registers them with the resource tracker, which
+    # would unlink them when the first worker exits
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class _Worker:
+    def __init__(self, curve: SwapCurve, trades, rows: Sequence[int], names: Tuple[str, str, str]):
+        n_inputs = len(curve.tenors)
+        n_trades = len(trades)
+        self.buffers = [_attach(name) for name in names]
+        rates, npvs, gradients = self.buffers
+        self.rates = np.ndarray((n_inputs,), np.float64, rates.buf)
+        self.npvs = np.ndarray((n_trades,), np.float64, npvs.buf)
+        self.gradients = np.ndarray((n_trades, n_inputs), np.float64, gradients.buf)
+
+        self.tape = Tape()
+        self.tape.activate()
+        self.inputs = registerInputArray(self.tape, np.zeros(n_inputs))
+        self.market = curve.build(self.inputs)
+        self.rows = list(rows)
+        self.trades = [trades[i](self.market) for i in self.rows]
+
+    def price(self) -> int:
+        if not self.rows:
+            return 0
+        # all the trades of the worker go on a single recording of the curve
+        self.inputs.setValues(self.rates)
+        self.tape.newRecording()
+        for q, x in zip(self.market.quotes, self.inputs):
+            # setValue only notifies observers if the value changed, but the
+            # curve needs to be recorded again on the new recording
+            q.reset()
+            q.setValue(x)
+        npvs = [trade.NPV() for trade in self.trades]
+        self.gradients[self.rows] = jacobian(self.tape, npvs, self.inputs)
+        self.npvs[self.rows] = [npv.value for npv in npvs]
+        return len(self.rows)
+
+
+def _serve(conn, curve, trades, rows, names):
+    # main loop of a worker process: prices its rows on every request, and
+    # sends back the number of trades priced or the exception raised
+    try:
+        worker, error = _Worker(curve, trades, rows, names), None
+    except Exception as e:
+        worker, error = None, e
+    while conn.recv() is not None:
+        try:
+            if error is not None:
+                raise error
+            conn.send(worker.price())
+        except Exception as e:
+            try:
+                conn.send(e)
+            except Exception:
+                # the exception itself may not be picklable
+                conn.send(RuntimeError(repr(e)))
+    conn.close()
+
+
+class PortfolioRisk:
+    """Prices a book of trades and their sensitivities to the curve rates on a
+    pool of worker processes.
+
+    The book is split into ``chunks`` chunks (every ``chunks``-th trade),
+    dealt round-robin to the workers once and for all. Each worker builds the
+    curve and the trades of its chunks once. Every call writes the rates to a
+    shared memory buffer, and each worker re-records the curve and all its
+    trades on a single recording of its own tape and writes the NPVs and the
+    adjoint sensitivities straight into shared result buffers, so that
+    nothing is pickled per call but a request and a count per worker.
+
+    The trade builders take a SwapMarket and return an Instrument with its
+    pricing engine set. They are sent to the workers once, so they have to be
+    picklable, e.g. module-level functions or functools.partial objects.
+    Use as a context manager, or call close() to shut down the workers and
+    free the shared memory.
+    """
+
+    def __init__(
+        self,
+        curve: SwapCurve,
+        trades: Sequence[Callable[[SwapMarket], Instrument]],
+        workers: Optional[int] = None,
+        chunks: Optional[int] = None,
+        mp_context=None,
+    ):
+        self.curve = curve
+        self.trades = list(trades)
+        n_inputs = len(curve.tenors)
+        n_trades = len(self.trades)
+        self._buffers = [
+            shared_memory.SharedMemory(create=True, size=max(n, 1) * 8)
+            for n in (n_inputs, n_trades, n_trades * n_inputs)
+        ]
+        rates, npvs, gradients = self._buffers
+        self._rates = np.ndarray((n_inputs,), np.float64, rates.buf)
+        self._npvs = np.ndarray((n_trades,), np.float64, npvs.buf)
+        self._gradients = np.ndarray((n_trades, n_inputs), np.float64, gradients.buf)
+        self._rates[:] = 0.0
+        workers = workers or os.cpu_count() or 1
+        self.chunks = chunks or workers
+        workers = min(workers, self.chunks)
+        names = tuple(b.name for b in self._buffers)
+        context = mp_context or multiprocessing.get_context()
+        self._workers = []
+        for w in range(workers):
+            owned = set(range(w, self.chunks, workers))
+            rows = [i for i in range(n_trades) if i % self.chunks in owned]
+            conn, child = context.Pipe()
+            process = context.Process(
+                target=_serve, args=(child, curve, self.trades, rows, names), daemon=True
+            )
+            process.start()
+            child.close()
+            self._workers.append((process, conn))
+
+    def __call__(self, rates) -> Tuple[np.ndarray, np.ndarray]:
+        """Prices the book for the given curve rates and returns the NPVs and
+        the (trades, rates) matrix of their derivatives to the rates."""
+        rates = np.ascontiguousarray(rates, dtype=np.float64)
+        if rates.shape != self._rates.shape:
+            raise ValueError(
+                f"expected {len(self._rates)} rates, got shape {rates.shape}"
+            )
+        if self._workers is None:
+            raise RuntimeError("the worker processes have been shut down")
+        self._rates[:] = rates
+        for _, conn in self._workers:
+            conn.send(True)
+        # collect every reply before raising, so that no worker is left with
+        # an unread result for the next call
+        results = [conn.recv() for _, conn in self._workers]
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        priced = sum(results)
+        if priced != len(self.trades):
+            raise RuntimeError(
+                f"the workers priced {priced} trades out of {len(self.trades)}"
+            )
+        return self._npvs.copy(), self._gradients.copy()
+
+    def close(self) -> None:
+        """Shuts down the worker processes and releases the shared memory."""
+        if self._workers is None:
+            return
+        for process, conn in self._workers:
+            try:
+                conn.send(None)
+            except OSError:
+                # the worker has already exited
+                pass
+        for process, conn in self._workers:
+            process.join()
+            conn.close()
+        self._workers = None
+        del self._rates, self._npvs, self._gradients
+        for shm in self._buffers:
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def blockSeeds(seed: int, blocks: int) -> List[int]:
+    """Returns one RNG seed per Monte Carlo block, derived from seed only, so
+    that each block draws the same numbers whichever thread prices it."""
+    state = np.random.SeedSequence(seed).generate_state(blocks)
+    # QuantLib treats a seed of 0 as "seed from the clock"
+    return [int(s) or 1 for s in state]
+
+
+def monteCarloBlocks(
+    setup: Callable[[], Callable[[int], float]],
+    blocks: int,
+    threads: int = 1,
+    seed: int = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Prices Monte Carlo blocks on a pool of threads and returns the mean of
+    the block estimates and its error estimate.
+
+    setup() is called once in each thread and returns priceBlock(seed), which
+    prices one block with an engine seeded with the given seed, e.g. an
+    MCEuropeanEngine with requiredSamples set to the block size. The threads
+    must not share QuantLib objects, so setup() builds its own process,
+    instrument and engine. It must also set the evaluation date and any other
+    Settings the pricing depends on: with QuantLib sessions, each thread has
+    its own Settings, and those of the calling thread do not apply to the
+    pool. The seeds come from blockSeeds(seed, blocks) and
+    the estimates are combined in block order, so the results are identical
+    for any number of threads. priceBlock may return an array (e.g. a value
+    and its gradient from blockwiseGradient on a thread's own Tape), which is
+    averaged elementwise.
+
+    The threads only run concurrently if the module is built with
+    QLR_RELEASE_GIL.
+    """
+    seeds = blockSeeds(seed, blocks)
+    local = threading.local()
+
+    def run(b):
+        if not hasattr(local, "priceBlock"):
+            local.priceBlock = setup()
+        return np.asarray(local.priceBlock(seeds[b]), dtype=np.float64)
+
+    with ThreadPoolExecutor(threads) as pool:
+        estimates = np.array(list(pool.map(run, range(blocks))))
+    mean = estimates.mean(axis=0)
+    if blocks < 2:
+        return mean, np.zeros_like(mean)
+    return mean, estimates.std(axis=0, ddof=1) / np.sqrt(blocks)
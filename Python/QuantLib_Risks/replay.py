@@ -0,0 +1,97 @@
+"""
+ Repeated revaluation of a fixed QuantLib object graph on a single tape.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from xad.adj_1st import Real, Tape
+
+from . import _QuantLib_Risks, SimpleQuote, computeGradient, registerInputArray
+
+
+class TapeReplay:
+    """Re-prices a fixed set of instruments and curves for new quote values.
+
+    The curves, helpers and instruments are built once and linked to the given
+    quotes. Each call sets new quote values, re-records only the pricing on the
+    same tape (keeping the registered inputs and the tape memory already
+    allocated) and rolls back the tape to return the gradient.
+
+    XAD tapes store the partial derivatives of the recorded operations rather
+    than the operations themselves, so the forward pass is re-executed and
+    re-recorded for every set of values, and the value and gradient returned
+    are always those of the new recording. The number of statements recorded
+    is compared to the previous recording; a different count means the control
+    flow changed (e.g. a different number of solver iterations in a
+    bootstrap). This is reported in ``diverged`` and passed to
+    ``on_divergence`` for information only, e.g. to monitor the stability of a
+    calibration; it does not affect the results.
+    """
+
+    def __init__(
+        self,
+        tape: Tape,
+        quotes: Sequence[SimpleQuote],
+        price: Callable[[], Real],
+        on_divergence: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.tape = tape
+        self.quotes = list(quotes)
+        self.price = price
+        self.on_divergence = on_divergence
+        self.inputs = registerInputArray(
+            tape, np.array([q.value().value for q in self.quotes])
+        )
+        self.statements = None
+        self.diverged = False
+        self.recordings = 0
+
+    def __call__(self, values) -> Tuple[float, np.ndarray]:
+        """Prices for the given quote values and returns the value and the
+        derivatives with respect to all quotes."""
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if values.shape != (len(self.quotes),):
+            raise ValueError(
+                f"expected {len(self.quotes)} quote values, got shape {values.shape}"
+            )
+        self.inputs.setValues(values)
+
+        self.tape.newRecording()
+        start = _QuantLib_Risks._tape_position(self.tape)
+        for q, x in zip(self.quotes, self.inputs):
+            # setValue only notifies observers if the value changed, but the
+            # dependent objects need to recalculate for the new recording
+            q.reset()
+            q.setValue(x)
+        output = self.price()
+        statements = _QuantLib_Risks._tape_position(self.tape) - start
+        gradient = computeGradient(self.tape, output, self.inputs)
+        self.recordings += 1
+
+        self.diverged = self.statements is not None and statements != self.statements
+        if self.diverged and self.on_divergence is not None:
+            self.on_divergence(self.statements, statements)
+        self.statements = statements
+
+        return output.value, gradient
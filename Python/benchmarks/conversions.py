@@ -0,0 +1,65 @@
+"""
+Benchmark of the conversion of Python sequences to QuantLib vectors of Real.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import array
+import timeit
+
+import numpy as np
+import QuantLib_Risks as ql
+
+SIZES = [10, 1_000, 100_000]
+
+
+def inputs(n):
+    values = np.linspace(0.0, 30.0, n)
+    return {
+        "list": values.tolist(),
+        "tuple": tuple(values.tolist()),
+        "array('d')": array.array("d", values.tolist()),
+        "ndarray": values,
+        "DoubleVector": ql.DoubleVector(values.tolist()),
+    }
+
+
+def run(label, fn, n):
+    print(f"{label:14} {n:>8}", end="", flush=True)
+    for name, x in inputs(n).items():
+        try:
+            fn(x)
+        except TypeError:
+            print(f" {name}: {'n/a':>12}", end="", flush=True)
+            continue
+        reps = max(1, 100_000 // n)
+        t = min(timeit.repeat(lambda: fn(x), number=reps, repeat=5)) / reps
+        print(f" {name}: {t * 1e6:10.1f}us", end="", flush=True)
+    print()
+
+
+if __name__ == "__main__":
+    print("std::vector<Real> argument (TimeGrid):")
+    for n in SIZES:
+        run("TimeGrid", ql.TimeGrid, n)
+
+    print("\nArray argument (LinearInterpolation):")
+    for n in SIZES:
+        run("Interpolation", lambda x: ql.LinearInterpolation(x, x), n)
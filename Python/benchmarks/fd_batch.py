@@ -0,0 +1,73 @@
+"""
+Finite difference pricing of a surface of vanilla options on one underlying,
+one engine per option against FdBlackScholesVanillaBatch, which shares the
+mesh and rolls back each maturity once.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import QuantLib_Risks as ql
+
+T_GRID = 100
+X_GRID = 200
+
+
+def surface(today):
+    options = []
+    for months in range(1, 21):
+        exercise = ql.EuropeanExercise(today + ql.Period(3 * months, ql.Months))
+        for strike in range(52, 152, 4):
+            options.append(
+                ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Call, float(strike)), exercise)
+            )
+    return options
+
+
+if __name__ == "__main__":
+    today = ql.Date(15, ql.May, 2024)
+    ql.Settings.instance().evaluationDate = today
+    dc = ql.Actual365Fixed()
+    process = ql.BlackScholesMertonProcess(
+        ql.QuoteHandle(ql.SimpleQuote(100.0)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, 0.01, dc)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, 0.03, dc)),
+        ql.BlackVolTermStructureHandle(ql.BlackConstantVol(today, ql.TARGET(), 0.2, dc)),
+    )
+    options = surface(today)
+    print(f"{len(options)} options, {T_GRID}x{X_GRID} grid")
+
+    t0 = time.perf_counter()
+    engine = ql.FdBlackScholesVanillaEngine(process, T_GRID, X_GRID)
+    single = []
+    for option in options:
+        option.setPricingEngine(engine)
+        single.append(option.NPV())
+    elapsed_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = ql.FdBlackScholesVanillaBatch(process, tGrid=T_GRID, xGrid=X_GRID).NPV(options)
+    elapsed_batch = time.perf_counter() - t0
+
+    diff = max(abs(a.value - b.value) for a, b in zip(single, batch))
+    print(f"per option: {elapsed_single * 1e3:9.1f}ms")
+    print(f"batch:      {elapsed_batch * 1e3:9.1f}ms  speed-up: {elapsed_single / elapsed_batch:5.2f}x")
+    print(f"max price difference: {diff:.2e}")
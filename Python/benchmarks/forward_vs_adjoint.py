@@ -0,0 +1,109 @@
+"""
+Benchmark of forward (QuantLib_Risks.fwd) against adjoint mode for a few
+inputs (spot, volatility, rate) and many outputs (a strip of options), using
+the engines of the european-option.py and american-option.py examples.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import numpy as np
+import QuantLib_Risks as adj
+import QuantLib_Risks.fwd as fwd
+from xad.adj_1st import Tape
+
+INPUTS = [7.0, 0.10, 0.05]  # spot, volatility, risk-free rate
+STRIKES = np.linspace(5.0, 9.0, 200)
+
+
+def setup(ql, american, engine):
+    today = ql.Date(15, ql.May, 1998)
+    ql.Settings.instance().evaluationDate = today
+    dc = ql.Actual365Fixed()
+    quotes = [ql.SimpleQuote(x) for x in INPUTS]
+    spot, vol, rate = quotes
+    process = ql.BlackScholesMertonProcess(
+        ql.QuoteHandle(spot),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, 0.05, dc)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, ql.QuoteHandle(rate), dc)),
+        ql.BlackVolTermStructureHandle(
+            ql.BlackConstantVol(today, ql.TARGET(), ql.QuoteHandle(vol), dc)
+        ),
+    )
+    maturity = ql.Date(17, ql.May, 1999)
+    if american:
+        exercise = ql.AmericanExercise(today, maturity)
+    else:
+        exercise = ql.EuropeanExercise(maturity)
+    options = []
+    for k in STRIKES:
+        option = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Put, float(k)), exercise)
+        option.setPricingEngine(engine(ql, process))
+        options.append(option)
+    return quotes, options
+
+
+def adjoint_greeks(american, engine):
+    quotes, options = setup(adj, american, engine)
+    with Tape() as tape:
+        x = adj.registerInputArray(tape, np.array(INPUTS))
+        tape.newRecording()
+        for q, xi in zip(quotes, x):
+            q.reset()
+            q.setValue(xi)
+        npvs = [o.NPV() for o in options]
+        return adj.jacobian(tape, npvs, x)
+
+
+def forward_greeks(american, engine):
+    quotes, options = setup(fwd, american, engine)
+    jac = np.empty((len(options), len(INPUTS)))
+    for i in range(len(INPUTS)):
+        for j, (q, value) in enumerate(zip(quotes, INPUTS)):
+            x = fwd.Real(value)
+            x.derivative = 1.0 if i == j else 0.0
+            q.reset()
+            q.setValue(x)
+        jac[:, i] = fwd.derivatives([o.NPV() for o in options])
+    return jac
+
+
+ENGINES = [
+    ("European analytic", False, lambda ql, p: ql.AnalyticEuropeanEngine(p)),
+    ("European FD 101x100", False, lambda ql, p: ql.FdBlackScholesVanillaEngine(p, 101, 100)),
+    ("American BAW", True, lambda ql, p: ql.BaroneAdesiWhaleyApproximationEngine(p)),
+    ("American FD 101x100", True, lambda ql, p: ql.FdBlackScholesVanillaEngine(p, 101, 100)),
+]
+
+
+if __name__ == "__main__":
+    print(f"{len(INPUTS)} inputs, {len(STRIKES)} options")
+    for name, american, engine in ENGINES:
+        t0 = time.perf_counter()
+        jac_adj = adjoint_greeks(american, engine)
+        t1 = time.perf_counter()
+        jac_fwd = forward_greeks(american, engine)
+        t2 = time.perf_counter()
+        diff = np.max(np.abs(jac_adj - jac_fwd))
+        print(
+            f"{name:22} adjoint: {(t1 - t0) * 1e3:9.1f}ms  forward: {(t2 - t1) * 1e3:9.1f}ms"
+            f"  max diff: {diff:.2e}"
+        )
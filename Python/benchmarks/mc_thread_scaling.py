@@ -0,0 +1,78 @@
+"""
+Thread scaling of Monte Carlo pricing in blocks, for a module built with
+QLR_RELEASE_GIL. Each thread builds its own process, option and engines and
+prices the blocks it picks up; the block seeds only depend on the block, so
+the price is the same for every thread count.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import os
+import time
+
+import QuantLib_Risks as ql
+from QuantLib_Risks.parallel import monteCarloBlocks
+
+BLOCKS = 64
+SAMPLES_PER_BLOCK = 20000
+
+
+def setup():
+    today = ql.Date(15, ql.May, 2024)
+    ql.Settings.instance().evaluationDate = today
+    dc = ql.Actual365Fixed()
+    process = ql.BlackScholesProcess(
+        ql.QuoteHandle(ql.SimpleQuote(100.0)),
+        ql.YieldTermStructureHandle(ql.FlatForward(today, 0.03, dc)),
+        ql.BlackVolTermStructureHandle(ql.BlackConstantVol(today, ql.TARGET(), 0.2, dc)),
+    )
+    option = ql.VanillaOption(
+        ql.PlainVanillaPayoff(ql.Option.Call, 100.0),
+        ql.EuropeanExercise(ql.Date(15, ql.May, 2025)),
+    )
+
+    def price_block(seed):
+        option.setPricingEngine(
+            ql.MCEuropeanEngine(
+                process, "pseudorandom", timeSteps=12,
+                requiredSamples=SAMPLES_PER_BLOCK, seed=seed,
+            )
+        )
+        return option.NPV().value
+
+    return price_block
+
+
+if __name__ == "__main__":
+    if not ql.RELEASES_GIL:
+        print("note: module built without QLR_RELEASE_GIL, threads will not scale")
+    print(f"{BLOCKS} blocks of {SAMPLES_PER_BLOCK} samples")
+    base = None
+    for threads in [1, 2, 4, 8, 16]:
+        if threads > 2 * (os.cpu_count() or 1):
+            break
+        t0 = time.perf_counter()
+        value, error = monteCarloBlocks(setup, BLOCKS, threads=threads, seed=42)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        print(
+            f"{threads:3d} threads: {elapsed * 1e3:9.1f}ms  speed-up: {base / elapsed:5.2f}x"
+            f"  price: {float(value):.10f} +/- {float(error):.2e}"
+        )
@@ -0,0 +1,92 @@
+"""
+Thread scaling of swap book valuation and adjoints, for a module built with
+QLR_RELEASE_GIL. Each thread builds its own curve and trades, evaluates them
+under its own tape and rolls it back.
+
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import QuantLib_Risks as ql
+from xad.adj_1st import Tape
+
+BOOK_SIZE = 800
+TENORS = [1, 2, 3, 5, 7, 10, 15, 20, 30]
+RATES = [0.030, 0.032, 0.034, 0.036, 0.037, 0.038, 0.039, 0.040, 0.040]
+
+
+def value_book(n_swaps):
+    """Builds a curve and n_swaps swaps in the calling thread, prices them on
+    a tape and returns the book NPV and its sensitivities to the swap rates."""
+    today = ql.Date(15, ql.May, 2024)
+    ql.Settings.instance().evaluationDate = today
+    calendar = ql.TARGET()
+    with Tape() as tape:
+        x = ql.registerInputArray(tape, np.array(RATES))
+        tape.newRecording()
+        index = ql.Euribor6M()
+        helpers = [
+            ql.SwapRateHelper(
+                ql.QuoteHandle(ql.SimpleQuote(r)), ql.Period(n, ql.Years), calendar,
+                ql.Annual, ql.Unadjusted, ql.Thirty360(ql.Thirty360.BondBasis), index,
+            )
+            for r, n in zip(x, TENORS)
+        ]
+        curve = ql.YieldTermStructureHandle(
+            ql.PiecewiseFlatForward(today, helpers, ql.Actual365Fixed())
+        )
+        engine = ql.DiscountingSwapEngine(curve)
+        forecast = ql.Euribor6M(curve)
+        book = []
+        for i in range(n_swaps):
+            swap = ql.MakeVanillaSwap(
+                ql.Period(1 + i % 20, ql.Years), forecast, 0.03 + 0.0001 * (i % 50),
+                ql.Period("0D"), pricingEngine=engine,
+            )
+            book.append(swap)
+        total = sum(swap.NPV() for swap in book)
+        return total.value, ql.computeGradient(tape, total, x)
+
+
+def run(threads):
+    per_thread = BOOK_SIZE // threads
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(value_book, [per_thread] * threads))
+    elapsed = time.perf_counter() - t0
+    return elapsed, results
+
+
+if __name__ == "__main__":
+    if not ql.RELEASES_GIL:
+        print("note: module built without QLR_RELEASE_GIL, threads will not scale")
+    print(f"{BOOK_SIZE} swaps")
+    base = None
+    for threads in [1, 2, 4, 8, 16]:
+        if threads > 2 * (os.cpu_count() or 1):
+            break
+        elapsed, _ = run(threads)
+        base = base or elapsed
+        print(f"{threads:3d} threads: {elapsed * 1e3:9.1f}ms  speed-up: {base / elapsed:5.2f}x")
@@ -30,6 +30,7 @@
  FOR A PARTICULAR PURPOSE.  See the license for more details.
 """
 import itertools
+import pickle
 import unittest
 
 import QuantLib_Risks as ql
@@ -65,6 +66,20 @@ class ResetBespokeCalendarTest(unittest.TestCase):
         self.assertFalse(calendar.isHoliday(test_date))
 
 
+class PickleCalendarTest(unittest.TestCase):
+
+    def test_pickle_calendars(self):
+        for calendar in [ql.TARGET(), ql.UnitedStates(ql.UnitedStates.NYSE),
+                         ql.UnitedKingdom(ql.UnitedKingdom.Exchange), ql.NullCalendar()]:
+            copy = pickle.loads(pickle.dumps(calendar))
+            self.assertEqual(copy.name(), calendar.name())
+            self.assertEqual(copy, calendar)
+
+    def test_unpicklable_calendars(self):
+        calendar = ql.BespokeCalendar("bespoke thing")
+        self.assertRaises(TypeError, pickle.dumps, calendar)
+
+
 if __name__ == "__main__":
     print("testing QuantLib", ql.__version__)
     unittest.main(verbosity=2)
@@ -30,6 +30,7 @@
  FOR A PARTICULAR PURPOSE.  See the license for more details.
 """
 
+import pickle
 import QuantLib_Risks as ql
 import unittest
 
@@ -81,6 +82,25 @@ wrong day, month, year increment
         # check if dates both from function and from manual imput are the same
         self.assertTrue(all([(a == b) for a, b in zip(holidayLstFunction, holidayLstManual)]))
 
+    def testPickle(self):
+        "Testing pickling of dates, periods and schedules"
+        date = ql.Date(15, ql.May, 2024)
+        self.assertEqual(pickle.loads(pickle.dumps(date)), date)
+        period = ql.Period(18, ql.Months)
+        self.assertEqual(pickle.loads(pickle.dumps(period)), period)
+
+        schedule = ql.MakeSchedule(date, ql.Date(15, ql.May, 2034), ql.Period(6, ql.Months),
+                                   calendar=ql.TARGET(), convention=ql.ModifiedFollowing,
+                                   rule=ql.DateGeneration.Backward)
+        copy = pickle.loads(pickle.dumps(schedule))
+        self.assertEqual(list(copy.dates()), list(schedule.dates()))
+        self.assertEqual(copy.calendar(), schedule.calendar())
+        self.assertEqual(copy.tenor(), schedule.tenor())
+        self.assertEqual(copy.rule(), schedule.rule())
+        self.assertEqual(list(copy.isRegular()), list(schedule.isRegular()))
+        self.assertEqual(len(schedule.datesToBytes()), 4 * len(schedule))
+        self.assertEqual(ql.datesFromBytes(schedule.datesToBytes()), list(schedule.dates()))
+
     def tearDown(self):
         pass
 
@@ -30,9 +30,12 @@
  FOR A PARTICULAR PURPOSE.  See the license for more details.
 """
 
+import sys
 import unittest
 
+import numpy as np
 import QuantLib_Risks as ql
+from QuantLib_Risks.adaptive import adaptiveNPV, fdBlackScholesVanillaEngine
 if ql.XAD_ENABLED:
     from xad import math
 else:
@@ -282,6 +285,131 @@ class FdmTest(unittest.TestCase):
         for u, v in zip(x, y):
             self.assertAlmostEqual(v, -u, 4)
 
+    def testFdmLinearOpBuffers(self):
+        """Testing CSR export and in-place application of linear operators"""
+
+        def values(a):
+            return np.array([getattr(v, "value", v) for v in a])
+
+        n = 50
+        mesher = ql.FdmMesherComposite(ql.Uniform1dMesher(0.0, 1.0, n))
+        op = ql.SecondDerivativeOp(0, mesher)
+        x = np.sin(np.linspace(0.0, 1.0, n))
+
+        data, indices, indptr = op.toCSR()
+        self.assertEqual(len(indptr), n + 1)
+        dense = np.zeros((n, n))
+        for row in range(n):
+            for k in range(indptr[row], indptr[row + 1]):
+                dense[row, indices[k]] = data[k]
+        expected = values(op.apply(x))
+        np.testing.assert_allclose(dense @ x, expected, rtol=1e-12, atol=1e-12)
+
+        y = x.copy()
+        op.apply_inplace(y)
+        np.testing.assert_allclose(y, expected, rtol=1e-12, atol=1e-12)
+
+        z = x.copy()
+        op.solve_splitting_inplace(z, 0.1, 1.0)
+        np.testing.assert_allclose(z, values(op.solve_splitting(x, 0.1, 1.0)), rtol=1e-12)
+        np.testing.assert_allclose((np.eye(n) + 0.1 * dense) @ z, x, rtol=1e-10, atol=1e-12)
+
+        with self.assertRaises(RuntimeError):
+            op.apply_inplace(list(x))
+
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(ql.SimpleQuote(100.0)),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.todaysDate, 0.02, ql.Actual365Fixed())),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.todaysDate, 0.05, ql.Actual365Fixed())),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackConstantVol(self.todaysDate, ql.TARGET(), 0.2, ql.Actual365Fixed()))
+        )
+        mesher = ql.FdmMesherComposite(ql.FdmBlackScholesMesher(n, process, 1.0, 100.0))
+        op = ql.FdmBlackScholesOp(mesher, process, 100.0)
+        op.setTime(0.0, 0.1)
+
+        data, indices, indptr = op.toCSR()
+        coo = op.to_sparse_matrix()
+        data2, indices2, indptr2 = coo.toCSR(n)
+        np.testing.assert_array_equal(indptr2, indptr)
+        np.testing.assert_array_equal(indices2, indices)
+        np.testing.assert_allclose(data2, data)
+
+        z = x.copy()
+        op.solve_splitting_inplace(0, z, 0.1)
+        np.testing.assert_allclose(z, values(op.solve_splitting(0, x, 0.1)), rtol=1e-12)
+
+    def testFdmCoefficientOp(self):
+        """Testing linear operators given by coefficient arrays"""
+
+        def values(a):
+            return np.array([getattr(v, "value", v) for v in a])
+
+        dc = ql.Actual365Fixed()
+        r, q, vol = 0.05, 0.02, 0.2
+        strike = 100.0
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(ql.SimpleQuote(100.0)),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.todaysDate, q, dc)),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.todaysDate, r, dc)),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackConstantVol(self.todaysDate, ql.TARGET(), vol, dc))
+        )
+        mesher = ql.FdmMesherComposite(ql.FdmBlackScholesMesher(100, process, 1.0, strike))
+        n = mesher.layout().size()
+        bsOp = ql.FdmBlackScholesOp(mesher, process, strike)
+        bsOp.setTime(0.0, 0.1)
+
+        coefficients = {
+            "drift": [r - q - 0.5 * vol * vol],
+            "diffusion": [np.full(n, 0.5 * vol * vol)],
+            "rate": r,
+        }
+        op = ql.FdmCoefficientOp(mesher, coefficients)
+        self.assertEqual(op.size(), 1)
+
+        x = np.exp(values(mesher.locations(0)))
+        np.testing.assert_allclose(
+            values(op.apply(x)), values(bsOp.apply(x)), rtol=1e-10, atol=1e-10)
+        np.testing.assert_allclose(
+            values(op.solve_splitting(0, x, 0.1)),
+            values(bsOp.solve_splitting(0, x, 0.1)), rtol=1e-10)
+
+        calls = []
+
+        def timeDependent(t1, t2):
+            calls.append((t1, t2))
+            return coefficients
+
+        payoff = ql.PlainVanillaPayoff(ql.Option.Put, strike)
+        exercise = ql.EuropeanExercise(self.todaysDate + ql.Period(1, ql.Years))
+        maturity = dc.yearFraction(self.todaysDate, exercise.lastDate())
+        innerValue = ql.FdmLogInnerValue(payoff, mesher, 0)
+        stepCondition = ql.FdmStepConditionComposite.vanillaComposite(
+            ql.DividendSchedule(), exercise, mesher, innerValue, self.todaysDate, dc)
+
+        rolled = []
+        for o in (ql.FdmBlackScholesOp(mesher, process, strike),
+                  ql.FdmCoefficientOp(mesher, timeDependent)):
+            rhs = ql.Array(np.maximum(strike - x, 0.0).tolist())
+            solver = ql.FdmBackwardSolver(
+                o, ql.FdmBoundaryConditionSet(), stepCondition, ql.FdmSchemeDesc.Douglas())
+            solver.rollback(rhs, maturity, 0.0, 20, 0)
+            rolled.append(values(rhs))
+
+        np.testing.assert_allclose(rolled[1], rolled[0], rtol=1e-8, atol=1e-8)
+        self.assertEqual(len(calls), 20)
+
+        invalid = {"drift": [0.0]}
+        refcount = sys.getrefcount(invalid)
+        self.assertRaises(RuntimeError, ql.FdmCoefficientOp, mesher, invalid)
+        self.assertEqual(sys.getrefcount(invalid), refcount)
+
+        with self.assertRaises(RuntimeError):
+            ql.FdmCoefficientOp(mesher, {"drift": [0.0, 0.0], "diffusion": [0.5]})
+        with self.assertRaises(RuntimeError):
+            ql.FdmCoefficientOp(mesher, {"drift": [np.zeros(n + 1)], "diffusion": [0.5]})
+
     def testFdmBoundaryCondition(self):
         """Testing Dirichlet Boundary conditions"""
 
@@ -527,6 +655,105 @@ class FdmTest(unittest.TestCase):
         self.assertAlmostEqual(calculated, expected, 1)
 
 
+    def testBlackScholesVanillaBatch(self):
+        """Testing batched pricing of vanilla options on a shared mesh"""
+
+        todaysDate = ql.Date(15, ql.January, 2020)
+        ql.Settings.instance().evaluationDate = todaysDate
+        dc = ql.Actual365Fixed()
+
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(ql.SimpleQuote(100.0)),
+            ql.YieldTermStructureHandle(ql.FlatForward(todaysDate, 0.02, dc)),
+            ql.YieldTermStructureHandle(ql.FlatForward(todaysDate, 0.06, dc)),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackConstantVol(todaysDate, ql.TARGET(), 0.20, dc))
+        )
+
+        options = []
+        for months in (6, 12):
+            maturityDate = todaysDate + ql.Period(months, ql.Months)
+            for strike in (90.0, 100.0, 110.0):
+                for optionType in (ql.Option.Call, ql.Option.Put):
+                    payoff = ql.PlainVanillaPayoff(optionType, strike)
+                    options.append(ql.VanillaOption(
+                        payoff, ql.EuropeanExercise(maturityDate)))
+                options.append(ql.VanillaOption(
+                    ql.PlainVanillaPayoff(ql.Option.Put, strike),
+                    ql.AmericanExercise(todaysDate, maturityDate)))
+
+        batch = ql.FdBlackScholesVanillaBatch(process, tGrid=100, xGrid=400)
+        calculated = batch.NPV(options)
+        self.assertEqual(len(calculated), len(options))
+
+        for option, npv in zip(options, calculated):
+            option.setPricingEngine(ql.FdBlackScholesVanillaEngine(process, 100, 400))
+            self.assertAlmostEqual(npv, option.NPV(), delta=0.02)
+
+        strikes = [80.0, 90.0, 100.0, 110.0, 120.0]
+        dates = [todaysDate + ql.Period(6, ql.Months), todaysDate + ql.Period(12, ql.Months)]
+        vols = ql.Matrix([[0.30, 0.29], [0.25, 0.24], [0.20, 0.20], [0.22, 0.23], [0.26, 0.27]])
+        smileProcess = ql.BlackScholesMertonProcess(
+            process.stateVariable(), process.dividendYield(), process.riskFreeRate(),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackVarianceSurface(todaysDate, ql.TARGET(), dates, strikes, vols, dc)))
+
+        calculated = ql.FdBlackScholesVanillaBatch(
+            smileProcess, tGrid=100, xGrid=400).NPV(options)
+        for option, npv in zip(options, calculated):
+            option.setPricingEngine(ql.FdBlackScholesVanillaEngine(smileProcess, 100, 400))
+            self.assertAlmostEqual(npv, option.NPV(), delta=0.02)
+
+        expired = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Call, 100.0),
+                                   ql.EuropeanExercise(todaysDate))
+        with self.assertRaises(RuntimeError):
+            batch.NPV(options + [expired])
+
+
+    def testAdaptiveNPV(self):
+        """Testing finite difference pricing to a target accuracy"""
+
+        dc = ql.Actual365Fixed()
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(ql.SimpleQuote(100.0)),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.todaysDate, 0.02, dc)),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.todaysDate, 0.05, dc)),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackConstantVol(self.todaysDate, ql.TARGET(), 0.25, dc))
+        )
+        option = ql.VanillaOption(
+            ql.PlainVanillaPayoff(ql.Option.Put, 105.0),
+            ql.EuropeanExercise(self.todaysDate + ql.Period(1, ql.Years)))
+        option.setPricingEngine(ql.AnalyticEuropeanEngine(process))
+        expected = option.NPV()
+
+        makeEngine = fdBlackScholesVanillaEngine(process)
+        fine = adaptiveNPV(option, makeEngine, 1e-4)
+        self.assertLessEqual(fine.error, 1e-4)
+        self.assertAlmostEqual(fine.NPV, expected, delta=1e-3)
+
+        coarse = adaptiveNPV(option, makeEngine, 1e-2)
+        self.assertLessEqual(coarse.error, 1e-2)
+        self.assertAlmostEqual(coarse.NPV, expected, delta=5e-2)
+        self.assertLess(coarse.tGrid * coarse.xGrid, fine.tGrid * fine.xGrid)
+
+        points = []
+
+        def countingEngine(tGrid, xGrid):
+            points.append(tGrid * xGrid)
+            return makeEngine(tGrid, xGrid)
+
+        capped = adaptiveNPV(option, countingEngine, 1e-12, maxPoints=10000)
+        self.assertLessEqual(capped.tGrid * capped.xGrid, 10000)
+        self.assertLessEqual(max(points), 10000)
+        self.assertGreater(capped.error, 1e-12)
+
+        with self.assertRaises(ValueError):
+            adaptiveNPV(option, makeEngine, 0.0)
+        with self.assertRaises(ValueError):
+            adaptiveNPV(option, makeEngine, 1e-4, maxPoints=2000)
+
+
     def testBSMRNDCalculator(self):
         """Testing Black-Scholes risk neutral density calculator"""
 
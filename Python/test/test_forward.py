@@ -0,0 +1,111 @@
+"""
+ Copyright (C) 2000, 2001, 2002, 2003 RiskMap srl
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+ QuantLib is free software: you can redistribute it and/or modify it
+ under the terms of the QuantLib license.  You should have received a
+ copy of the license along with this program; if not, please email
+ <quantlib-dev@lists.sf.net>. The license is also available online at
+ <http://quantlib.org/license.shtml>.
+
+ This program is distributed in the hope that it will be useful, but WITHOUT
+ ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+ FOR A PARTICULAR PURPOSE.  See the license for more details.
+"""
+
+
+import math
+import unittest
+
+try:
+    import QuantLib_Risks.fwd as ql
+    from xad.fwd_1st import Real
+except ImportError:
+    ql = None
+
+try:
+    import QuantLib_Risks.fwdvec as qlv
+except ImportError:
+    qlv = None
+
+
+@unittest.skipIf(ql is None, "forward mode module not built")
+class ForwardModeTest(unittest.TestCase):
+    def testDiscountTangent(self):
+        "Testing forward mode derivatives of a discount factor"
+        today = ql.Date(6, ql.November, 2001)
+        ql.Settings.instance().evaluationDate = today
+        rate = Real(0.03)
+        rate.derivative = 1.0
+        curve = ql.FlatForward(today, ql.QuoteHandle(ql.SimpleQuote(rate)), ql.Actual365Fixed())
+        df = curve.discount(2.0)
+        self.assertAlmostEqual(df.value, math.exp(-0.06), 12)
+        self.assertAlmostEqual(df.derivative, -2.0 * math.exp(-0.06), 12)
+
+    def testDerivatives(self):
+        "Testing bulk tangent access in forward mode"
+        x = Real(2.0)
+        x.derivative = 1.0
+        outputs = [x * x, 3.0 * x]
+        self.assertEqual(list(ql.derivatives(outputs)), [4.0, 3.0])
+
+
+@unittest.skipIf(qlv is None, "vector forward mode module not built")
+class VectorForwardModeTest(unittest.TestCase):
+    def testSeed(self):
+        "Testing seeding of tangent directions in vector forward mode"
+        x = qlv.seed([1.0, 2.0])
+        self.assertEqual(list(x[0].derivatives[:2]), [1.0, 0.0])
+        self.assertEqual(list(x[1].derivatives[:2]), [0.0, 1.0])
+        self.assertRaises(ValueError, qlv.seed, [1.0] * (qlv.DIRECTIONS + 1))
+
+    def testGreeksInOnePass(self):
+        "Testing delta, vega and rho from a single vector forward mode pricing"
+        if qlv.DIRECTIONS < 3:
+            self.skipTest("needs at least 3 tangent directions")
+        today = qlv.Date(15, qlv.May, 1998)
+        qlv.Settings.instance().evaluationDate = today
+        dc = qlv.Actual365Fixed()
+        spot, vol, rate = qlv.seed([36.0, 0.2, 0.06])
+        process = qlv.BlackScholesMertonProcess(
+            qlv.QuoteHandle(qlv.SimpleQuote(spot)),
+            qlv.YieldTermStructureHandle(qlv.FlatForward(today, 0.0, dc)),
+            qlv.YieldTermStructureHandle(
+                qlv.FlatForward(today, qlv.QuoteHandle(qlv.SimpleQuote(rate)), dc)
+            ),
+            qlv.BlackVolTermStructureHandle(
+                qlv.BlackConstantVol(today, qlv.TARGET(), qlv.QuoteHandle(qlv.SimpleQuote(vol)), dc)
+            ),
+        )
+        option = qlv.VanillaOption(
+            qlv.PlainVanillaPayoff(qlv.Option.Put, 40.0),
+            qlv.EuropeanExercise(qlv.Date(15, qlv.May, 1999)),
+        )
+        option.setPricingEngine(qlv.AnalyticEuropeanEngine(process))
+        expected = [option.delta().value, option.vega().value, option.rho().value]
+
+        option.setPricingEngine(qlv.FdBlackScholesVanillaEngine(process, 201, 200))
+        greeks = qlv.derivatives([option.NPV()])[0]
+        for greek, value in zip(greeks[:3], expected):
+            self.assertAlmostEqual(greek / value, 1.0, 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
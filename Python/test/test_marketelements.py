@@ -30,6 +30,7 @@
  FOR A PARTICULAR PURPOSE.  See the license for more details.
 """
 
+import pickle
 import QuantLib_Risks as ql
 import unittest
 
@@ -70,6 +71,14 @@ class MarketElementTest(unittest.TestCase):
         if not flag:
             self.fail("Observer was not notified of market element change")
 
+    def testPickle(self):
+        "Testing pickling of simple quotes"
+        copy = pickle.loads(pickle.dumps(ql.SimpleQuote(3.14)))
+        self.assertEqual(copy.value(), 3.14)
+        quote = ql.SimpleQuote(0.0)
+        quote.reset()
+        self.assertFalse(pickle.loads(pickle.dumps(quote)).isValid())
+
 
 if __name__ == "__main__":
     print("testing QuantLib", ql.__version__)
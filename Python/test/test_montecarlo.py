@@ -0,0 +1,116 @@
+"""
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import numpy as np
+import QuantLib_Risks as ql
+
+
+def values(path):
+    return [path[i].value for i in range(len(path))]
+
+
+def generator(dimension, seed=42):
+    return ql.GaussianRandomSequenceGenerator(
+        ql.UniformRandomSequenceGenerator(dimension, ql.UniformRandomGenerator(seed))
+    )
+
+
+class PathGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        self.process = ql.GeometricBrownianMotionProcess(100.0, 0.03, 0.2)
+
+    def testGenerateBatch(self):
+        "Testing bulk path generation into numpy arrays"
+        steps = 12
+        batch_gen = ql.GaussianPathGenerator(
+            self.process, 1.0, steps, generator(steps), False
+        )
+        ref_gen = ql.GaussianPathGenerator(
+            self.process, 1.0, steps, generator(steps), False
+        )
+        paths, antithetic = batch_gen.generateBatch(50, True)
+        self.assertEqual(paths.shape, (50, steps + 1))
+        self.assertEqual(antithetic.shape, (50, steps + 1))
+        for i in range(50):
+            path = ref_gen.next().value()
+            np.testing.assert_allclose(paths[i], values(path), rtol=1e-14)
+            path = ref_gen.antithetic().value()
+            np.testing.assert_allclose(antithetic[i], values(path), rtol=1e-14)
+
+    def testGenerateMultiBatch(self):
+        "Testing bulk multi-path generation into numpy arrays"
+        steps = 6
+        process = ql.StochasticProcessArray(
+            [self.process, ql.GeometricBrownianMotionProcess(50.0, 0.01, 0.3)],
+            [[1.0, 0.5], [0.5, 1.0]],
+        )
+        times = [(i + 1) / steps for i in range(steps)]
+        batch_gen = ql.GaussianMultiPathGenerator(process, times, generator(2 * steps))
+        ref_gen = ql.GaussianMultiPathGenerator(process, times, generator(2 * steps))
+        paths = batch_gen.generateBatch(20)
+        self.assertEqual(paths.shape, (20, 2, steps + 1))
+        for i in range(20):
+            multipath = ref_gen.next().value()
+            for j in range(2):
+                expected = values(multipath[j])
+                np.testing.assert_allclose(paths[i, j], expected, rtol=1e-14)
+
+
+class RandomNumbersTest(unittest.TestCase):
+    def testNumberBatch(self):
+        "Testing bulk generation of random numbers"
+        rng = ql.MersenneTwisterUniformRng(42)
+        ref = ql.MersenneTwisterUniformRng(42)
+        out = np.empty(100)
+        rng.fill(out)
+        batch = rng.nextBatch(50)
+        self.assertEqual(batch.shape, (50,))
+        expected = [ref.next().value().value for _ in range(150)]
+        np.testing.assert_array_equal(np.concatenate([out, batch]), expected)
+
+        gaussian = ql.BoxMullerMersenneTwisterGaussianRng(ql.MersenneTwisterUniformRng(42))
+        ref = ql.BoxMullerMersenneTwisterGaussianRng(ql.MersenneTwisterUniformRng(42))
+        np.testing.assert_array_equal(
+            gaussian.nextBatch(20), [ref.next().value().value for _ in range(20)]
+        )
+
+    def testSequenceBatch(self):
+        "Testing bulk generation of random sequences"
+        for make in [
+            lambda: ql.SobolRsg(5, 42),
+            lambda: ql.Burley2020SobolRsg(5),
+            lambda: ql.InvCumulativeMersenneTwisterGaussianRsg(ql.MersenneTwisterUniformRsg(5, 42)),
+        ]:
+            rsg, ref = make(), make()
+            batch = rsg.nextBatch(64)
+            self.assertEqual(batch.shape, (64, 5))
+            out = np.empty((16, 5))
+            rsg.fill(out)
+            for row in np.concatenate([batch, out]):
+                np.testing.assert_array_equal(row, [x.value for x in ref.nextSequence().value()])
+            self.assertRaises(Exception, rsg.fill, np.empty(7))
+
+
+if __name__ == "__main__":
+    print("testing QuantLib", ql.__version__)
+    unittest.main(verbosity=2)
@@ -32,9 +32,18 @@ ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
  FOR A PARTICULAR PURPOSE.  See the license for more details.
  """
 
+import array
+import functools
+import math
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 import QuantLib_Risks as ql
 from xad.adj_1st import Tape
+import numpy as np
+from QuantLib_Risks.lsmc import LongstaffSchwartz
+from QuantLib_Risks.parallel import PortfolioRisk, SwapCurve, monteCarloBlocks
+from QuantLib_Risks.replay import TapeReplay
 
 class SwapWithSensiTest(unittest.TestCase):
     def setUp(self):
@@ -150,4 +159,607 @@ class SwapWithSensiTest(unittest.TestCase):
                 if k[0] == 5 and k[1] == ql.Years:
                     self.assertGreater(v.derivative, 0.0)
                 else:
-                    self.assertAlmostEqual(v.derivative, 0.0, 3)
\ No newline at end of file
+                    self.assertAlmostEqual(v.derivative, 0.0, 3)
+
+class DoubleVectorNumpyTest(unittest.TestCase):
+    def testValues(self):
+        "Testing bulk value access of DoubleVector"
+        v = ql.DoubleVector([1.0, 2.0, 3.0])
+        self.assertEqual(list(v.values()), [1.0, 2.0, 3.0])
+        view = v.values(copy=False)
+        self.assertEqual(list(view), [1.0, 2.0, 3.0])
+        self.assertFalse(view.flags.writeable)
+        v.setValues(np.array([4.0, 5.0, 6.0]))
+        self.assertEqual(list(view), [4.0, 5.0, 6.0])
+        self.assertEqual([x.value for x in v], [4.0, 5.0, 6.0])
+        self.assertRaises(ValueError, v.setValues, np.zeros(2))
+
+    def testDerivatives(self):
+        "Testing bulk derivative access of DoubleVector"
+        with Tape() as tape:
+            v = ql.DoubleVector([1.0, 2.0, 3.0])
+            tape.registerInputs(v)
+            tape.newRecording()
+            y = v[0] * v[1] + 3.0 * v[2]
+            tape.registerOutput(y)
+            y.derivative = 1.0
+            tape.computeAdjoints()
+            np.testing.assert_allclose(v.derivatives(), [2.0, 1.0, 3.0])
+        self.assertEqual(list(ql.DoubleVector([1.0]).derivatives()), [0.0])
+
+
+class NumpyConversionTest(unittest.TestCase):
+    def testIntOverflow(self):
+        "Testing ints out of the range of a double are rejected"
+        self.assertRaises(OverflowError, ql.SimpleQuote, 10**400)
+        self.assertRaises(OverflowError, ql.TimeGrid, [0.0, 10**400])
+        self.assertEqual(ql.SimpleQuote(-1).value().value, -1.0)
+
+    def testVectorArguments(self):
+        "Testing float64 buffers as vector of Real arguments"
+        times = [0.0, 0.5, 1.0, 2.0]
+        expected = list(ql.TimeGrid(times))
+        for t in (np.array(times), array.array("d", times)):
+            self.assertEqual(list(ql.TimeGrid(t)), expected)
+
+    def testArrayArguments(self):
+        "Testing float64 buffers as Array arguments"
+        x = np.array([0.0, 1.0, 2.0])
+        y = np.array([1.0, 3.0, 2.0])
+        f = ql.LinearInterpolation(x, y)
+        self.assertAlmostEqual(f(0.5), 2.0)
+        self.assertAlmostEqual(f(1.5), 2.5)
+
+    def testNonContiguousBuffer(self):
+        "Testing non-contiguous arrays are rejected"
+        x = np.arange(8.0)[::2]
+        self.assertRaises(TypeError, ql.TimeGrid, x)
+
+
+class BatchTapeTest(unittest.TestCase):
+    def testRegisterAndGradient(self):
+        "Testing batch input registration and gradient collection"
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([1.0, 2.0, 3.0]))
+            self.assertIsInstance(x, ql.DoubleVector)
+            tape.newRecording()
+            quotes = [ql.SimpleQuote(xi) for xi in x]
+            y = quotes[0].value() * quotes[1].value() + 3.0 * quotes[2].value()
+            grad = ql.computeGradient(tape, y, x)
+            np.testing.assert_allclose(grad, [2.0, 1.0, 3.0])
+            np.testing.assert_allclose(ql.derivatives(list(x)), grad)
+
+
+class TapeReplayTest(unittest.TestCase):
+    def testReplay(self):
+        "Testing re-pricing with new quote values on the same tape"
+        today = ql.Date(6, ql.November, 2001)
+        ql.Settings.instance().evaluationDate = today
+        rate = ql.SimpleQuote(0.03)
+        curve = ql.FlatForward(today, ql.QuoteHandle(rate), ql.Actual365Fixed())
+
+        with Tape() as tape:
+            replay = TapeReplay(tape, [rate], lambda: curve.discount(2.0))
+            for r in [0.03, 0.04, 0.04, 0.05]:
+                value, grad = replay(np.array([r]))
+                self.assertAlmostEqual(value, math.exp(-2.0 * r), 12)
+                self.assertAlmostEqual(grad[0], -2.0 * math.exp(-2.0 * r), 12)
+                self.assertFalse(replay.diverged)
+            self.assertEqual(replay.recordings, 4)
+            self.assertRaises(ValueError, replay, np.array([0.03, 0.04]))
+
+
+class JacobianTest(unittest.TestCase):
+    def testJacobian(self):
+        "Testing the Jacobian of several outputs"
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([1.0, 2.0, 3.0]))
+            tape.newRecording()
+            outputs = [x[0] * x[1], x[1] + 2.0 * x[2], 5.0 * x[0]]
+            jac = ql.jacobian(tape, outputs, x)
+            np.testing.assert_allclose(
+                jac, [[2.0, 1.0, 0.0], [0.0, 1.0, 2.0], [5.0, 0.0, 0.0]]
+            )
+            np.testing.assert_allclose(ql.jacobian(tape, (y for y in outputs), list(x)), jac)
+
+
+class TapeMemoryTest(unittest.TestCase):
+    def testStats(self):
+        "Testing tape memory statistics"
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.linspace(0.01, 0.05, 100))
+            tape.newRecording()
+            quotes = [ql.SimpleQuote(xi) for xi in x]
+            total = sum(q.value() for q in quotes)
+            stats = ql.tapeStats(tape)
+            self.assertGreaterEqual(stats["statements"], len(quotes))
+            self.assertGreater(stats["memory"], 0)
+            self.assertGreaterEqual(stats["peakMemory"], stats["memory"])
+            self.assertIsNone(stats["memoryLimit"])
+            self.assertAlmostEqual(total.value, 3.0, 12)
+
+    def testLimit(self):
+        "Testing the tape memory limit"
+        with Tape() as tape:
+            ql.registerInputArray(tape, np.array([0.03]))
+            ql.setTapeMemoryLimit(tape, 1)
+            try:
+                self.assertEqual(ql.tapeStats(tape)["memoryLimit"], 1)
+                self.assertRaises(MemoryError, ql.SimpleQuote, 0.03)
+            finally:
+                ql.setTapeMemoryLimit(tape, None)
+            ql.SimpleQuote(0.03)
+
+    def testExitOverLimit(self):
+        "Testing a tape over its memory limit can be left"
+        with Tape() as tape:
+            ql.registerInputArray(tape, np.array([0.03]))
+            ql.setTapeMemoryLimit(tape, 1)
+            self.assertRaises(MemoryError, ql.SimpleQuote, 0.03)
+        self.assertFalse(ql._QuantLib_Risks._is_active_tape(tape))
+        ql.SimpleQuote(0.03)
+        ql.setTapeMemoryLimit(tape, None)
+
+    def testLimitDroppedWithTape(self):
+        "Testing the tape memory limit is dropped with its tape"
+        for _ in range(10):
+            tape = Tape()
+            self.assertIsNone(ql.tapeStats(tape)["memoryLimit"])
+            ql.setTapeMemoryLimit(tape, 1)
+            del tape
+
+
+class ImplicitBootstrapTest(unittest.TestCase):
+    rates = np.array([0.030, 0.032, 0.035, 0.037, 0.040])
+
+    def curve(self, x, implicitAdjoints):
+        today = ql.Date(6, ql.November, 2001)
+        ql.Settings.instance().evaluationDate = today
+        calendar = ql.TARGET()
+        quotes = [ql.SimpleQuote(xi) for xi in x]
+        index = ql.Euribor6M()
+        helpers = [
+            ql.DepositRateHelper(ql.QuoteHandle(quotes[0]), ql.Period(6, ql.Months), 2,
+                                 calendar, ql.ModifiedFollowing, False, ql.Actual360())
+        ] + [
+            ql.SwapRateHelper(ql.QuoteHandle(q), ql.Period(n, ql.Years), calendar,
+                              ql.Annual, ql.Unadjusted, ql.Thirty360(ql.Thirty360.BondBasis),
+                              index)
+            for q, n in zip(quotes[1:], [2, 5, 7, 10])
+        ]
+        return ql.PiecewiseLogCubicDiscount(
+            today, helpers, ql.Actual365Fixed(),
+            ql.IterativeBootstrap(accuracy=1e-12, implicitAdjoints=implicitAdjoints),
+        )
+
+    def bootstrap(self, implicitAdjoints):
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, self.rates)
+            tape.newRecording()
+            df = self.curve(x, implicitAdjoints).discount(8.0)
+            statements = ql.tapeStats(tape)["statements"]
+            return df.value, ql.computeGradient(tape, df, x), statements
+
+    def testImplicitAdjoints(self):
+        "Testing implicit function adjoints of a bootstrapped curve"
+        value, gradient, statements = self.bootstrap(False)
+        value_ift, gradient_ift, statements_ift = self.bootstrap(True)
+        self.assertAlmostEqual(value_ift, value, 10)
+        np.testing.assert_allclose(gradient_ift, gradient, rtol=1e-6, atol=1e-10)
+        self.assertLess(statements_ift, statements)
+
+    def testOtherAdjoints(self):
+        "Testing implicit adjoint bootstraps keep the other adjoints on the tape"
+        _, gradient, _ = self.bootstrap(False)
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, self.rates)
+            tape.newRecording()
+            # e.g. the adjoints accumulated by blockwiseGradient
+            x[0].derivative = 1.0
+            df = self.curve(x, True).discount(8.0)
+            df.derivative = 1.0
+            tape.computeAdjoints()
+            np.testing.assert_allclose(ql.derivatives(list(x)), gradient + [1.0, 0, 0, 0, 0],
+                                       rtol=1e-6, atol=1e-10)
+
+    def testWithoutTape(self):
+        "Testing implicit adjoint bootstraps without an active tape"
+        today = ql.Date(6, ql.November, 2001)
+        ql.Settings.instance().evaluationDate = today
+        helpers = [
+            ql.SwapRateHelper(ql.QuoteHandle(ql.SimpleQuote(rate)), ql.Period(n, ql.Years),
+                              ql.TARGET(), ql.Annual, ql.Unadjusted,
+                              ql.Thirty360(ql.Thirty360.BondBasis), ql.Euribor6M())
+            for rate, n in [(0.030, 2), (0.035, 5), (0.040, 10)]
+        ]
+        curves = [
+            ql.PiecewiseLogCubicDiscount(
+                today, helpers, ql.Actual365Fixed(),
+                ql.IterativeBootstrap(accuracy=1e-12, implicitAdjoints=implicitAdjoints),
+            )
+            for implicitAdjoints in [False, True]
+        ]
+        self.assertEqual(curves[1].dates(), curves[0].dates())
+        self.assertAlmostEqual(curves[1].discount(8.0).value,
+                               curves[0].discount(8.0).value, 12)
+
+    def testQuoteChange(self):
+        "Testing bootstrapped curves are recalculated when a quote changes"
+        today = ql.Date(6, ql.November, 2001)
+        ql.Settings.instance().evaluationDate = today
+        calendar = ql.TARGET()
+
+        def build(rate, implicitAdjoints):
+            quote = ql.SimpleQuote(rate)
+            helpers = [
+                ql.SwapRateHelper(ql.QuoteHandle(q), ql.Period(n, ql.Years), calendar,
+                                  ql.Annual, ql.Unadjusted, ql.Thirty360(ql.Thirty360.BondBasis),
+                                  ql.Euribor6M())
+                for q, n in [(ql.SimpleQuote(0.030), 2), (quote, 5), (ql.SimpleQuote(0.040), 10)]
+            ]
+            curve = ql.PiecewiseLogCubicDiscount(
+                today, helpers, ql.Actual365Fixed(),
+                ql.IterativeBootstrap(accuracy=1e-12, implicitAdjoints=implicitAdjoints),
+            )
+            return quote, curve
+
+        for implicitAdjoints in [False, True]:
+            quote, curve = build(0.035, implicitAdjoints)
+            with Tape() as tape:
+                tape.newRecording()
+                before = curve.discount(5.0).value
+                quote.setValue(0.036)
+                after = curve.discount(5.0).value
+            self.assertLess(after, before)
+            self.assertAlmostEqual(after, build(0.036, implicitAdjoints)[1].discount(5.0).value, 10)
+
+
+class CheckpointedBackwardSolverTest(unittest.TestCase):
+    def rollback(self, solverType):
+        today = ql.Date(15, ql.January, 2020)
+        ql.Settings.instance().evaluationDate = today
+        dc = ql.Actual365Fixed()
+        strike = 110.0
+        maturityDate = today + ql.Period(1, ql.Years)
+        maturity = dc.yearFraction(today, maturityDate)
+        payoff = ql.PlainVanillaPayoff(ql.Option.Put, strike)
+        exercise = ql.AmericanExercise(today, maturityDate)
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([100.0, 0.2]))
+            tape.newRecording()
+            process = ql.BlackScholesMertonProcess(
+                ql.QuoteHandle(ql.SimpleQuote(x[0])),
+                ql.YieldTermStructureHandle(ql.FlatForward(today, 0.02, dc)),
+                ql.YieldTermStructureHandle(ql.FlatForward(today, 0.06, dc)),
+                ql.BlackVolTermStructureHandle(
+                    ql.BlackConstantVol(today, ql.TARGET(), ql.QuoteHandle(ql.SimpleQuote(x[1])), dc)
+                ),
+            )
+            mesher = ql.FdmMesherComposite(
+                ql.FdmBlackScholesMesher(100, process, maturity, strike, cPoint=(strike, 0.1))
+            )
+            op = ql.FdmBlackScholesOp(mesher, process, strike)
+            innerValue = ql.FdmLogInnerValue(payoff, mesher, 0)
+            layout = mesher.layout()
+            it = layout.begin()
+            locations, rhs = [], []
+            while it.notEqual(layout.end()):
+                locations.append(mesher.location(it, 0))
+                rhs.append(innerValue.avgInnerValue(it, maturity))
+                it.increment()
+            rhs = ql.Array(rhs)
+            stepCondition = ql.FdmStepConditionComposite.vanillaComposite(
+                ql.DividendSchedule(), exercise, mesher, innerValue, today, dc
+            )
+            solver = solverType(op, ql.FdmBoundaryConditionSet(), stepCondition,
+                                ql.FdmSchemeDesc.Douglas())
+            solver.rollback(rhs, maturity, 0.0, 25, 2)
+            npv = ql.CubicNaturalSpline(locations, rhs)(math.log(100.0))
+            statements = ql.tapeStats(tape)["statements"]
+            return npv.value, ql.computeGradient(tape, npv, x), statements
+
+    def rollback2d(self, solverType):
+        today = ql.Date(15, ql.January, 2020)
+        ql.Settings.instance().evaluationDate = today
+        dc = ql.Actual365Fixed()
+        maturityDate = today + ql.Period(1, ql.Years)
+        maturity = dc.yearFraction(today, maturityDate)
+        payoff = ql.PlainVanillaPayoff(ql.Option.Put, 100.0)
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([100.0, 95.0, 0.2, 0.3]))
+            tape.newRecording()
+            processes = [
+                ql.BlackScholesMertonProcess(
+                    ql.QuoteHandle(ql.SimpleQuote(spot)),
+                    ql.YieldTermStructureHandle(ql.FlatForward(today, 0.02, dc)),
+                    ql.YieldTermStructureHandle(ql.FlatForward(today, 0.05, dc)),
+                    ql.BlackVolTermStructureHandle(
+                        ql.BlackConstantVol(today, ql.TARGET(), ql.QuoteHandle(ql.SimpleQuote(vol)), dc)
+                    ),
+                )
+                for spot, vol in [(x[0], x[2]), (x[1], x[3])]
+            ]
+            mesher = ql.FdmMesherComposite(
+                ql.FdmBlackScholesMesher(20, processes[0], maturity, 100.0),
+                ql.FdmBlackScholesMesher(20, processes[1], maturity, 100.0),
+            )
+            op = ql.Fdm2dBlackScholesOp(mesher, processes[0], processes[1], 0.5, maturity)
+            layout = mesher.layout()
+            it = layout.begin()
+            rhs = []
+            while it.notEqual(layout.end()):
+                basket = 0.5 * sum(math.exp(mesher.location(it, d).value) for d in range(2))
+                rhs.append(payoff(basket))
+                it.increment()
+            rhs = ql.Array(rhs)
+            stepCondition = ql.FdmStepConditionComposite.vanillaComposite(
+                ql.DividendSchedule(), ql.EuropeanExercise(maturityDate), mesher,
+                ql.FdmLogInnerValue(payoff, mesher, 0), today, dc
+            )
+            solver = solverType(op, ql.FdmBoundaryConditionSet(), stepCondition,
+                                ql.FdmSchemeDesc.Hundsdorfer())
+            solver.rollback(rhs, maturity, 0.0, 10, 1)
+            npv = rhs[layout.index((10, 10))]
+            return npv.value, ql.computeGradient(tape, npv, x)
+
+    def testCheckpointedRollback(self):
+        "Testing the gradient of a checkpointed finite difference rollback"
+        value, gradient, statements = self.rollback(ql.FdmBackwardSolver)
+        for interval in [0, 1, 4, 100]:
+            solverType = functools.partial(ql.FdmCheckpointedBackwardSolver,
+                                           checkpointInterval=interval)
+            value_cp, gradient_cp, statements_cp = self.rollback(solverType)
+            self.assertAlmostEqual(value_cp, value, 8)
+            np.testing.assert_allclose(gradient_cp, gradient, rtol=1e-6, atol=1e-10)
+            self.assertLess(statements_cp, statements / 5)
+
+    def testCheckpointedRollback2d(self):
+        "Testing the gradient of a checkpointed two dimensional rollback"
+        value, gradient = self.rollback2d(ql.FdmBackwardSolver)
+        value_cp, gradient_cp = self.rollback2d(ql.FdmCheckpointedBackwardSolver)
+        self.assertAlmostEqual(value_cp, value, 8)
+        np.testing.assert_allclose(gradient_cp, gradient, rtol=1e-6, atol=1e-10)
+        self.assertGreater(np.abs(gradient).min(), 0.0)
+
+
+class ThreadLocalTapeTest(unittest.TestCase):
+    def testInterleavedTapes(self):
+        "Testing independent tapes recorded by interleaved threads"
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def record(rate):
+            with Tape() as tape:
+                x = ql.registerInputArray(tape, np.array([rate]))
+                tape.newRecording()
+                q = ql.SimpleQuote(x[0])
+                # both threads hold an active tape at the same time
+                barrier.wait()
+                active = ql._QuantLib_Risks._is_active_tape(tape)
+                y = q.value() * q.value()
+                barrier.wait()
+                results[rate] = (active, ql.computeGradient(tape, y, x)[0])
+
+        threads = [threading.Thread(target=record, args=(r,)) for r in (1.5, 3.0)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for rate, (active, delta) in results.items():
+            self.assertTrue(active)
+            self.assertAlmostEqual(delta, 2.0 * rate, 12)
+        self.assertEqual(len(results), 2)
+
+
+def _portfolio_swap(years, market):
+    return ql.MakeVanillaSwap(
+        ql.Period(years, ql.Years), market.index, 0.03, ql.Period("0D"),
+        pricingEngine=market.engine,
+    )
+
+
+class PortfolioRiskTest(unittest.TestCase):
+    def testPortfolioRisk(self):
+        "Testing portfolio risk on a process pool"
+        today = ql.Date(15, ql.May, 2024)
+        curve = SwapCurve(today.serialNumber(), [1, 2, 5, 10], index=ql.Euribor3M,
+                          fixedFrequency=ql.Semiannual, fixedDayCounter=ql.Actual360)
+        trades = [functools.partial(_portfolio_swap, n) for n in (1, 3, 4, 7, 9)]
+
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([0.03, 0.032, 0.035, 0.04]))
+            tape.newRecording()
+            market = curve.build(x)
+            self.assertEqual(market.index.tenor(), ql.Period(3, ql.Months))
+            npvs = [trade(market).NPV() for trade in trades]
+            expected_npvs = np.array([npv.value for npv in npvs])
+            expected_jac = ql.jacobian(tape, npvs, x)
+
+        with PortfolioRisk(curve, trades, workers=2) as risk:
+            for _ in range(2):
+                npvs, jac = risk([0.03, 0.032, 0.035, 0.04])
+                np.testing.assert_allclose(npvs, expected_npvs, rtol=1e-10, atol=1e-10)
+                np.testing.assert_allclose(jac, expected_jac, rtol=1e-8, atol=1e-10)
+            self.assertRaises(ValueError, risk, [0.03])
+
+        # more chunks than workers, so that one worker owns two of them
+        with PortfolioRisk(curve, trades, workers=2, chunks=3) as risk:
+            npvs, jac = risk([0.03, 0.032, 0.035, 0.04])
+            np.testing.assert_allclose(npvs, expected_npvs, rtol=1e-10, atol=1e-10)
+            np.testing.assert_allclose(jac, expected_jac, rtol=1e-8, atol=1e-10)
+
+
+class BlockwiseAdjointTest(unittest.TestCase):
+    def setUp(self):
+        self.today = ql.Date(15, ql.May, 2024)
+        ql.Settings.instance().evaluationDate = self.today
+        self.maturity = ql.EuropeanExercise(ql.Date(15, ql.May, 2025))
+
+    def process(self, spot, vol, rate):
+        dc = ql.Actual365Fixed()
+        return ql.BlackScholesProcess(
+            ql.QuoteHandle(spot),
+            ql.YieldTermStructureHandle(ql.FlatForward(self.today, ql.QuoteHandle(rate), dc)),
+            ql.BlackVolTermStructureHandle(
+                ql.BlackConstantVol(self.today, ql.TARGET(), ql.QuoteHandle(vol), dc)
+            ),
+        )
+
+    def check(self, setup, blocks):
+        # the blockwise gradient is the average of the gradients of the blocks
+        # priced on their own
+        expected = []
+        for b in range(blocks):
+            with Tape() as tape:
+                x = ql.registerInputArray(tape, np.array([100.0, 0.2, 0.03]))
+                tape.newRecording()
+                priceBlock = setup(x)
+                npv = priceBlock(b)
+                expected.append((npv.value, ql.computeGradient(tape, npv, x)))
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([100.0, 0.2, 0.03]))
+            tape.newRecording()
+            priceBlock = setup(x)
+            start = ql.tapeStats(tape)["statements"]
+            value, gradient = ql.blockwiseGradient(tape, x, priceBlock, blocks)
+            self.assertEqual(ql.tapeStats(tape)["statements"], start)
+        self.assertAlmostEqual(value, np.mean([v for v, _ in expected]), 10)
+        np.testing.assert_allclose(gradient, np.mean([g for _, g in expected], axis=0),
+                                   rtol=1e-10)
+
+    def testEuropean(self):
+        "Testing blockwise adjoints of MCEuropeanEngine"
+
+        def setup(x):
+            process = self.process(*[ql.SimpleQuote(xi) for xi in x])
+            option = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Call, 100.0), self.maturity)
+
+            def priceBlock(b):
+                option.setPricingEngine(ql.MCEuropeanEngine(
+                    process, "pseudorandom", timeSteps=1, requiredSamples=2000, seed=42 + b))
+                return option.NPV()
+            return priceBlock
+
+        self.check(setup, 4)
+
+    def testBasket(self):
+        "Testing blockwise adjoints of MCEuropeanBasketEngine"
+
+        def setup(x):
+            spot, vol, rate = [ql.SimpleQuote(xi) for xi in x]
+            process = ql.StochasticProcessArray(
+                [self.process(spot, vol, rate)] * 2, [[1.0, 0.5], [0.5, 1.0]])
+            option = ql.BasketOption(
+                ql.MaxBasketPayoff(ql.PlainVanillaPayoff(ql.Option.Call, 100.0)), self.maturity)
+
+            def priceBlock(b):
+                option.setPricingEngine(ql.MCEuropeanBasketEngine(
+                    process, "pseudorandom", timeStepsPerYear=1, requiredSamples=1000,
+                    seed=42 + b))
+                return option.NPV()
+            return priceBlock
+
+        self.check(setup, 3)
+
+
+class MonteCarloBlocksTest(unittest.TestCase):
+    def testThreadCountInvariance(self):
+        "Testing Monte Carlo blocks give identical results on any number of threads"
+        today = ql.Date(15, ql.May, 2024)
+
+        def setup():
+            # with QuantLib sessions, each thread has its own Settings
+            ql.Settings.instance().evaluationDate = today
+            dc = ql.Actual365Fixed()
+            process = ql.BlackScholesProcess(
+                ql.QuoteHandle(ql.SimpleQuote(100.0)),
+                ql.YieldTermStructureHandle(ql.FlatForward(today, 0.03, dc)),
+                ql.BlackVolTermStructureHandle(ql.BlackConstantVol(today, ql.TARGET(), 0.2, dc)),
+            )
+            option = ql.VanillaOption(ql.PlainVanillaPayoff(ql.Option.Call, 100.0),
+                                      ql.EuropeanExercise(ql.Date(15, ql.May, 2025)))
+
+            def priceBlock(seed):
+                option.setPricingEngine(ql.MCEuropeanEngine(
+                    process, "pseudorandom", timeSteps=1, requiredSamples=1000, seed=seed))
+                return option.NPV().value
+            return priceBlock
+
+        value, error = monteCarloBlocks(setup, 8, threads=1, seed=42)
+        for threads in (2, 3, 8):
+            self.assertEqual(monteCarloBlocks(setup, 8, threads=threads, seed=42), (value, error))
+        self.assertNotEqual(monteCarloBlocks(setup, 8, seed=43)[0], value)
+        self.assertLess(error, 0.5)
+
+
+class LongstaffSchwartzTest(unittest.TestCase):
+    def testAmericanPut(self):
+        "Testing Longstaff-Schwartz pricing and pathwise Greeks of an American put"
+        today = ql.Date(15, ql.May, 2024)
+        ql.Settings.instance().evaluationDate = today
+        maturity = ql.Date(15, ql.May, 2025)
+        dc = ql.Actual365Fixed()
+        payoff = ql.PlainVanillaPayoff(ql.Option.Put, 100.0)
+
+        def makeProcess(x):
+            spot, vol, rate = [ql.SimpleQuote(xi) for xi in x]
+            return ql.BlackScholesProcess(
+                ql.QuoteHandle(spot),
+                ql.YieldTermStructureHandle(ql.FlatForward(today, ql.QuoteHandle(rate), dc)),
+                ql.BlackVolTermStructureHandle(
+                    ql.BlackConstantVol(today, ql.TARGET(), ql.QuoteHandle(vol), dc)
+                ),
+            )
+
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([100.0, 0.2, 0.05]))
+            tape.newRecording()
+            lsmc = LongstaffSchwartz(makeProcess(x), payoff, maturity, timeSteps=50,
+                                     samples=100000, blockSize=10000)
+            npv = lsmc.NPV()
+            coefficients = lsmc.coefficients
+            greeks = ql.computeGradient(tape, npv, x)
+
+        # the reference is priced on its own tape and objects, since the curves
+        # above cache values recorded on the first tape
+        with Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([100.0, 0.2, 0.05]))
+            tape.newRecording()
+            option = ql.VanillaOption(payoff, ql.AmericanExercise(today, maturity))
+            option.setPricingEngine(ql.FdBlackScholesVanillaEngine(makeProcess(x), 400, 400))
+            reference = option.NPV()
+            reference_greeks = ql.computeGradient(tape, reference, x)
+
+        # Bermudan exercise and Monte Carlo error
+        self.assertAlmostEqual(npv.value, reference.value, delta=0.1)
+        np.testing.assert_allclose(greeks, reference_greeks, rtol=0.05, atol=0.02)
+
+        # re-prices reuse the stored boundary
+        self.assertIs(lsmc.coefficients, coefficients)
+        self.assertEqual(lsmc.NPV().value, npv.value)
+
+
+@unittest.skipIf(not ql.RELEASES_GIL, "module built without QLR_RELEASE_GIL")
+class ThreadedValuationTest(unittest.TestCase):
+    def testThreads(self):
+        "Testing concurrent valuation and adjoints on per-thread tapes"
+
+        def price(rate):
+            today = ql.Date(6, ql.November, 2001)
+            ql.Settings.instance().evaluationDate = today
+            with Tape() as tape:
+                x = ql.registerInputArray(tape, np.array([rate]))
+                tape.newRecording()
+                curve = ql.FlatForward(today, ql.QuoteHandle(ql.SimpleQuote(x[0])), ql.Actual365Fixed())
+                bond = ql.ZeroCouponBond(0, ql.TARGET(), 100.0, ql.Date(6, ql.November, 2011))
+                bond.setPricingEngine(ql.DiscountingBondEngine(ql.YieldTermStructureHandle(curve)))
+                npv = bond.NPV()
+                return npv.value, ql.computeGradient(tape, npv, x)[0]
+
+        rates = [0.01 * (i + 1) for i in range(8)]
+        expected = [price(r) for r in rates]
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(price, rates))
+        for (value, delta), (value_ref, delta_ref) in zip(results, expected):
+            self.assertAlmostEqual(value, value_ref, 10)
+            self.assertAlmostEqual(delta, delta_ref, 8)
@@ -0,0 +1,95 @@
+"""
+ Copyright (C) 2000, 2001, 2002, 2003 RiskMap srl
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+ QuantLib is free software: you can redistribute it and/or modify it
+ under the terms of the QuantLib license.  You should have received a
+ copy of the license along with this program; if not, please email
+ <quantlib-dev@lists.sf.net>. The license is also available online at
+ <http://quantlib.org/license.shtml>.
+
+ This program is distributed in the hope that it will be useful, but WITHOUT
+ ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+ FOR A PARTICULAR PURPOSE.  See the license for more details.
+"""
+
+
+
+import unittest
+
+import numpy as np
+
+try:
+    import QuantLib_Risks.fwdadj as ql
+except ImportError:
+    ql = None
+
+
+@unittest.skipIf(ql is None, "second order module not built")
+class SecondOrderTest(unittest.TestCase):
+    def testHessianOfExpression(self):
+        "Testing the Hessian of a simple expression"
+        with ql.Tape() as tape:
+            x = ql.registerInputArray(tape, np.array([2.0, 3.0]))
+            value, gradient, hessian = ql.hessian(tape, x, lambda: x[0] * x[0] * x[1])
+        self.assertAlmostEqual(value, 12.0, 12)
+        np.testing.assert_allclose(gradient, [12.0, 4.0], rtol=1e-12)
+        np.testing.assert_allclose(hessian, [[6.0, 4.0], [4.0, 0.0]], rtol=1e-12)
+
+    def testBootstrappedCurve(self):
+        "Testing second order derivatives through a bootstrapped curve"
+        today = ql.Date(6, ql.November, 2001)
+        ql.Settings.instance().evaluationDate = today
+        rates = np.array([0.030, 0.032, 0.035])
+        quotes = [ql.SimpleQuote(r) for r in rates]
+        helpers = [
+            ql.DepositRateHelper(
+                ql.QuoteHandle(q), ql.Period(n, ql.Months), 2, ql.TARGET(),
+                ql.ModifiedFollowing, False, ql.Actual360(),
+            )
+            for q, n in zip(quotes, [3, 6, 12])
+        ]
+        curve = ql.PiecewiseLogCubicDiscount(today, helpers, ql.Actual365Fixed())
+
+        def price_at(values):
+            with ql.Tape() as tape:
+                x = ql.registerInputArray(tape, values)
+
+                def price():
+                    for q, xi in zip(quotes, x):
+                        q.reset()
+                        q.setValue(xi)
+                    return curve.discount(0.75)
+
+                return ql.hessian(tape, x, price)
+
+        value, gradient, hessian = price_at(rates)
+        np.testing.assert_allclose(hessian, hessian.T, atol=1e-10)
+
+        # the Hessian rows match finite differences of the gradient
+        h = 1e-6
+        for k in range(len(rates)):
+            up = price_at(rates + h * np.eye(len(rates))[k])[1]
+            down = price_at(rates - h * np.eye(len(rates))[k])[1]
+            np.testing.assert_allclose(hessian[k], (up - down) / (2 * h), atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
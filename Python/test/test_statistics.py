@@ -0,0 +1,88 @@
+"""
+ Copyright (C) 2024 Xcelerit Computing Limited.
+
+ This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
+ for risk computation using automatic differentiation. It uses XAD,
+ a fast and comprehensive C++ library for automatic differentiation.
+
+ QuantLib-Risks and XAD are free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published
+ by the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ QuantLib-Risks is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import unittest
+
+import numpy as np
+import QuantLib_Risks as ql
+
+
+class StatisticsBatchTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.values = rng.normal(size=1000)
+        self.weights = rng.uniform(0.5, 1.5, size=1000)
+
+    def check(self, s, ref):
+        self.assertEqual(s.samples(), ref.samples())
+        self.assertAlmostEqual(s.mean(), ref.mean(), 12)
+        self.assertAlmostEqual(s.variance(), ref.variance(), 12)
+        self.assertAlmostEqual(s.min(), ref.min(), 14)
+        self.assertAlmostEqual(s.max(), ref.max(), 14)
+
+    def testAddBatch(self):
+        "Testing batch accumulation of statistics from arrays"
+        for cls in [ql.Statistics, ql.IncrementalStatistics, ql.RiskStatistics]:
+            s, ref = cls(), cls()
+            s.addBatch(self.values, self.weights)
+            for x, w in zip(self.values, self.weights):
+                ref.add(float(x), float(w))
+            self.check(s, ref)
+            s.addBatch(self.values)
+            self.assertEqual(s.samples(), 2000)
+            self.assertRaises(Exception, s.addBatch, self.values, self.weights[:10])
+
+    def testMerge(self):
+        "Testing merging of partial statistics"
+        parts = [ql.RiskStatistics() for _ in range(4)]
+        for part, values, weights in zip(
+            parts, np.array_split(self.values, 4), np.array_split(self.weights, 4)
+        ):
+            part.addBatch(values, weights)
+        total = ql.RiskStatistics()
+        for part in parts:
+            total.merge(part)
+        ref = ql.RiskStatistics()
+        ref.addBatch(self.values, self.weights)
+        self.check(total, ref)
+        self.assertAlmostEqual(total.valueAtRisk(0.99), ref.valueAtRisk(0.99), 12)
+        self.assertAlmostEqual(total.expectedShortfall(0.99), ref.expectedShortfall(0.99), 12)
+
+    def testSequenceAddBatch(self):
+        "Testing batch accumulation of sequence statistics"
+        scenarios = self.values.reshape(250, 4)
+        s, ref = ql.SequenceStatistics(4), ql.SequenceStatistics(4)
+        s.addBatch(scenarios, self.weights[:250])
+        for row, w in zip(scenarios, self.weights[:250]):
+            ref.add([float(x) for x in row], float(w))
+        self.assertEqual(s.samples(), 250)
+        for a, b in zip(s.mean(), ref.mean()):
+            self.assertAlmostEqual(a, b, 12)
+        cov, ref_cov = s.covariance(), ref.covariance()
+        for i in range(4):
+            for j in range(4):
+                self.assertAlmostEqual(cov[i][j], ref_cov[i][j], 12)
+        self.assertRaises(Exception, s.addBatch, self.values[:7])
+
+
+if __name__ == "__main__":
+    print("testing QuantLib", ql.__version__)
+    unittest.main(verbosity=2)
@@ -127,6 +127,13 @@ class Calendar {
     %pythoncode %{
     def __hash__(self):
         return hash(self.name())
+
+    def __reduce__(self):
+        # calendars are pickled by name; holidays added or removed at run
+        # time are shared by all instances and are not part of the state
+        if self.name() not in _calendar_registry():
+            raise TypeError("cannot pickle the %s calendar" % self.name())
+        return (_calendar_from_name, (self.name(),))
     %}
     #endif
 };
@@ -349,6 +356,37 @@ namespace QuantLib {
 
 }
 
+#if defined(SWIGPYTHON)
+%pythoncode %{
+_calendars_by_name = None
+
+def _calendar_registry():
+    # maps calendar names to the constructor arguments giving them, built on
+    # first use by trying each market of the predefined calendars
+    global _calendars_by_name
+    if _calendars_by_name is None:
+        registry = {}
+        for cls in list(globals().values()):
+            if (not isinstance(cls, type) or not issubclass(cls, Calendar)
+                    or cls in (Calendar, JointCalendar, BespokeCalendar)):
+                continue
+            markets = [v for k, v in vars(cls).items()
+                       if not k.startswith("_") and type(v) is int]
+            for args in [()] + [(m,) for m in markets]:
+                try:
+                    calendar = cls(*args)
+                except Exception:
+                    continue
+                registry.setdefault(calendar.name(), (cls, args))
+        _calendars_by_name = registry
+    return _calendars_by_name
+
+def _calendar_from_name(name):
+    cls, args = _calendar_registry()[name]
+    return cls(*args)
+%}
+#endif
+
 
 #endif
 
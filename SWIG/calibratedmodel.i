@@ -59,6 +59,9 @@ using QuantLib::TermStructureConsistentModel;
 %}
 
 %shared_ptr(CalibratedModel)
+#if defined(SWIGPYTHON)
+%thread CalibratedModel::calibrate;
+#endif
 class CalibratedModel : public virtual Observable {
     #if defined(SWIGCSHARP)
     %rename("parameters") params;
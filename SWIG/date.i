@@ -368,6 +368,9 @@ class Period {
     %pythoncode %{
     def __hash__(self):
         return hash(str(self.normalized()))
+
+    def __reduce__(self):
+        return (Period, (self.length(), self.units()))
     %}
     #endif
 };
@@ -767,6 +770,9 @@ class Date {
     @staticmethod
     def from_date(date):
         return Date(date.day, date.month, date.year)
+
+    def __reduce__(self):
+        return (Date, (self.serialNumber(),))
     %}
     #endif
 
@@ -323,12 +323,60 @@ using QuantLib::FdmLinearOp;
 using QuantLib::FdmLinearOpComposite;
 %}
 
+#if defined(SWIGPYTHON)
+%{
+#include <numeric>
+
+// the values of m in compressed sparse row format
+PyObject* _to_csr(const QuantLib::SparseMatrix& m) {
+    std::vector<double> data;
+    std::vector<std::int32_t> indices, indptr(m.size1() + 1, 0);
+    data.reserve(m.nnz());
+    indices.reserve(m.nnz());
+    for (auto iter1 = m.begin1(); iter1 != m.end1(); ++iter1)
+        for (auto iter2 = iter1.begin(); iter2 != iter1.end(); ++iter2) {
+            ++indptr[iter2.index1() + 1];
+            indices.push_back(static_cast<std::int32_t>(iter2.index2()));
+            data.push_back(passive_value(*iter2));
+        }
+    std::partial_sum(indptr.begin(), indptr.end(), indptr.begin());
+    return make_csr_arrays(data, indices, indptr);
+}
+
+// Copies the float64 buffer obj into an Array, applies f and writes the
+// values of the result back into the buffer.
+template <class F>
+void _update_buffer(PyObject* obj, const F& f) {
+    Float64Buffer buffer(obj, true);
+    double* x = buffer.data();
+    const Size n = buffer.size();
+    Array r(n);
+    std::copy(x, x + n, r.begin());
+    const Array y = f(r);
+    QL_REQUIRE(y.size() == n, "operator returned " << y.size()
+               << " values for a buffer of size " << n);
+    for (Size i = 0; i < n; ++i)
+        x[i] = passive_value(y[i]);
+}
+%}
+#endif
 
 %shared_ptr(FdmLinearOp)
 class FdmLinearOp {
   public:
     virtual Array apply(const Array& r) const;
 
+    #if defined(SWIGPYTHON)
+    %extend {
+        PyObject* toCSR() const {
+            return _to_csr(self->toMatrix());
+        }
+        void apply_inplace(PyObject* r) const {
+            _update_buffer(r, [self](const Array& a) { return self->apply(a); });
+        }
+    }
+    #endif
+
   private:
     FdmLinearOp();
 };
@@ -337,7 +385,7 @@ class FdmLinearOp {
 class SparseMatrix {
   public:
     std::vector<unsigned int> row_idx, col_idx;
-    std::vector<Real> data;    
+    std::vector<Real> data;
 };
 %}
 
@@ -345,7 +393,31 @@ class SparseMatrix {
 class SparseMatrix {
   public:
     std::vector<unsigned int> row_idx, col_idx;
-    std::vector<Real> data;    
+    std::vector<Real> data;
+
+    #if defined(SWIGPYTHON)
+    %extend {
+        // rows defaults to one past the largest row index
+        PyObject* toCSR(Size rows = 0) const {
+            const Size n = self->data.size();
+            for (Size k = 0; k < n; ++k)
+                rows = std::max<Size>(rows, self->row_idx[k] + 1);
+            std::vector<std::int32_t> indptr(rows + 1, 0);
+            for (Size k = 0; k < n; ++k)
+                ++indptr[self->row_idx[k] + 1];
+            std::partial_sum(indptr.begin(), indptr.end(), indptr.begin());
+            std::vector<double> data(n);
+            std::vector<std::int32_t> indices(n);
+            std::vector<std::int32_t> next(indptr.begin(), indptr.end() - 1);
+            for (Size k = 0; k < n; ++k) {
+                const std::int32_t pos = next[self->row_idx[k]]++;
+                indices[pos] = static_cast<std::int32_t>(self->col_idx[k]);
+                data[pos] = passive_value(self->data[k]);
+            }
+            return make_csr_arrays(data, indices, indptr);
+        }
+    }
+    #endif
 };
 
 %shared_ptr(FdmLinearOpComposite)
@@ -382,7 +454,15 @@ class FdmLinearOpComposite : public FdmLinearOp {
                 }
     
             return a;
-        }        
+        }
+
+        #if defined(SWIGPYTHON)
+        void solve_splitting_inplace(Size direction, PyObject* r, Real s) const {
+            _update_buffer(r, [self, direction, s](const Array& a) {
+                return self->solve_splitting(direction, a, s);
+            });
+        }
+        #endif
     }
   private:
       FdmLinearOpComposite();
@@ -416,6 +496,7 @@ class FdmLinearOpCompositeProxy : public FdmLinearOpComposite {
     }
 
     Size size() const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyResult = PyObject_CallMethod(callback_,"size", NULL);
 
         QL_ENSURE(pyResult != NULL,
@@ -428,6 +509,7 @@ class FdmLinearOpCompositeProxy : public FdmLinearOpComposite {
     }
 
     void setTime(Time t1, Time t2) {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
       #ifdef QL_XAD
         PyObject* t1o = make_PyObject(t1);
         PyObject* t2o = make_PyObject(t2);
@@ -458,6 +540,7 @@ class FdmLinearOpCompositeProxy : public FdmLinearOpComposite {
     }
 
     Array apply_direction(Size direction, const Array& r) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyArray = SWIG_NewPointerObj(
             SWIG_as_voidptr(&r), SWIGTYPE_p_Array, 0);
             
@@ -471,6 +554,7 @@ class FdmLinearOpCompositeProxy : public FdmLinearOpComposite {
     }
 
     Array solve_splitting(Size direction, const Array& r, Real s) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyArray = SWIG_NewPointerObj(
             SWIG_as_voidptr(&r), SWIGTYPE_p_Array, 0);
             
@@ -498,6 +582,7 @@ class FdmLinearOpCompositeProxy : public FdmLinearOpComposite {
     }
 
     Array preconditioner(const Array& r, Real s) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyArray = SWIG_NewPointerObj(
             SWIG_as_voidptr(&r), SWIGTYPE_p_Array, 0);
         #ifdef QL_XAD
@@ -524,6 +609,7 @@ class FdmLinearOpCompositeProxy : public FdmLinearOpComposite {
 
   private:
     Array apply(const Array& r, const std::string& methodName) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyArray = SWIG_NewPointerObj(
             SWIG_as_voidptr(&r), SWIGTYPE_p_Array, 0);
             
@@ -964,6 +1050,16 @@ class TripleBandLinearOp : public FdmLinearOp {
     void axpyb(const Array& a, const TripleBandLinearOp& x,
                const TripleBandLinearOp& y, const Array& b);
     void swap(TripleBandLinearOp& m);
+
+    #if defined(SWIGPYTHON)
+    %extend {
+        void solve_splitting_inplace(PyObject* r, Real a, Real b = 1.0) const {
+            _update_buffer(r, [self, a, b](const Array& x) {
+                return self->solve_splitting(x, a, b);
+            });
+        }
+    }
+    #endif
 };
 
 
@@ -1005,6 +1101,238 @@ class NthOrderDerivativeOp : public FdmLinearOp {
 };
 
 
+#if defined(SWIGPYTHON)
+%{
+// A second order operator
+//   sum_i drift_i d/dx_i + diffusion_i d^2/dx_i^2
+//     + sum_{i<j} mixed_ij d^2/dx_i dx_j - rate
+// whose coefficients are given by Python, either as a mapping or as a callable
+// f(t1, t2) returning one, evaluated once per setTime call. The mapping holds
+// "drift" and "diffusion" (one coefficient per direction), and optionally
+// "rate" and "mixed" (a mapping from direction pairs (i, j) to coefficients);
+// each coefficient is a number or a float64 buffer with one value per mesh
+// point. Applying the operator and solving the splittings run in C++.
+class FdmCoefficientOp : public FdmLinearOpComposite {
+  public:
+    FdmCoefficientOp(const ext::shared_ptr<FdmMesher>& mesher, PyObject* coefficients)
+    : mesher_(mesher), coefficients_(coefficients),
+      callable_(PyCallable_Check(coefficients) != 0) {
+        for (Size i = 0; i < size(); ++i) {
+            dx_.emplace_back(QuantLib::FirstDerivativeOp(i, mesher));
+            dxx_.emplace_back(QuantLib::SecondDerivativeOp(i, mesher));
+            maps_.emplace_back(i, mesher);
+        }
+        if (!callable_)
+            update(read(coefficients_));
+        // only taken once nothing can throw, since the destructor does not
+        // run if the constructor fails
+        Py_XINCREF(coefficients_);
+    }
+
+    FdmCoefficientOp(const FdmCoefficientOp&) = delete;
+    FdmCoefficientOp& operator=(const FdmCoefficientOp&) = delete;
+
+    ~FdmCoefficientOp() override {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+        Py_XDECREF(coefficients_);
+    }
+
+    Size size() const override { return mesher_->layout()->dim().size(); }
+
+    void setTime(Time t1, Time t2) override {
+        if (!callable_)
+            return;
+        Coefficients c;
+        {
+            SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+            PyObject* result = PyObject_CallFunction(
+                coefficients_, "dd", passive_value(t1), passive_value(t2));
+            if (result == nullptr) {
+                PyErr_Print();
+                QL_FAIL("failed to evaluate the operator coefficients");
+            }
+            try {
+                c = read(result);
+            } catch (...) {
+                Py_DECREF(result);
+                throw;
+            }
+            Py_DECREF(result);
+        }
+        update(c);
+    }
+
+    Array apply(const Array& r) const override {
+        Array retVal = apply_mixed(r);
+        for (const auto& map : maps_)
+            retVal += map.apply(r);
+        return retVal;
+    }
+
+    Array apply_mixed(const Array& r) const override {
+        Array retVal(r.size(), 0.0);
+        for (const auto& op : mixed_)
+            retVal += op.apply(r);
+        return retVal;
+    }
+
+    Array apply_direction(Size direction, const Array& r) const override {
+        return maps_.at(direction).apply(r);
+    }
+
+    Array solve_splitting(Size direction, const Array& r, Real s) const override {
+        return maps_.at(direction).solve_splitting(r, s, 1.0);
+    }
+
+    Array preconditioner(const Array& r, Real dt) const override {
+        return solve_splitting(0, r, dt);
+    }
+
+    std::vector<QuantLib::SparseMatrix> toMatrixDecomp() const override {
+        std::vector<QuantLib::SparseMatrix> retVal;
+        for (const auto& map : maps_)
+            retVal.push_back(map.toMatrix());
+        for (const auto& op : mixed_)
+            retVal.push_back(op.toMatrix());
+        return retVal;
+    }
+
+  private:
+    struct Coefficients {
+        std::vector<Array> drift, diffusion;
+        Array rate;
+        std::vector<std::tuple<Size, Size, Array> > mixed;
+    };
+
+    // a number or a float64 buffer with one value per mesh point
+    Array coefficient(PyObject* obj, const std::string& name) const {
+        const Size n = mesher_->layout()->size();
+        if (Float64Buffer::check(obj)) {
+            Float64Buffer buffer(obj);
+            QL_REQUIRE(buffer.size() == n, name << " has " << buffer.size()
+                       << " values, " << n << " expected");
+            Array retVal(n);
+            std::copy(buffer.data(), buffer.data() + n, retVal.begin());
+            return retVal;
+        }
+        const double x = PyFloat_AsDouble(obj);
+        if (x == -1.0 && PyErr_Occurred()) {
+            PyErr_Clear();
+            QL_FAIL(name << " must be a number or a float64 array");
+        }
+        return Array(n, x);
+    }
+
+    std::vector<Array> perDirection(PyObject* obj, const std::string& name) const {
+        PyObject* seq = PySequence_Fast(obj, "sequence expected");
+        if (seq == nullptr) {
+            PyErr_Clear();
+            QL_FAIL(name << " must be a sequence of one coefficient per direction");
+        }
+        std::vector<Array> retVal;
+        try {
+            QL_REQUIRE(Size(PySequence_Fast_GET_SIZE(seq)) == size(),
+                       name << " has " << PySequence_Fast_GET_SIZE(seq)
+                       << " coefficients, " << size() << " expected");
+            for (Size i = 0; i < size(); ++i)
+                retVal.push_back(coefficient(PySequence_Fast_GET_ITEM(seq, i),
+                                             name + "[" + std::to_string(i) + "]"));
+        } catch (...) {
+            Py_DECREF(seq);
+            throw;
+        }
+        Py_DECREF(seq);
+        return retVal;
+    }
+
+    // an item of the mapping, or nullptr if it is missing
+    static PyObject* item(PyObject* obj, const char* key) {
+        PyObject* retVal = PyMapping_GetItemString(obj, key);
+        if (retVal == nullptr)
+            PyErr_Clear();
+        return retVal;
+    }
+
+    Coefficients read(PyObject* obj) const {
+        QL_REQUIRE(PyMapping_Check(obj), "mapping of operator coefficients expected");
+        Coefficients c;
+        const char* required[] = {"drift", "diffusion"};
+        for (Size k = 0; k < 2; ++k) {
+            PyObject* x = item(obj, required[k]);
+            QL_REQUIRE(x != nullptr, "operator coefficients have no " << required[k]);
+            try {
+                (k == 0 ? c.drift : c.diffusion) = perDirection(x, required[k]);
+            } catch (...) {
+                Py_DECREF(x);
+                throw;
+            }
+            Py_DECREF(x);
+        }
+
+        c.rate = Array(mesher_->layout()->size(), 0.0);
+        if (PyObject* rate = item(obj, "rate")) {
+            try {
+                c.rate = coefficient(rate, "rate");
+            } catch (...) {
+                Py_DECREF(rate);
+                throw;
+            }
+            Py_DECREF(rate);
+        }
+
+        if (PyObject* mixed = item(obj, "mixed")) {
+            PyObject* items = PyMapping_Items(mixed);
+            Py_DECREF(mixed);
+            QL_REQUIRE(items != nullptr, "mixed must be a mapping from direction pairs");
+            try {
+                for (Py_ssize_t k = 0; k < PyList_GET_SIZE(items); ++k) {
+                    PyObject* key = PyTuple_GET_ITEM(PyList_GET_ITEM(items, k), 0);
+                    unsigned long i, j;
+                    QL_REQUIRE(PyArg_ParseTuple(key, "kk", &i, &j),
+                               "mixed must be keyed by direction pairs (i, j)");
+                    QL_REQUIRE(i < j && j < size(),
+                               "invalid mixed direction pair (" << i << ", " << j << ")");
+                    c.mixed.emplace_back(
+                        i, j, coefficient(PyTuple_GET_ITEM(PyList_GET_ITEM(items, k), 1),
+                                          "mixed"));
+                }
+            } catch (...) {
+                PyErr_Clear();
+                Py_DECREF(items);
+                throw;
+            }
+            Py_DECREF(items);
+        }
+        return c;
+    }
+
+    void update(const Coefficients& c) {
+        // the rate is split evenly between the directions
+        const Array rate = c.rate * (-1.0 / size());
+        for (Size i = 0; i < size(); ++i)
+            maps_[i].axpyb(c.drift[i], dx_[i], dxx_[i].mult(c.diffusion[i]), rate);
+        mixed_.clear();
+        for (const auto& m : c.mixed)
+            mixed_.push_back(QuantLib::SecondOrderMixedDerivativeOp(
+                std::get<0>(m), std::get<1>(m), mesher_).mult(std::get<2>(m)));
+    }
+
+    const ext::shared_ptr<FdmMesher> mesher_;
+    PyObject* const coefficients_;
+    const bool callable_;
+    std::vector<QuantLib::TripleBandLinearOp> dx_, dxx_, maps_;
+    std::vector<QuantLib::NinePointLinearOp> mixed_;
+};
+%}
+
+%shared_ptr(FdmCoefficientOp)
+class FdmCoefficientOp : public FdmLinearOpComposite {
+  public:
+    FdmCoefficientOp(const ext::shared_ptr<FdmMesher>& mesher, PyObject* coefficients);
+};
+#endif
+
+
 // fdm schemes
 
 %{
@@ -1189,6 +1517,7 @@ class FdmStepConditionProxy : public StepCondition<Array> {
     }
 
     void applyTo(Array& a, Time t) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyArray = SWIG_NewPointerObj(
             SWIG_as_voidptr(&a), SWIGTYPE_p_Array, 0);
             
@@ -1311,6 +1640,7 @@ class FdmInnerValueCalculatorProxy : public FdmInnerValueCalculator {
     
   private: 
       Real getValue(const FdmLinearOpIterator& iter, Time t, const std::string& methodName) {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyIter = SWIG_NewPointerObj(
             SWIG_as_voidptr(&iter), SWIGTYPE_p_FdmLinearOpIterator, 0);
 
@@ -1723,6 +2053,201 @@ class FdmBackwardSolver {
 };
 
 
+%{
+// Rolls back like FdmBackwardSolver, one time step at a time. Under an active
+// tape, the roll is not recorded: the value vector is checkpointed before every
+// k-th step (k = checkpointInterval, or the square root of the number of steps
+// if 0), and a callback re-records a single step at a time in the reverse
+// sweep, recomputing the value vectors between two checkpoints from the first.
+// The tape only ever holds one step of the grid, and the checkpoints take
+// O(grid size x (steps / k + k)) memory, for one extra forward roll.
+class FdmCheckpointedBackwardSolver {
+  public:
+    FdmCheckpointedBackwardSolver(
+        const ext::shared_ptr<FdmLinearOpComposite>& map,
+        const FdmBoundaryConditionSet& bcSet,
+        const ext::shared_ptr<FdmStepConditionComposite>& condition,
+        const FdmSchemeDesc& schemeDesc,
+        Size checkpointInterval = 0)
+    : solver_(ext::make_shared<FdmBackwardSolver>(map, bcSet, condition, schemeDesc)),
+      dampingSolver_(schemeDesc.type == FdmSchemeDesc::ImplicitEulerType
+                     ? solver_
+                     : ext::make_shared<FdmBackwardSolver>(
+                           map, bcSet, condition, FdmSchemeDesc::ImplicitEuler())),
+      checkpointInterval_(checkpointInterval) {}
+
+    void rollback(Array& a, Time from, Time to, Size steps, Size dampingSteps) const {
+        const Size allSteps = steps + dampingSteps;
+        QL_REQUIRE(allSteps > 0, "at least one time step required");
+        const double t0 = xad::value(from), t1 = xad::value(to);
+        const double dt = (t0 - t1) / allSteps;
+        // step i rolls back from times[i] to times[i + 1]
+        std::vector<double> times(allSteps + 1);
+        for (Size i = 0; i < allSteps; ++i)
+            times[i] = t0 - i * dt;
+        times[allSteps] = t1;
+
+        #if defined(QLR_HAS_TAPE) && !defined(QLR_AD_MODE_FWD_ADJ)
+        if (ActiveTape* tape = ActiveTape::getActive()) {
+            const Size interval = checkpointInterval_ > 0
+                ? checkpointInterval_
+                : std::max<Size>(1, Size(std::lround(std::sqrt(double(allSteps)))));
+            rollbackCheckpointed(*tape, a, times, dampingSteps, interval);
+            return;
+        }
+        #endif
+        for (Size i = 0; i < allSteps; ++i)
+            step(i, dampingSteps).rollback(a, times[i], times[i + 1], 1, 0);
+    }
+
+  private:
+    FdmBackwardSolver& step(Size i, Size dampingSteps) const {
+        return i < dampingSteps ? *dampingSolver_ : *solver_;
+    }
+
+    #if defined(QLR_HAS_TAPE) && !defined(QLR_AD_MODE_FWD_ADJ)
+    class Callback : public xad::CheckpointCallback<ActiveTape> {
+      public:
+        ext::shared_ptr<FdmBackwardSolver> solver, dampingSolver;
+        std::vector<double> times;
+        Size dampingSteps, interval;
+        // the value vector before every interval-th step
+        std::vector<std::vector<double> > checkpoints;
+        std::vector<ActiveTape::slot_type> outputs;
+        // the recorded entries of the value vector rolled back and their slots
+        std::vector<std::pair<Size, ActiveTape::slot_type> > inputs;
+
+        FdmBackwardSolver& step(Size i) const {
+            return i < dampingSteps ? *dampingSolver : *solver;
+        }
+
+        void computeAdjoint(ActiveTape* tape) override {
+            const Size n = outputs.size(), allSteps = times.size() - 1;
+            std::vector<double> adjoints(n);
+            for (Size j = 0; j < n; ++j)
+                adjoints[j] = tape->getAndResetOutputAdjoint(outputs[j]);
+
+            for (Size c = checkpoints.size(); c-- > 0;) {
+                const Size first = c * interval;
+                const Size last = std::min(first + interval, allSteps);
+
+                // the value vectors before the steps of this interval, rolled
+                // passively from its checkpoint
+                std::vector<std::vector<double> > states(1, checkpoints[c]);
+                states.reserve(last - first);
+                Array v(checkpoints[c].begin(), checkpoints[c].end());
+                tape->deactivate();
+                try {
+                    for (Size i = first; i + 1 < last; ++i) {
+                        step(i).rollback(v, times[i], times[i + 1], 1, 0);
+                        std::vector<double> state(n);
+                        for (Size j = 0; j < n; ++j)
+                            state[j] = xad::value(v[j]);
+                        states.push_back(std::move(state));
+                    }
+                } catch (...) {
+                    tape->activate();
+                    throw;
+                }
+                tape->activate();
+
+                for (Size i = last; i-- > first;) {
+                    xad::ScopedNestedRecording<ActiveTape> nested(tape);
+                    const std::vector<double>& state = states[i - first];
+                    Array x(n);
+                    for (Size j = 0; j < n; ++j) {
+                        x[j] = state[j];
+                        tape->registerInput(x[j]);
+                    }
+                    Array y = x;
+                    step(i).rollback(y, times[i], times[i + 1], 1, 0);
+                    for (Size j = 0; j < n; ++j) {
+                        if (y[j].shouldRecord())
+                            y[j].setDerivative(adjoints[j]);
+                    }
+                    nested.computeAdjoints();
+                    for (Size j = 0; j < n; ++j)
+                        adjoints[j] = x[j].getDerivative();
+                }
+            }
+
+            for (const auto& input : inputs)
+                tape->incrementAdjoint(input.second, adjoints[input.first]);
+        }
+    };
+
+    void rollbackCheckpointed(ActiveTape& tape, Array& a,
+                              const std::vector<double>& times,
+                              Size dampingSteps, Size interval) const {
+        const Size n = a.size(), allSteps = times.size() - 1;
+        auto cb = new Callback;
+        tape.pushCallback(cb);
+        cb->solver = solver_;
+        cb->dampingSolver = dampingSolver_;
+        cb->times = times;
+        cb->dampingSteps = dampingSteps;
+        cb->interval = interval;
+        cb->checkpoints.reserve((allSteps + interval - 1) / interval);
+        for (Size j = 0; j < n; ++j) {
+            if (a[j].shouldRecord())
+                cb->inputs.emplace_back(j, a[j].getSlot());
+        }
+
+        // the forward roll runs passively, keeping the value vector before
+        // every interval-th step
+        Array v(n);
+        for (Size j = 0; j < n; ++j)
+            v[j] = xad::value(a[j]);
+        tape.deactivate();
+        try {
+            for (Size i = 0; i < allSteps; ++i) {
+                if (i % interval == 0) {
+                    std::vector<double> checkpoint(n);
+                    for (Size j = 0; j < n; ++j)
+                        checkpoint[j] = xad::value(v[j]);
+                    cb->checkpoints.push_back(std::move(checkpoint));
+                }
+                step(i, dampingSteps).rollback(v, times[i], times[i + 1], 1, 0);
+            }
+        } catch (...) {
+            tape.activate();
+            throw;
+        }
+        tape.activate();
+
+        cb->outputs.resize(n);
+        for (Size j = 0; j < n; ++j) {
+            a[j] = xad::value(v[j]);
+            tape.registerOutput(a[j]);
+            cb->outputs[j] = a[j].getSlot();
+        }
+        tape.insertCallback(cb);
+    }
+    #endif
+
+    ext::shared_ptr<FdmBackwardSolver> solver_, dampingSolver_;
+    Size checkpointInterval_;
+};
+%}
+
+%shared_ptr(FdmCheckpointedBackwardSolver)
+class FdmCheckpointedBackwardSolver {
+  public:
+    #if defined(SWIGPYTHON)
+    %feature("kwargs") FdmCheckpointedBackwardSolver;
+    #endif
+    FdmCheckpointedBackwardSolver(
+      const ext::shared_ptr<FdmLinearOpComposite>& map,
+      const FdmBoundaryConditionSet& bcSet,
+      const ext::shared_ptr<FdmStepConditionComposite>& condition,
+      const FdmSchemeDesc& schemeDesc,
+      Size checkpointInterval = 0);
+
+    void rollback(Array& a, Time from, Time to,
+                  Size steps, Size dampingSteps);
+};
+
+
 %shared_ptr(Fdm2dBlackScholesSolver)
 class Fdm2dBlackScholesSolver {
   public:
@@ -1903,6 +2428,147 @@ class FdmNdimSolver {
 %template(Fdm6dimSolver) FdmNdimSolver<6>;
 
 
+// batch pricing
+
+%{
+// the inner values of a stack of payoffs, one per coordinate of the given
+// direction of the mesher
+class FdmStackedInnerValue : public FdmInnerValueCalculator {
+  public:
+    FdmStackedInnerValue(
+        std::vector<ext::shared_ptr<FdmInnerValueCalculator> > calculators,
+        Size direction)
+    : calculators_(std::move(calculators)), direction_(direction) {}
+
+    Real innerValue(const FdmLinearOpIterator& iter, Time t) override {
+        return calculators_[iter.coordinates()[direction_]]->innerValue(iter, t);
+    }
+    Real avgInnerValue(const FdmLinearOpIterator& iter, Time t) override {
+        return calculators_[iter.coordinates()[direction_]]->avgInnerValue(iter, t);
+    }
+
+  private:
+    std::vector<ext::shared_ptr<FdmInnerValueCalculator> > calculators_;
+    Size direction_;
+};
+
+// Prices vanilla options on one Black-Scholes process on a shared mesh. The
+// options are grouped by exercise, and the payoffs of a group are stacked
+// along a second mesher direction, so that each group is rolled back once.
+// As in FdBlackScholesVanillaEngine, the operator takes the volatility at the
+// strike unless localVol is set, so options are also grouped by strike unless
+// the volatility is constant or local.
+class FdBlackScholesVanillaBatch {
+  public:
+    FdBlackScholesVanillaBatch(
+        ext::shared_ptr<GeneralizedBlackScholesProcess> process,
+        Size tGrid, Size xGrid, Size dampingSteps,
+        const FdmSchemeDesc& schemeDesc,
+        bool localVol, Real illegalLocalVolOverwrite)
+    : process_(std::move(process)), tGrid_(tGrid), xGrid_(xGrid),
+      dampingSteps_(dampingSteps), schemeDesc_(schemeDesc),
+      localVol_(localVol), illegalLocalVolOverwrite_(illegalLocalVolOverwrite) {}
+
+    std::vector<Real> NPV(
+            const std::vector<ext::shared_ptr<Instrument> >& instruments) const {
+        const bool byStrike = !localVol_ &&
+            !ext::dynamic_pointer_cast<QuantLib::BlackConstantVol>(
+                process_->blackVolatility().currentLink());
+        std::vector<ext::shared_ptr<VanillaOption> > options;
+        std::map<std::tuple<Exercise::Type, std::vector<Date>, Real>, std::vector<Size> > groups;
+        Time maxMaturity = 0.0;
+        for (Size i = 0; i < instruments.size(); ++i) {
+            auto option = ext::dynamic_pointer_cast<VanillaOption>(instruments[i]);
+            QL_REQUIRE(option, "instrument " << i << " is not a VanillaOption");
+            auto payoff = ext::dynamic_pointer_cast<StrikedTypePayoff>(option->payoff());
+            QL_REQUIRE(payoff, "instrument " << i << " has no striked payoff");
+            const ext::shared_ptr<Exercise>& exercise = option->exercise();
+            const Time maturity = process_->time(exercise->lastDate());
+            QL_REQUIRE(maturity > 0.0, "instrument " << i << " expired");
+            groups[std::make_tuple(exercise->type(), exercise->dates(),
+                                   byStrike ? payoff->strike() : Real(0.0))].push_back(i);
+            maxMaturity = std::max(maxMaturity, maturity);
+            options.push_back(option);
+        }
+        std::vector<Real> npvs(options.size());
+        if (options.empty())
+            return npvs;
+
+        // one mesh for the longest maturity, centered on the spot
+        const Real spot = process_->x0();
+        const auto equityMesher =
+            ext::make_shared<FdmBlackScholesMesher>(xGrid_, process_, maxMaturity, spot);
+        const std::vector<Real>& x = equityMesher->locations();
+        const Real logSpot = std::log(spot);
+        const Date referenceDate = process_->riskFreeRate()->referenceDate();
+        const DayCounter dayCounter = process_->riskFreeRate()->dayCounter();
+
+        for (const auto& group : groups) {
+            const std::vector<Size>& rows = group.second;
+            const ext::shared_ptr<Exercise>& exercise = options[rows.front()]->exercise();
+            const Time maturity = process_->time(exercise->lastDate());
+
+            std::vector<Real> index(rows.size());
+            for (Size j = 0; j < rows.size(); ++j)
+                index[j] = Real(j);
+            const auto mesher = ext::make_shared<FdmMesherComposite>(
+                equityMesher, ext::make_shared<Predefined1dMesher>(index));
+            std::vector<ext::shared_ptr<FdmInnerValueCalculator> > payoffs;
+            for (Size i : rows)
+                payoffs.push_back(
+                    ext::make_shared<FdmLogInnerValue>(options[i]->payoff(), mesher, 0));
+            const auto calculator = ext::make_shared<FdmStackedInnerValue>(payoffs, 1);
+
+            const ext::shared_ptr<FdmLinearOpLayout> layout = mesher->layout();
+            Array rhs(layout->size());
+            for (const auto& iter : *layout)
+                rhs[iter.index()] = calculator->avgInnerValue(iter, maturity);
+
+            const auto conditions = FdmStepConditionComposite::vanillaComposite(
+                DividendSchedule(), exercise, mesher, calculator,
+                referenceDate, dayCounter);
+            const Real strike = byStrike ? std::get<2>(group.first) : spot;
+            const auto op = ext::make_shared<FdmBlackScholesOp>(
+                mesher, process_, strike, localVol_, illegalLocalVolOverwrite_, 0);
+            FdmBackwardSolver(op, FdmBoundaryConditionSet(), conditions, schemeDesc_)
+                .rollback(rhs, maturity, 0.0, tGrid_, dampingSteps_);
+
+            for (Size j = 0; j < rows.size(); ++j) {
+                const std::vector<Real> y(rhs.begin() + j * xGrid_,
+                                          rhs.begin() + (j + 1) * xGrid_);
+                npvs[rows[j]] = QuantLib::CubicNaturalSpline(x.begin(), x.end(), y.begin())(logSpot);
+            }
+        }
+        return npvs;
+    }
+
+  private:
+    ext::shared_ptr<GeneralizedBlackScholesProcess> process_;
+    Size tGrid_, xGrid_, dampingSteps_;
+    FdmSchemeDesc schemeDesc_;
+    bool localVol_;
+    Real illegalLocalVolOverwrite_;
+};
+%}
+
+%shared_ptr(FdBlackScholesVanillaBatch)
+class FdBlackScholesVanillaBatch {
+  public:
+    #if defined(SWIGPYTHON)
+    %feature("kwargs") FdBlackScholesVanillaBatch;
+    #endif
+    FdBlackScholesVanillaBatch(
+        const ext::shared_ptr<GeneralizedBlackScholesProcess>& process,
+        Size tGrid = 100, Size xGrid = 100, Size dampingSteps = 0,
+        const FdmSchemeDesc& schemeDesc = FdmSchemeDesc::Douglas(),
+        bool localVol = false,
+        Real illegalLocalVolOverwrite = -Null<Real>());
+
+    std::vector<Real> NPV(
+        const std::vector<ext::shared_ptr<Instrument> >& options) const;
+};
+
+
 // utilities
 
 %{
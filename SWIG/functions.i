@@ -50,6 +50,7 @@ class UnaryFunction {
         Py_XDECREF(function_);
     }
     Real operator()(Real x) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
 #ifdef QL_XAD
         PyObject* xo = make_PyObject(x);
         PyObject* pyResult = PyObject_CallFunctionObjArgs(function_, xo, nullptr);
@@ -68,6 +69,7 @@ class UnaryFunction {
         return result;
     }
     Real derivative(Real x) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
 #ifdef QL_XAD
         PyObject* xo = make_PyObject(x);
         PyObject* pyResult =
@@ -114,6 +116,7 @@ class BinaryFunction {
         Py_XDECREF(function_);
     }
     Real operator()(Real x, Real y) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
 #ifdef QL_XAD
         PyObject *xo = make_PyObject(x), *yo = make_PyObject(y);
         PyObject* pyResult = PyObject_CallFunctionObjArgs(function_,xo, yo, nullptr);
@@ -157,6 +160,7 @@ class PyCostFunction : public CostFunction {
         Py_XDECREF(function_);
     }
     Real value(const Array& x) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* tuple = PyTuple_New(x.size());
 #ifdef QL_XAD
         for (Size i=0; i<x.size(); i++)
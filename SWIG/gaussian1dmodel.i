@@ -92,6 +92,10 @@ using QuantLib::MarkovFunctional;
 
 
 %shared_ptr(Gsr)
+#if defined(SWIGPYTHON)
+%thread Gsr::calibrate;
+%thread Gsr::calibrateVolatilitiesIterative;
+#endif
 class Gsr : public Gaussian1dModel {
     #if defined(SWIGCSHARP)
     %rename("parameters") params;
@@ -134,6 +138,11 @@ class Gsr : public Gaussian1dModel {
 %feature ("flatnested") ModelSettings;
 
 %shared_ptr(MarkovFunctional)
+#if defined(SWIGPYTHON)
+// the constructor calibrates the model to the smiles
+%thread MarkovFunctional::MarkovFunctional;
+%thread MarkovFunctional::calibrate;
+#endif
 class MarkovFunctional : public Gaussian1dModel {
     #if defined(SWIGCSHARP)
     %rename("parameters") params;
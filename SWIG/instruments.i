@@ -46,6 +46,10 @@ using QuantLib::Instrument;
 %}
     
 %shared_ptr(Instrument)
+#if defined(SWIGPYTHON)
+%thread Instrument::NPV;
+%thread Instrument::errorEstimate;
+#endif
 class Instrument : public LazyObject {
   public:
     Real NPV() const;
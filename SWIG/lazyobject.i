@@ -29,6 +29,9 @@ using QuantLib::LazyObject;
 %}
 
 %shared_ptr(LazyObject)
+#if defined(SWIGPYTHON)
+%thread LazyObject::recalculate;
+#endif
 class LazyObject : public Observable {
   private:
     LazyObject();
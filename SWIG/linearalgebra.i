@@ -61,6 +61,13 @@ bool ArrayFromSequence(PyObject* source, Array* target) {
             }
         }
         return true;
+#ifdef QL_XAD
+    } else if (check_Real_buffer(source)) {
+        Float64Buffer buffer(source);
+        const double* data = buffer.data();
+        *target = Array(data, data + buffer.size());
+        return true;
+#endif
     } else {
         return false;
     }
@@ -114,6 +121,10 @@ bool ArrayFromSequence(PyObject* source, Array* target) {
                 $1 = 0;
             Py_DECREF(o);
         }
+#ifdef QL_XAD
+    } else if (check_Real_buffer($input)) {
+        $1 = 1;
+#endif
     } else {
         // copied from SWIGTYPE typemap -- might need updating for newer SWIG
         void *vptr = 0;
@@ -139,6 +150,10 @@ bool ArrayFromSequence(PyObject* source, Array* target) {
                 $1 = 0;
             Py_DECREF(o);
         }
+#ifdef QL_XAD
+    } else if (check_Real_buffer($input)) {
+        $1 = 1;
+#endif
     } else {
         // copied from SWIGTYPE typemap -- might need updating for newer SWIG
         void *vptr = 0;
@@ -716,6 +731,7 @@ class MatrixMultiplicationProxy {
     }
     
     Array operator()(const Array& x) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyArray = SWIG_NewPointerObj(
             SWIG_as_voidptr(&x), SWIGTYPE_p_Array, 0);
             
@@ -55,8 +55,28 @@ class SimpleQuote : public Quote {
   public:
     SimpleQuote(Real value);
     void setValue(Real value);
+    void reset();
+    #if defined(SWIGPYTHON)
+    %pythoncode %{
+    def __reduce__(self):
+        # a snapshot of the value; derivative information is not kept
+        value = self.value() if self.isValid() else None
+        return (_simple_quote_from_value, (getattr(value, "value", value),))
+    %}
+    #endif
 };
 
+#if defined(SWIGPYTHON)
+%pythoncode %{
+def _simple_quote_from_value(value):
+    if value is None:
+        quote = SimpleQuote(0.0)
+        quote.reset()
+        return quote
+    return SimpleQuote(value)
+%}
+#endif
+
 %shared_ptr(LastFixingQuote)
 
 class LastFixingQuote : public Quote {
@@ -68,6 +68,67 @@ class Path {
 };
 %template(SamplePath) Sample<Path>;
 
+#if defined(SWIGPYTHON)
+%{
+// bulk export of generated paths into numpy arrays: a Path gives a row of
+// length() values (including the initial value), a MultiPath an
+// (assetNumber(), pathSize()) block
+double* _copy_path(const Path& path, double* out) {
+    for (Size i=0; i<path.length(); ++i)
+        *out++ = passive_value(path[i]);
+    return out;
+}
+
+double* _copy_path(const QuantLib::MultiPath& path, double* out) {
+    for (Size j=0; j<path.assetNumber(); ++j)
+        out = _copy_path(path[j], out);
+    return out;
+}
+
+std::vector<size_t> _batch_shape(Size n, const Path& path) {
+    return {n, path.length()};
+}
+
+std::vector<size_t> _batch_shape(Size n, const QuantLib::MultiPath& path) {
+    return {n, path.assetNumber(), path.pathSize()};
+}
+
+template <class PG>
+PyObject* _generate_batch(const PG& generator, Size n, bool antithetic) {
+    QL_REQUIRE(n > 0, "at least one path required");
+    // the shape is only known once a sample is generated
+    const typename PG::sample_type* sample = &generator.next();
+    std::vector<size_t> shape = _batch_shape(n, sample->value);
+    PyObject* values = make_float64_array(shape);
+    PyObject* antithetics = antithetic ? make_float64_array(shape) : nullptr;
+    try {
+        Float64Buffer out(values, true);
+        double* o = out.data();
+        double* a = nullptr;
+        std::unique_ptr<Float64Buffer> outAntithetic;
+        if (antithetic) {
+            outAntithetic.reset(new Float64Buffer(antithetics, true));
+            a = outAntithetic->data();
+        }
+        for (Size i=0; i<n; ++i) {
+            if (i > 0)
+                sample = &generator.next();
+            o = _copy_path(sample->value, o);
+            if (antithetic)
+                a = _copy_path(generator.antithetic().value, a);
+        }
+    } catch (...) {
+        Py_DECREF(values);
+        Py_XDECREF(antithetics);
+        throw;
+    }
+    if (!antithetic)
+        return values;
+    return Py_BuildValue("(NN)", values, antithetics);
+}
+%}
+#endif
+
 %{
 using QuantLib::PathGenerator;
 %}
@@ -93,6 +154,15 @@ class PathGenerator {
     const sample_type& antithetic() const;
     Size size() const;
     const TimeGrid& timeGrid() const;
+    #if defined(SWIGPYTHON)
+    %extend {
+        // values of the next n paths as an (n, timeGrid().size()) float64
+        // array; with antithetic=True, also returns the antithetic paths
+        PyObject* generateBatch(Size n, bool antithetic = false) {
+            return _generate_batch(*self, n, antithetic);
+        }
+    }
+    #endif
 };
 
 %template(GaussianPathGenerator)
@@ -164,6 +234,15 @@ class MultiPathGenerator {
     }
     const sample_type& next() const;
     const sample_type& antithetic() const;
+    #if defined(SWIGPYTHON)
+    %extend {
+        // values of the next n multi-paths as an (n, assets, timeGrid().size())
+        // float64 array; with antithetic=True, also returns the antithetic paths
+        PyObject* generateBatch(Size n, bool antithetic = false) {
+            return _generate_batch(*self, n, antithetic);
+        }
+    }
+    #endif
 };
 
 %template(GaussianMultiPathGenerator)
@@ -69,6 +69,7 @@ class PyObserver : public Observer {
         Py_XDECREF(callback_);
     }
     void update() {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyResult = PyObject_CallFunction(callback_,NULL);
         QL_ENSURE(pyResult != NULL, "failed to notify Python observer");
         Py_XDECREF(pyResult);
@@ -84,6 +84,7 @@ class OdeFct {
     }
     
     const std::vector<Real> operator()(Real x, const std::vector<Real>& y) const {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
         PyObject* pyY = PyList_New(y.size());
 #ifdef QL_XAD
         for (Size i=0; i < y.size(); ++i)
@@ -50,6 +50,7 @@ struct _IterativeBootstrap {
     Real maxFactor, minFactor;
     bool dontThrow;
     Size dontThrowSteps, maxEvaluations;
+    bool implicitAdjoints;
     _IterativeBootstrap(Real accuracy = Null<Real>(),
                         Real minValue = Null<Real>(),
                         Real maxValue = Null<Real>(),
@@ -58,13 +59,50 @@ struct _IterativeBootstrap {
                         Real minFactor = 2.0,
                         bool dontThrow = false,
                         Size dontThrowSteps = 10,
-                        Size maxEvaluations = 100)
+                        Size maxEvaluations = 100,
+                        bool implicitAdjoints = false)
     : accuracy(accuracy), minValue(minValue), maxValue(maxValue),
       maxAttempts(maxAttempts), maxFactor(maxFactor), minFactor(minFactor),
       dontThrow(dontThrow), dontThrowSteps(dontThrowSteps),
-      maxEvaluations(maxEvaluations) {}
+      maxEvaluations(maxEvaluations), implicitAdjoints(implicitAdjoints) {}
 };
 
+// inverts the row-major n x n matrix a by Gauss-Jordan elimination
+inline std::vector<double> _invert_matrix(std::vector<double> a, Size n) {
+    std::vector<double> inv(n * n, 0.0);
+    for (Size i = 0; i < n; ++i)
+        inv[i * n + i] = 1.0;
+    for (Size c = 0; c < n; ++c) {
+        Size p = c;
+        for (Size r = c + 1; r < n; ++r)
+            if (std::fabs(a[r * n + c]) > std::fabs(a[p * n + c]))
+                p = r;
+        QL_REQUIRE(a[p * n + c] != 0.0,
+                   "singular bootstrap Jacobian: helpers do not depend on the curve nodes");
+        if (p != c) {
+            for (Size k = 0; k < n; ++k) {
+                std::swap(a[p * n + k], a[c * n + k]);
+                std::swap(inv[p * n + k], inv[c * n + k]);
+            }
+        }
+        double d = a[c * n + c];
+        for (Size k = 0; k < n; ++k) {
+            a[c * n + k] /= d;
+            inv[c * n + k] /= d;
+        }
+        for (Size r = 0; r < n; ++r) {
+            double f = a[r * n + c];
+            if (r == c || f == 0.0)
+                continue;
+            for (Size k = 0; k < n; ++k) {
+                a[r * n + k] -= f * a[c * n + k];
+                inv[r * n + k] -= f * inv[c * n + k];
+            }
+        }
+    }
+    return inv;
+}
+
 template <class PiecewiseYieldCurve>
 inline typename PiecewiseYieldCurve::bootstrap_type make_bootstrap(const _IterativeBootstrap& b) {
     return {
@@ -74,6 +112,195 @@ inline typename PiecewiseYieldCurve::bootstrap_type make_bootstrap(const _Iterat
         b.maxEvaluations
     };
 }
+
+/* Piecewise curve built with IterativeBootstrap(implicitAdjoints=True); the
+   other curves are QuantLib's own. QuantLib's bootstrap can only run on a
+   PiecewiseYieldCurve, so it runs on a twin curve with the same helpers and
+   the converged nodes are copied over. The twin is kept between
+   calculations, so the previous nodes are the initial guess as with the
+   stock bootstrap, and is only rebuilt when the reference date of the curve
+   moves.
+
+   With an active tape, the twin is bootstrapped without recording. Only one
+   evaluation of the helpers' residuals r(y, x) at the converged nodes y is
+   recorded, and the nodes are attached to the tape as
+   y - (dr/dy)^-1 r(y, x), which has the implicit function theorem derivatives
+   dy/dx = -(dr/dy)^-1 dr/dx with respect to the quotes and any other inputs
+   of the helpers. The solver iterations do not go on the tape. */
+template <class Curve>
+class _ImplicitPiecewiseYieldCurve : public Curve {
+    typedef typename Curve::traits_type Traits;
+    typedef typename Curve::interpolator_type Interpolator;
+    typedef std::vector<ext::shared_ptr<typename Traits::helper> > helper_list;
+  public:
+    _ImplicitPiecewiseYieldCurve(const Date& referenceDate,
+                                 const helper_list& instruments,
+                                 const DayCounter& dayCounter,
+                                 const std::vector<Handle<Quote> >& jumps,
+                                 const std::vector<Date>& jumpDates,
+                                 const Interpolator& i,
+                                 const typename Curve::bootstrap_type& bootstrap)
+    : Curve(referenceDate, instruments, dayCounter, jumps, jumpDates, i, bootstrap),
+      instruments_(instruments), jumps_(jumps), jumpDates_(jumpDates),
+      bootstrap_(bootstrap) {}
+    _ImplicitPiecewiseYieldCurve(Natural settlementDays,
+                                 const Calendar& calendar,
+                                 const helper_list& instruments,
+                                 const DayCounter& dayCounter,
+                                 const std::vector<Handle<Quote> >& jumps,
+                                 const std::vector<Date>& jumpDates,
+                                 const Interpolator& i,
+                                 const typename Curve::bootstrap_type& bootstrap)
+    : Curve(settlementDays, calendar, instruments, dayCounter, jumps, jumpDates, i, bootstrap),
+      instruments_(instruments), jumps_(jumps), jumpDates_(jumpDates),
+      bootstrap_(bootstrap) {}
+
+  private:
+    void performCalculations() const override {
+        #if defined(QLR_HAS_TAPE) && !defined(QLR_AD_MODE_FWD_ADJ)
+        ActiveTape* tape = ActiveTape::getActive();
+        #endif
+
+        // the twin's bootstrap points the helpers to the twin
+        struct Relink {
+            const _ImplicitPiecewiseYieldCurve* ts;
+            void operator()() const {
+                for (const auto& h : ts->instruments_)
+                    h->setTermStructure(const_cast<_ImplicitPiecewiseYieldCurve*>(ts));
+            }
+            ~Relink() { (*this)(); }
+        } relink{this};
+
+        if (!twin_ || twin_->referenceDate() != this->referenceDate())
+            twin_ = ext::make_shared<Curve>(
+                this->referenceDate(), instruments_, this->dayCounter(),
+                jumps_, jumpDates_, this->interpolator_, bootstrap_);
+        // the twin observes the same quotes, but the curve can also be
+        // recalculated explicitly
+        #if defined(QLR_HAS_TAPE) && !defined(QLR_AD_MODE_FWD_ADJ)
+        if (tape != nullptr) {
+            tape->deactivate();
+            try {
+                twin_->recalculate();
+            } catch (...) {
+                tape->activate();
+                throw;
+            }
+            tape->activate();
+        } else
+        #endif
+        twin_->recalculate();
+        this->dates_ = twin_->dates();
+        this->times_ = twin_->times();
+        this->data_ = twin_->data();
+        this->interpolation_ = this->interpolator_.interpolate(
+            this->times_.begin(), this->times_.end(), this->data_.begin());
+        relink();
+
+        #if defined(QLR_HAS_TAPE) && !defined(QLR_AD_MODE_FWD_ADJ)
+        if (tape != nullptr) {
+            attachImplicit(*tape);
+            return;
+        }
+        #endif
+        this->interpolation_.update();
+    }
+
+    #if defined(QLR_HAS_TAPE) && !defined(QLR_AD_MODE_FWD_ADJ)
+    void attachImplicit(ActiveTape& tape) const {
+        std::vector<Real>& data = this->data_;
+        const std::vector<Date>& dates = this->dates_;
+        const Size n = data.size() - 1;
+
+        // the helper of each node, matched by pillar date
+        helper_list helpers(n);
+        for (const auto& h : instruments_) {
+            auto it = std::find(dates.begin() + 1, dates.end(), h->pillarDate());
+            if (it != dates.end())
+                helpers[it - dates.begin() - 1] = h;
+        }
+        std::vector<double> nodes(n);
+        for (Size i = 0; i < n; ++i) {
+            QL_REQUIRE(helpers[i], "no helper found for pillar " << dates[i + 1]);
+            nodes[i] = xad::value(data[i + 1]);
+        }
+
+        // residuals at the converged nodes, which are fresh inputs
+        std::vector<Real> y(nodes.begin(), nodes.end());
+        for (auto& yi : y)
+            tape.registerInput(yi);
+        auto start = tape.getPosition();
+        for (Size i = 0; i < n; ++i)
+            Traits::updateGuess(data, y[i], i + 1);
+        this->interpolation_.update();
+        std::vector<Real> r(n);
+        for (Size i = 0; i < n; ++i) {
+            r[i] = helpers[i]->quoteError();
+            tape.registerOutput(r[i]);
+        }
+
+        // dr/dy, one adjoint sweep over the residual recording per helper.
+        // The tape may hold other adjoints, e.g. those of the blocks
+        // accumulated by blockwiseGradient, so only the derivatives of the
+        // residual recording and of y are cleared between sweeps.
+        auto clear = [&]() {
+            tape.clearDerivativesAfter(start);
+            for (auto& yj : y)
+                yj.setDerivative(0.0);
+        };
+        std::vector<double> jac(n * n, 0.0);
+        bool swept = false;
+        for (Size i = 0; i < n; ++i) {
+            if (!r[i].shouldRecord())
+                continue;
+            clear();
+            r[i].setDerivative(1.0);
+            tape.computeAdjointsTo(start);
+            for (Size j = 0; j < n; ++j)
+                jac[i * n + j] = y[j].getDerivative();
+            swept = true;
+        }
+        if (swept) {
+            // the sweeps also reached the variables recorded before the
+            // residuals, e.g. the quotes; one sweep with the opposite seeds
+            // takes their contributions back out
+            clear();
+            for (Size i = 0; i < n; ++i) {
+                if (r[i].shouldRecord())
+                    r[i].setDerivative(-1.0);
+            }
+            tape.computeAdjointsTo(start);
+            clear();
+        }
+        std::vector<double> inv = _invert_matrix(jac, n);
+
+        for (Size j = 0; j < n; ++j) {
+            Real z = nodes[j];
+            for (Size i = 0; i < n; ++i) {
+                if (inv[j * n + i] != 0.0)
+                    z -= inv[j * n + i] * r[i];
+            }
+            Traits::updateGuess(data, z, j + 1);
+        }
+        this->interpolation_.update();
+    }
+    #endif
+
+    helper_list instruments_;
+    std::vector<Handle<Quote> > jumps_;
+    std::vector<Date> jumpDates_;
+    typename Curve::bootstrap_type bootstrap_;
+    mutable ext::shared_ptr<Curve> twin_;
+};
+
+// builds QuantLib's curve, or the implicit adjoints one if requested
+template <class Curve, class... Args>
+inline Curve* make_piecewise_curve(const _IterativeBootstrap& b, Args&&... args) {
+    if (b.implicitAdjoints)
+        return new _ImplicitPiecewiseYieldCurve<Curve>(std::forward<Args>(args)...,
+                                                       make_bootstrap<Curve>(b));
+    return new Curve(std::forward<Args>(args)..., make_bootstrap<Curve>(b));
+}
 %}
 
 %rename(IterativeBootstrap) _IterativeBootstrap;
@@ -89,7 +316,8 @@ struct _IterativeBootstrap {
                         Real minFactor = 2.0,
                         bool dontThrow = false,
                         Size dontThrowSteps = 10,
-                        Size maxEvaluations = 100);
+                        Size maxEvaluations = 100,
+                        bool implicitAdjoints = false);
 };
 
 /* We have to resort to a macro, because the R implementation of shared_ptr
@@ -112,8 +340,8 @@ class Name : public YieldTermStructure {
              const std::vector<Date>& jumpDates = std::vector<Date>(),
              const Interpolator& i = Interpolator(),
              const _IterativeBootstrap& b = _IterativeBootstrap()) {
-            return new Name(referenceDate, instruments, dayCounter, jumps, jumpDates,
-                            i, make_bootstrap<Name>(b));
+            return make_piecewise_curve<Name>(b, referenceDate, instruments, dayCounter,
+                                              jumps, jumpDates, i);
         }
         Name(Integer settlementDays, const Calendar& calendar,
              const std::vector<ext::shared_ptr<RateHelper> >& instruments,
@@ -122,24 +350,27 @@ class Name : public YieldTermStructure {
              const std::vector<Date>& jumpDates = std::vector<Date>(),
              const Interpolator& i = Interpolator(),
              const _IterativeBootstrap& b = _IterativeBootstrap()) {
-            return new Name(settlementDays, calendar, instruments, dayCounter,
-                            jumps, jumpDates, i, make_bootstrap<Name>(b));
+            return make_piecewise_curve<Name>(b, Natural(settlementDays), calendar,
+                                              instruments, dayCounter, jumps, jumpDates, i);
         }
         Name(const Date& referenceDate,
              const std::vector<ext::shared_ptr<RateHelper> >& instruments,
              const DayCounter& dayCounter,
              const _IterativeBootstrap& b,
              const Interpolator& i = Interpolator()) {
-            return new Name(referenceDate, instruments, dayCounter, i,
-                            make_bootstrap<Name>(b));
+            return make_piecewise_curve<Name>(b, referenceDate, instruments, dayCounter,
+                                              std::vector<Handle<Quote> >(),
+                                              std::vector<Date>(), i);
         }
         Name(Integer settlementDays, const Calendar& calendar,
              const std::vector<ext::shared_ptr<RateHelper> >& instruments,
              const DayCounter& dayCounter,
              const _IterativeBootstrap& b,
              const Interpolator& i = Interpolator()) {
-            return new Name(settlementDays, calendar, instruments, dayCounter,
-                            i, make_bootstrap<Name>(b));
+            return make_piecewise_curve<Name>(b, Natural(settlementDays), calendar,
+                                              instruments, dayCounter,
+                                              std::vector<Handle<Quote> >(),
+                                              std::vector<Date>(), i);
         }
     }
     const std::vector<Date>& dates() const;
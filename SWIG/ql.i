@@ -108,7 +108,7 @@ GNU autoconf configure script.
 QL_DEPRECATED_DISABLE_WARNING
 %}
 
-#ifdef QL_XAD
+#if defined(QL_XAD) && !defined(QLR_AD_MODE_FWD) && !defined(QLR_AD_MODE_FWD_VECTOR)
 %include tape.i
 #endif
 %include common.i
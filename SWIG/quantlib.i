@@ -22,17 +22,47 @@
 %module(directors="1") NQuantLibc
 #elif defined(SWIGJAVA)
 %module(directors="1") QuantLib_Risks
+#elif defined(SWIGPYTHON) && defined(QLR_RELEASE_GIL)
+%module(threads="1") QuantLib_Risks
 #else
 %module QuantLib_Risks
 #endif
 
+#if defined(SWIGPYTHON) && defined(QLR_RELEASE_GIL)
+// The GIL is kept by default and only released around the heavy entry points,
+// which are marked with %thread in the respective interface files. QuantLib
+// must be built with QL_ENABLE_SESSIONS for per-thread evaluation settings.
+%nothread;
+%{
+#include <thread>
+#if defined(QL_ENABLE_SESSIONS)
+namespace QuantLib {
+    // one session, i.e. one set of Settings, per OS thread
+    ThreadKey sessionId() { return std::this_thread::get_id(); }
+}
+#endif
+%}
+#endif
+
 %include exception.i
 
 %exception {
     try {
+        #if defined(QL_XAD)
+        check_tape_memory();
+        #endif
         $action
+        #if defined(QL_XAD)
+        sample_tape_memory();
+        #endif
     } catch (std::out_of_range& e) {
         SWIG_exception(SWIG_IndexError,const_cast<char*>(e.what()));
+    #if defined(QL_XAD)
+    } catch (TapeMemoryError& e) {
+        SWIG_exception(SWIG_MemoryError,const_cast<char*>(e.what()));
+    #endif
+    } catch (std::bad_alloc&) {
+        SWIG_exception(SWIG_MemoryError,"out of memory");
     } catch (std::exception& e) {
         SWIG_exception(SWIG_RuntimeError,const_cast<char*>(e.what()));
     } catch (...) {
@@ -72,6 +72,90 @@ class Sample {
     }
 };
 
+#if defined(SWIGPYTHON)
+%{
+// bulk generation into float64 buffers: a number generator writes one number
+// per element, a sequence generator one sequence per row of dimension()
+// elements
+template <class RNG>
+void _fill_numbers(const RNG& rng, PyObject* out) {
+    Float64Buffer buffer(out, true);
+    double* o = buffer.data();
+    for (Size i=0; i<buffer.size(); ++i)
+        o[i] = passive_value(rng.next().value);
+}
+
+template <class RSG>
+void _fill_sequences(const RSG& rsg, PyObject* out) {
+    Float64Buffer buffer(out, true);
+    Size d = rsg.dimension();
+    QL_REQUIRE(buffer.size() % d == 0,
+               "buffer size (" << buffer.size()
+               << ") is not a multiple of the dimension (" << d << ")");
+    double* o = buffer.data();
+    for (Size i=0; i<buffer.size()/d; ++i) {
+        const std::vector<Real>& x = rsg.nextSequence().value;
+        for (Size j=0; j<d; ++j)
+            *o++ = passive_value(x[j]);
+    }
+}
+
+template <class RNG>
+PyObject* _next_numbers(const RNG& rng, Size n) {
+    PyObject* out = make_float64_array({n});
+    try {
+        _fill_numbers(rng, out);
+    } catch (...) {
+        Py_DECREF(out);
+        throw;
+    }
+    return out;
+}
+
+template <class RSG>
+PyObject* _next_sequences(const RSG& rsg, Size n) {
+    PyObject* out = make_float64_array({n, rsg.dimension()});
+    try {
+        _fill_sequences(rsg, out);
+    } catch (...) {
+        Py_DECREF(out);
+        throw;
+    }
+    return out;
+}
+%}
+
+%define QL_NUMBER_BATCH
+%extend {
+    // fills a writable float64 buffer (e.g. a numpy array) with the next numbers
+    void fill(PyObject* out) {
+        _fill_numbers(*self, out);
+    }
+    // the next n numbers as a float64 numpy array
+    PyObject* nextBatch(Size n) {
+        return _next_numbers(*self, n);
+    }
+}
+%enddef
+
+%define QL_SEQUENCE_BATCH
+%extend {
+    // fills a writable float64 buffer (e.g. an (n, dimension()) numpy array)
+    // with the next sequences
+    void fill(PyObject* out) {
+        _fill_sequences(*self, out);
+    }
+    // the next n sequences as an (n, dimension()) float64 numpy array
+    PyObject* nextBatch(Size n) {
+        return _next_sequences(*self, n);
+    }
+}
+%enddef
+#else
+%define QL_NUMBER_BATCH %enddef
+%define QL_SEQUENCE_BATCH %enddef
+#endif
+
 %template(SampleNumber) Sample<Real>;
 %template(SampleArray) Sample<Array>;
 %template(SampleRealVector) Sample<std::vector<Real> >; 
@@ -86,30 +170,35 @@ class LecuyerUniformRng {
   public:
     LecuyerUniformRng(BigInteger seed=0);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 class KnuthUniformRng {
   public:
     KnuthUniformRng(BigInteger seed=0);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 class MersenneTwisterUniformRng {
   public:
     MersenneTwisterUniformRng(BigInteger seed = 0);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 class Xoshiro256StarStarUniformRng {
   public:
     Xoshiro256StarStarUniformRng(BigInteger seed = 0);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 class UniformRandomGenerator {
   public:
     UniformRandomGenerator(BigInteger seed=0);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 
 	%extend {
 		// improve performance for direct access. faster version
@@ -126,6 +215,7 @@ template<class RNG> class CLGaussianRng {
   public:
     CLGaussianRng(const RNG& rng);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 %template(CentralLimitLecuyerGaussianRng) CLGaussianRng<LecuyerUniformRng>;
@@ -137,6 +227,7 @@ template<class RNG> class BoxMullerGaussianRng {
   public:
     BoxMullerGaussianRng(const RNG& rng);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 %template(BoxMullerLecuyerGaussianRng) BoxMullerGaussianRng<LecuyerUniformRng>;
@@ -148,6 +239,7 @@ template<class RNG, class F> class InverseCumulativeRng {
   public:
     InverseCumulativeRng(const RNG& rng);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 };
 
 %template(MoroInvCumulativeLecuyerGaussianRng)
@@ -172,6 +264,7 @@ class GaussianRandomGenerator {
   public:
     GaussianRandomGenerator(const UniformRandomGenerator& rng);
     Sample<Real> next() const;
+    QL_NUMBER_BATCH
 
 	%extend {
 		// improve performance for direct access, faster version
@@ -191,6 +284,7 @@ class HaltonRsg {
     const Sample<std::vector<Real> >& nextSequence() const;
     const Sample<std::vector<Real> >& lastSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 class SobolRsg {
@@ -204,6 +298,7 @@ class SobolRsg {
     const Sample<std::vector<Real> >& nextSequence() const;
     const Sample<std::vector<Real> >& lastSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
     void skipTo(Size n);
     %extend{
       std::vector<unsigned int> nextInt32Sequence(){
@@ -221,6 +316,7 @@ class Burley2020SobolRsg {
     const Sample<std::vector<Real> >& nextSequence() const;
     const Sample<std::vector<Real> >& lastSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
     %extend{
       std::vector<unsigned int> nextInt32Sequence(){
           return to_vector<unsigned int>($self->nextInt32Sequence());
@@ -235,6 +331,7 @@ class SobolBrownianBridgeRsg {
     const Sample<std::vector<Real> >&  nextSequence() const;
     const Sample<std::vector<Real> >&  lastSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 class Burley2020SobolBrownianBridgeRsg {
@@ -243,6 +340,7 @@ class Burley2020SobolBrownianBridgeRsg {
     const Sample<std::vector<Real> >&  nextSequence() const;
     const Sample<std::vector<Real> >&  lastSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 
@@ -254,6 +352,7 @@ template<class RNG> class RandomSequenceGenerator {
                             BigNatural seed = 0);
     const Sample<std::vector<Real> >& nextSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 %template(LecuyerUniformRsg)
@@ -271,6 +370,7 @@ class UniformRandomSequenceGenerator {
                                    const UniformRandomGenerator& rng);
     const Sample<std::vector<Real> >& nextSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 class UniformLowDiscrepancySequenceGenerator {
@@ -281,6 +381,7 @@ class UniformLowDiscrepancySequenceGenerator {
         SobolRsg::DirectionIntegers directionIntegers = QuantLib::SobolRsg::Jaeckel);
     const Sample<std::vector<Real> >& nextSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 /************* Gaussian sequence generators *************/
@@ -293,6 +394,7 @@ class InverseCumulativeRsg {
                              const I& inverseCumulative);
     const Sample<std::vector<Real> >& nextSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 
@@ -340,6 +442,7 @@ class GaussianRandomSequenceGenerator {
         const UniformRandomSequenceGenerator& uniformSequenceGenerator);
     const Sample<std::vector<Real> >& nextSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 class GaussianLowDiscrepancySequenceGenerator {
@@ -348,6 +451,7 @@ class GaussianLowDiscrepancySequenceGenerator {
         const UniformLowDiscrepancySequenceGenerator& u);
     const Sample<std::vector<Real> >& nextSequence() const;
     Size dimension() const;
+    QL_SEQUENCE_BATCH
 };
 
 
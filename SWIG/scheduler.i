@@ -122,6 +122,26 @@ class Schedule {
         }
         #endif
     }
+    #if defined(SWIGPYTHON)
+    %pythoncode %{
+    def datesToBytes(self):
+        """Returns the schedule dates as little-endian 32-bit serial numbers."""
+        return datesToBytes(self.dates())
+
+    def __reduce__(self):
+        def optional(has, value):
+            return value() if has() else None
+        isRegular = list(self.isRegular()) if self.hasIsRegular() else []
+        return (_schedule_from_state, (
+            self.datesToBytes(), self.calendar(), self.businessDayConvention(),
+            optional(self.hasTerminationDateBusinessDayConvention,
+                     self.terminationDateBusinessDayConvention),
+            optional(self.hasTenor, self.tenor),
+            optional(self.hasRule, self.rule),
+            optional(self.hasEndOfMonth, self.endOfMonth),
+            isRegular))
+    %}
+    #endif
 };
 
 #if defined(SWIGPYTHON)
@@ -160,6 +180,31 @@ class MakeSchedule {
 };
 
 #if defined(SWIGPYTHON)
+%pythoncode %{
+import array as _array
+import sys as _sys
+
+def datesToBytes(dates):
+    """Packs a sequence of dates into little-endian 32-bit serial numbers."""
+    serials = _array.array("i", [d.serialNumber() for d in dates])
+    if _sys.byteorder == "big":
+        serials.byteswap()
+    return serials.tobytes()
+
+def datesFromBytes(data):
+    """Unpacks the dates packed by datesToBytes."""
+    serials = _array.array("i")
+    serials.frombytes(data)
+    if _sys.byteorder == "big":
+        serials.byteswap()
+    return [Date(n) for n in serials]
+
+def _schedule_from_state(dates, calendar, convention, terminationDateConvention,
+                         tenor, rule, endOfMonth, isRegular):
+    return Schedule(datesFromBytes(dates), calendar, convention,
+                    terminationDateConvention, tenor, rule, endOfMonth, isRegular)
+%}
+
 %pythoncode{
 def MakeSchedule(effectiveDate=None,terminationDate=None,tenor=None,
     frequency=None,calendar=None,convention=None,terminalDateConvention=None,
@@ -31,6 +31,53 @@ using QuantLib::RiskStatistics;
 using QuantLib::GenericSequenceStatistics;
 %}
 
+#if defined(SWIGPYTHON)
+%{
+// adds the samples of a float64 buffer, with unit weights if weights is None
+template <class S>
+void _add_batch(S& s, PyObject* values, PyObject* weights) {
+    Float64Buffer v(values);
+    const double* x = v.data();
+    if (weights == Py_None) {
+        for (Size i=0; i<v.size(); ++i)
+            s.add(x[i]);
+    } else {
+        Float64Buffer w(weights);
+        QL_REQUIRE(w.size() == v.size(),
+                   "values (" << v.size() << ") and weights (" << w.size()
+                   << ") sizes differ");
+        for (Size i=0; i<v.size(); ++i)
+            s.add(x[i], w.data()[i]);
+    }
+}
+
+// adds the rows of an (n, size()) float64 buffer as samples
+template <class S>
+void _add_sequence_batch(GenericSequenceStatistics<S>& s,
+                         PyObject* values, PyObject* weights) {
+    Float64Buffer v(values);
+    Size d = s.size();
+    QL_REQUIRE(d > 0 && v.size() % d == 0,
+               "buffer size (" << v.size()
+               << ") is not a multiple of the dimension (" << d << ")");
+    Size n = v.size() / d;
+    std::unique_ptr<Float64Buffer> w;
+    if (weights != Py_None) {
+        w.reset(new Float64Buffer(weights));
+        QL_REQUIRE(w->size() == n,
+                   "samples (" << n << ") and weights (" << w->size()
+                   << ") sizes differ");
+    }
+    std::vector<Real> sample(d);
+    const double* x = v.data();
+    for (Size i=0; i<n; ++i) {
+        std::copy(x + i*d, x + (i+1)*d, sample.begin());
+        s.add(sample, w ? Real(w->data()[i]) : Real(1.0));
+    }
+}
+%}
+#endif
+
 class Statistics {
   public:
     Size samples() const;
@@ -54,6 +101,20 @@ class Statistics {
                  const std::vector<Real>& weights) {
             self->addSequence(values.begin(), values.end(), weights.begin());
         }
+        #if defined(SWIGPYTHON)
+        // adds the values (and weights) of float64 buffers, e.g. numpy arrays
+        void addBatch(PyObject* values, PyObject* weights = Py_None) {
+            _add_batch(*self, values, weights);
+        }
+        #endif
+        // adds the samples of other, e.g. partial statistics of a worker
+        void merge(const Statistics& other) {
+            // copied, as other may be self
+            std::vector<std::pair<Real, Real> > data = other.data();
+            self->reserve(self->samples() + data.size());
+            for (const auto& p : data)
+                self->add(p.first, p.second);
+        }
     }
 };
 
@@ -81,6 +142,12 @@ class IncrementalStatistics {
                  const std::vector<Real>& weights) {
             self->addSequence(values.begin(), values.end(), weights.begin());
         }
+        #if defined(SWIGPYTHON)
+        // adds the values (and weights) of float64 buffers, e.g. numpy arrays
+        void addBatch(PyObject* values, PyObject* weights = Py_None) {
+            _add_batch(*self, values, weights);
+        }
+        #endif
     }
 };
 
@@ -120,6 +187,15 @@ class GenericSequenceStatistics {
     void reset();
     void add(const std::vector<Real>& value, Real weight = 1.0);
     void add(const Array& value, Real weight = 1.0);
+    #if defined(SWIGPYTHON)
+    %extend {
+        // adds the rows of an (n, size()) float64 buffer, e.g. a numpy array
+        // of scenarios, with optional weights
+        void addBatch(PyObject* values, PyObject* weights = Py_None) {
+            _add_sequence_batch(*self, values, weights);
+        }
+    }
+    #endif
 };
 
 %template(MultipleStatistics) GenericSequenceStatistics<Statistics>;
@@ -1,6 +1,7 @@
 /******************************************************************************
  *  Tape activation functions to ensure an xad global tape instance
- *  matches the one in QuantLib-Risks. 
+ *  matches the one in QuantLib-Risks. The active tape is thread-local,
+ *  so each thread can record on its own tape.
  *
  *  This file is part of QuantLib-Risks, a Python wrapper for QuantLib enabled
  *  for risk computation using automatic differentiation. It uses XAD,
@@ -30,20 +31,38 @@
     #include "converters.hpp"
     #include <XAD/XAD.hpp>
 
-    void _activate_tape(xad::Tape<double>& t) {
-        xad::Tape<double>::setActive(&t);
+    void _activate_tape(ActiveTape& t) {
+        ActiveTape::setActive(&t);
     }
 
-    void _deactivate_tape() {
-        xad::Tape<double>::deactivateAll();
+    // only deactivates t if it is the active tape of the calling thread,
+    // leaving the tapes of other threads untouched
+    void _deactivate_tape(ActiveTape& t) {
+        if (ActiveTape::getActive() == &t)
+            t.deactivate();
     }
 
-    typedef xad::Tape<double> Tape;
+    bool _is_active_tape(ActiveTape& t) {
+        return ActiveTape::getActive() == &t;
+    }
+
+    unsigned long _tape_position(ActiveTape& t) {
+        return static_cast<unsigned long>(t.getPosition());
+    }
+
+    typedef ActiveTape Tape;
 %}
 
-typedef xad::Tape<double> Tape;
+// the second order module records xad::FReal<double> values
+#ifdef QLR_AD_MODE_FWD_ADJ
+#define QLR_ACTIVE_TAPE xad::Tape<xad::FReal<double> >
+#else
+#define QLR_ACTIVE_TAPE xad::Tape<double>
+#endif
+
+typedef QLR_ACTIVE_TAPE Tape;
 
-%typemap(in) xad::Tape<double>& {
+%typemap(in) QLR_ACTIVE_TAPE& {
     try {
         $1 = &make_Tape_ref($input);
     }
@@ -55,11 +74,20 @@ typedef xad::Tape<double> Tape;
 
 %define QL_TYPECHECK_TAPE 4899 %enddef
 
-%typecheck(QL_TYPECHECK_TAPE) xad::Tape<double>& {
+%typecheck(QL_TYPECHECK_TAPE) QLR_ACTIVE_TAPE& {
     $1 = check_Tape($input) ? 1 : 0;
 }
 
-void _activate_tape(xad::Tape<double>& t);
-void _deactivate_tape();
+// the global %exception checks the tape memory limit before each call; these
+// must keep working over the limit, e.g. to leave a Tape context
+%noexception _activate_tape;
+%noexception _deactivate_tape;
+%noexception _is_active_tape;
+%noexception _tape_position;
+
+void _activate_tape(QLR_ACTIVE_TAPE& t);
+void _deactivate_tape(QLR_ACTIVE_TAPE& t);
+bool _is_active_tape(QLR_ACTIVE_TAPE& t);
+unsigned long _tape_position(QLR_ACTIVE_TAPE& t);
 
 #endif
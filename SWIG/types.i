@@ -43,7 +43,20 @@ typedef long BigInteger;
 typedef unsigned int Natural;
 typedef unsigned long BigNatural;
 #ifdef QL_XAD
-typedef xad::AReal<double> Real;
+#if defined(QLR_AD_MODE_FWD_VECTOR)
+#define QLR_ACTIVE_REAL xad::FReal<double, QLR_FWD_VECTOR_SIZE>
+#define XAD_FORWARD_MODE 1
+#elif defined(QLR_AD_MODE_FWD)
+#define QLR_ACTIVE_REAL xad::FReal<double>
+#define XAD_FORWARD_MODE 1
+#elif defined(QLR_AD_MODE_FWD_ADJ)
+#define QLR_ACTIVE_REAL xad::AReal<xad::FReal<double> >
+#define XAD_FORWARD_MODE 0
+#else
+#define QLR_ACTIVE_REAL xad::AReal<double>
+#define XAD_FORWARD_MODE 0
+#endif
+typedef QLR_ACTIVE_REAL Real;
 #define XAD_ENABLED 1
 #else
 typedef double Real;
@@ -77,9 +90,11 @@ typedef std::size_t Size;
     #include "converters.hpp"
 %}
 
-%typemap(in) Real, xad::AReal<double> {
+%typemap(in) Real, QLR_ACTIVE_REAL {
     try {
         $1 = make_Real($input);
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "active Real, float, or long expected");
     }
@@ -89,6 +104,8 @@ typedef std::size_t Size;
     try {
         temp = make_Real($input);
         $1 = &temp;
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "active Real, float, or long expected");
     }
@@ -97,11 +114,11 @@ typedef std::size_t Size;
 
 %define QL_TYPECHECK_REALOBJ 4990 %enddef
 
-%typemap(out) Real, xad::AReal<double> {
+%typemap(out) Real, QLR_ACTIVE_REAL {
     $result = make_PyObject($1);
 }
 
-%typecheck(QL_TYPECHECK_REALOBJ) Real, xad::AReal<double>, const Real&
+%typecheck(QL_TYPECHECK_REALOBJ) Real, QLR_ACTIVE_REAL, const Real&
 {
     $1 = PyFloat_Check($input) || PyLong_Check($input) || check_Real($input) ? 1 : 0;
 }
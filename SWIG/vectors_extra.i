@@ -80,9 +80,13 @@ bool check_date_real_pair_list(PyObject* obj)
             $1 = make_Real_vector_from_list($input);
         } else if (PyTuple_Check($input)) {
             $1 = make_Real_vector_from_tuple($input);
+        } else if (check_Real_buffer($input)) {
+            $1 = make_Real_vector_from_buffer($input);
         } else {
             $1 = make_Real_vector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "vector of Real expected");
     }
@@ -96,9 +100,14 @@ bool check_date_real_pair_list(PyObject* obj)
         } else if (PyTuple_Check($input)) {
             temp = make_Real_vector_from_tuple($input);
             $1 = &temp;
+        } else if (check_Real_buffer($input)) {
+            temp = make_Real_vector_from_buffer($input);
+            $1 = &temp;
         } else {
             $1 = &make_Real_vector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "vector of Real expected");
     }
@@ -113,6 +122,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             $1 = make_DoublePairVector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "vector of Real pairs expected");
     }
@@ -129,6 +140,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             $1 = &make_DoublePairVector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "vector of Real pairs expected");
     }
@@ -143,6 +156,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             $1 = make_DoubleVectorVector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "vector of vector of Real expected");
     }
@@ -159,6 +174,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             $1 = &make_DoubleVectorVector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "vector of vector of Real expected");
     }
@@ -175,6 +192,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             $1 = make_PairDoubleVector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "pair of vector of Real expected");
     }
@@ -191,6 +210,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             $1 = &make_PairDoubleVector_ref($input);
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "pair vector of Real expected");
     }
@@ -281,6 +302,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             SWIG_exception(SWIG_TypeError, "Only tuples or lists can be converted to pairs");
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "tuple or list with 2 elements expected for pair initializer");
     }
@@ -298,6 +321,8 @@ bool check_date_real_pair_list(PyObject* obj)
         } else {
             SWIG_exception(SWIG_TypeError, "Only tuples or lists can be converted to pairs");
         }
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "tuple or list with 2 elements expected for pair initializer");
     }
@@ -317,6 +342,8 @@ bool check_date_real_pair_list(PyObject* obj)
     try {
         temp = make_date_real_pair_vector_from_list($1);
         $1 = &temp;
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "type conversion error from list of tuples of Date, Real");
     }
@@ -327,6 +354,8 @@ bool check_date_real_pair_list(PyObject* obj)
 {
     try {
         $1 = make_date_real_pair_vector_from_list($1);
+    } catch(std::overflow_error& e) {
+        SWIG_exception(SWIG_OverflowError, e.what());
     } catch(...) {
         SWIG_exception(SWIG_TypeError, "type conversion error from list of tuples of Date, Real");
     }
@@ -115,6 +115,13 @@ if [ "$machine" != "macos" ] ; then
     $CCACHE_OPTION
 else 
     # we don't have working presets for Intel Mac
+    # XAD keeps the active tape in a thread_local, which Apple clang supports from
+    # Xcode 8 (clang-800) on; only fall back to a process-wide tape for older toolchains
+    XAD_THREADLOCAL_OPTION=""
+    apple_clang=$(c++ --version | sed -n 's/.*(clang-\([0-9]*\).*/\1/p' | head -n 1)
+    if [ -n "$apple_clang" ] && [ "$apple_clang" -lt 800 ] ; then
+        XAD_THREADLOCAL_OPTION="-DXAD_NO_THREADLOCAL=ON"
+    fi
     mkdir -p build/$QL_PRESET
     cmake -B build/$QL_PRESET -S . -GNinja \
       -DCMAKE_INSTALL_PREFIX="$CMAKE_INSTALL_PREFIX" \
@@ -128,7 +135,7 @@ else
       -DQL_EXTERNAL_SUBDIRECTORIES="$XAD_DIR;$QLRISKS_DIR" \
       -DQL_EXTRA_LINK_LIBRARIES="QuantLib-Risks" \
       -DQL_NULL_AS_FUNCTIONS=ON \
-      -DXAD_NO_THREADLOCAL=ON 
+      $XAD_THREADLOCAL_OPTION
 fi
 
 cd "build/$QL_PRESET"